@@ -1,17 +1,23 @@
 """Vercel serverless entry point for FastAPI application."""
+import asyncio
 import logging
+import secrets
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app import database as db
-from app.llm import init_llm_client
+from app import migrations
+from app import prometheus
+from app.assets import CachedStaticFiles
+from app.compression import CompressionMiddleware
+from app.profiling import ProfilingMiddleware
+from app.request_metrics import RequestMetricsMiddleware
+from app.responses import FastJSONResponse
 
 # Import all routers
-from app.routes import auth, profile, summaries, skills, experiences, projects, educations, references, ats, pdf, pages
+from app.routes import auth, profile, summaries, skills, experiences, projects, educations, references, suggestions, search, changes, batch, bootstrap, photos, ats, pdf, profiles, pages
 
 
 # Setup logging
@@ -25,28 +31,33 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
     
-    # Initialize database tables
+    # Apply pending schema migrations
     try:
-        db.init_database()
-        logger.info("Database initialized successfully")
+        applied = migrations.init_database()
+        logger.info(f"Database initialized successfully (applied migrations: {applied or 'none'})")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
     
-    # Initialize LLM client
-    try:
-        if settings.has_llm_config:
-            init_llm_client()
-            logger.info("LLM client initialized successfully")
-        else:
-            logger.warning("LLM client configuration missing - ATS optimization will be unavailable")
-    except Exception as e:
-        logger.warning(f"LLM client initialization failed: {e}")
+    # Load frontend pages into memory
+    pages.preload_pages()
+    
+    # The LLM client is created on first use (see app.llm.get_llm_client)
+    if not settings.has_llm_config:
+        logger.warning("LLM client configuration missing - ATS optimization will be unavailable")
+    
+    # Share this worker's metrics with the others (see app.prometheus)
+    flusher = None
+    if settings.METRICS_DIR:
+        flusher = asyncio.create_task(prometheus.flush_periodically())
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    if flusher is not None:
+        flusher.cancel()
+        prometheus.remove_snapshot()
 
 
 # Create FastAPI app
@@ -54,9 +65,13 @@ app = FastAPI(
     title="Resumer API",
     description="Resume builder with ATS optimization",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Compress JSON/HTML/text responses (PDFs and precompressed pages pass through)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,8 +81,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profile requests on demand; not installed unless configured
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+# Count and time every request (outermost, so compression is included)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 # Include all routers
 app.include_router(auth.router)
@@ -78,8 +100,15 @@ app.include_router(experiences.router)
 app.include_router(projects.router)
 app.include_router(educations.router)
 app.include_router(references.router)
+app.include_router(suggestions.router)
+app.include_router(search.router)
+app.include_router(changes.router)
+app.include_router(batch.router)
+app.include_router(bootstrap.router)
+app.include_router(photos.router)
 app.include_router(ats.router)
 app.include_router(pdf.router)
+app.include_router(profiles.router)
 app.include_router(pages.router)
 
 
@@ -90,6 +119,21 @@ def health_check():
     return {"status": "healthy"}
 
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Metrics of every worker in Prometheus text format (see app.prometheus)."""
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return Response(content=await prometheus.exposition(), media_type=prometheus.CONTENT_TYPE)
+
+
 # For local development with uvicorn
 if __name__ == "__main__":
     import uvicorn
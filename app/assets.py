@@ -0,0 +1,274 @@
+"""
+Static asset pipeline: minified, content-hashed copies of the shared CSS/JS.
+
+Run `python -m app.assets` after editing anything under static/css, static/js
+or static/vendor. It writes static/dist/<name>.<hash>.<ext> plus a manifest;
+pages referencing /static/<source> are rewritten to the hashed URL when served.
+Add --fetch-vendor to download third-party bundles that are not vendored yet.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+
+from starlette.staticfiles import StaticFiles
+
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# Source files (relative to STATIC_DIR) that get fingerprinted
+SOURCES = (
+    "css/manage.css",
+    "css/generate.css",
+    "js/session.js",
+    "js/sync.js",
+    "js/generate.js",
+    "vendor/html2pdf.bundle.min.js",
+)
+
+# Third-party bundles: where to fetch them, and the URL pages fall back to
+# while the file has not been vendored
+VENDOR_URLS = {
+    "vendor/html2pdf.bundle.min.js":
+        "https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js",
+}
+
+
+# =============================================================================
+# MINIFICATION
+# =============================================================================
+
+def minify_css(text: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};:,>])\s*", r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+# Characters after which a "/" starts a regex literal rather than a division
+_REGEX_PREFIX = set("(,=:[!&|?{};+-*%<>~^")
+
+
+def minify_js(text: str) -> str:
+    """
+    Conservatively minify JavaScript: drop comments, indentation and blank
+    lines, but keep line breaks (so automatic semicolon insertion is
+    unaffected) and leave string, template and regex literals untouched.
+    """
+    out = []
+    i, n = 0, len(text)
+    last_significant = ""
+    # Stack of open template literals; each entry counts "${" brace depth
+    templates = []
+
+    while i < n:
+        ch = text[i]
+
+        if templates and templates[-1] < 0:
+            # Inside the literal part of a template string
+            if ch == "\\":
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if ch == "`":
+                templates.pop()
+                out.append(ch)
+                last_significant = ch
+                i += 1
+                continue
+            if text.startswith("${", i):
+                templates[-1] = 0
+                out.append("${")
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+            continue
+
+        if ch in "'\"":
+            end = i + 1
+            while end < n and text[end] != ch and text[end] != "\n":
+                end += 2 if text[end] == "\\" else 1
+            out.append(text[i:end + 1])
+            last_significant = ch
+            i = end + 1
+            continue
+
+        if ch == "`":
+            templates.append(-1)
+            out.append(ch)
+            i += 1
+            continue
+
+        if templates and ch in "{}":
+            if ch == "{":
+                templates[-1] += 1
+            elif templates[-1] == 0:
+                templates[-1] = -1
+                out.append(ch)
+                i += 1
+                continue
+            else:
+                templates[-1] -= 1
+
+        if text.startswith("//", i):
+            while i < n and text[i] != "\n":
+                i += 1
+            continue
+
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        if ch == "/" and (last_significant in _REGEX_PREFIX or last_significant == ""):
+            end = i + 1
+            in_class = False
+            while end < n and text[end] != "\n":
+                c = text[end]
+                if c == "\\":
+                    end += 2
+                    continue
+                if c == "[":
+                    in_class = True
+                elif c == "]":
+                    in_class = False
+                elif c == "/" and not in_class:
+                    break
+                end += 1
+            out.append(text[i:end + 1])
+            last_significant = "/"
+            i = end + 1
+            continue
+
+        if ch == "\n":
+            # Collapse trailing whitespace, blank lines and the next line's indentation
+            while out and out[-1] in (" ", "\t"):
+                out.pop()
+            if out and out[-1] != "\n":
+                out.append("\n")
+            i += 1
+            while i < n and text[i] in " \t":
+                i += 1
+            continue
+
+        if not ch.isspace():
+            last_significant = ch
+        out.append(ch)
+        i += 1
+
+    return "".join(out).strip() + "\n"
+
+
+def minify(source: str, content: bytes) -> bytes:
+    """Minify a source file by extension; already-minified files pass through."""
+    if source.endswith(".min.js"):
+        return content
+    if source.endswith(".css"):
+        return minify_css(content.decode()).encode()
+    if source.endswith(".js"):
+        return minify_js(content.decode()).encode()
+    return content
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def fetch_vendor(source: str) -> None:
+    """Download a third-party bundle into STATIC_DIR."""
+    path = os.path.join(STATIC_DIR, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with urllib.request.urlopen(VENDOR_URLS[source], timeout=30) as response:
+        content = response.read()
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def build(fetch_missing_vendor: bool = False) -> dict[str, str]:
+    """Write fingerprinted assets and the manifest; return the manifest."""
+    os.makedirs(DIST_DIR, exist_ok=True)
+    manifest = {}
+    for source in SOURCES:
+        path = os.path.join(STATIC_DIR, source)
+        if not os.path.exists(path):
+            if source in VENDOR_URLS and fetch_missing_vendor:
+                fetch_vendor(source)
+            else:
+                print(f"skipping {source}: not found", file=sys.stderr)
+                continue
+
+        with open(path, "rb") as f:
+            content = minify(source, f.read())
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.basename(source).split(".", 1)
+        output = f"dist/{stem}.{digest}.{ext}"
+        with open(os.path.join(STATIC_DIR, output), "wb") as f:
+            f.write(content)
+        manifest[source] = output
+
+    # Drop outputs from earlier builds
+    current = {os.path.basename(output) for output in manifest.values()}
+    for filename in os.listdir(DIST_DIR):
+        if filename != os.path.basename(MANIFEST_PATH) and filename not in current:
+            os.remove(os.path.join(DIST_DIR, filename))
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+# =============================================================================
+# RUNTIME
+# =============================================================================
+
+def load_manifest() -> dict[str, str]:
+    """Read the build manifest, or an empty one if assets were never built."""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def asset_urls(use_manifest: bool = True) -> dict[str, str]:
+    """Map /static/<source> URLs to the URL pages should actually load."""
+    manifest = load_manifest() if use_manifest else {}
+    urls = {}
+    for source in SOURCES:
+        if source in manifest:
+            urls[f"/static/{source}"] = f"/static/{manifest[source]}"
+        elif source in VENDOR_URLS and not os.path.exists(os.path.join(STATIC_DIR, source)):
+            urls[f"/static/{source}"] = VENDOR_URLS[source]
+    return urls
+
+
+def rewrite_asset_urls(html: bytes, urls: dict[str, str]) -> bytes:
+    """Point src/href attributes at fingerprinted (or fallback) asset URLs."""
+    for source_url, target_url in urls.items():
+        html = html.replace(f'"{source_url}"'.encode(), f'"{target_url}"'.encode())
+    return html
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks fingerprinted files as immutable."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        relative = os.path.relpath(full_path, self.directory)
+        if relative.startswith("dist" + os.sep):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, no-cache"
+        return response
+
+
+if __name__ == "__main__":
+    for source, output in build(fetch_missing_vendor="--fetch-vendor" in sys.argv).items():
+        print(f"{source} -> {output}")
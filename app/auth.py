@@ -1,27 +1,98 @@
 """Authentication utilities for JWT and password handling."""
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, Response, HTTPException, status
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app import database as db
+from app import metrics
+from app.cache import TTLCache
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes below BCRYPT_ROUNDS are upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 
+# bcrypt runs in its own small pool so login bursts cannot starve the
+# threadpool that serves every other sync route: callers await the job from
+# the event loop instead of blocking a threadpool thread on it. Jobs beyond
+# the worker count plus queue size are rejected straight away.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Non-sensitive user fields carried in access tokens when JWT_PROFILE_CLAIMS is on,
+# for clients that read them; the server uses the user row
+PROFILE_CLAIMS = ("name", "phone", "location", "linkedin", "github", "website")
+
+# Verified token claims keyed by token digest; entries expire with the token
+token_cache = TTLCache(maxsize=settings.JWT_CACHE_MAX_SIZE, ttl=0, name="token")
+
+
+def _timed_hash_job(func, submitted_at: float, *args):
+    """Run a password job on a hashing worker, recording wait and run time."""
+    started_at = time.perf_counter()
+    metrics.PASSWORD_HASH_WAIT_SECONDS.observe(started_at - submitted_at)
+    try:
+        return func(*args)
+    finally:
+        metrics.PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started_at)
+
+
+def _release_hash_slot(_future=None) -> None:
+    metrics.PASSWORD_HASH_IN_FLIGHT.dec()
+    _hash_slots.release()
+
+
+async def run_password_job(func, *args):
+    """
+    Run a password hash/verify function on the bounded hashing executor and
+    await its result. Raises HTTPException (503) if the hashing queue is full.
+    """
+    if not _hash_slots.acquire(blocking=False):
+        metrics.PASSWORD_HASH_REJECTED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    metrics.PASSWORD_HASH_IN_FLIGHT.inc()
+    try:
+        future = _hash_executor.submit(_timed_hash_job, func, time.perf_counter(), *args)
+    except BaseException:
+        _release_hash_slot()
+        raise
+    # The slot is freed when the job ends, not when a cancelled caller stops waiting
+    future.add_done_callback(_release_hash_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await run_password_job(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return await run_password_job(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -36,18 +107,141 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def authenticate_user(email: str, password: str) -> dict | None:
-    """Authenticate a user by email and password."""
-    with db.get_db() as conn:
-        user = db.get_user_by_email(conn, email)
-        if not user:
-            return None
-        if not verify_password(password, user["password_hash"]):
-            return None
-        return user
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT and return a copy of its claims, reusing earlier
+    verifications. Raises JWTError if the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        # The cached claims are shared by every request sending this token
+        return dict(payload)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(key, payload, ttl=remaining)
+    return dict(payload)
+
+
+def create_user_access_token(user: dict) -> str:
+    """Create an access token for a user, embedding profile claims if enabled."""
+    data = {"sub": user["email"], "user_id": user["id"]}
+    if settings.JWT_PROFILE_CLAIMS:
+        data["profile"] = {field: user.get(field) for field in PROFILE_CLAIMS}
+    return create_access_token(
+        data=data,
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+def set_access_token_cookie(response: Response, access_token: str) -> None:
+    """Attach the access token cookie to a response."""
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        samesite="lax",
+        secure=False  # Set to True in production with HTTPS
+    )
+
+
+def _db_timestamp(moment: datetime) -> str:
+    """Format a UTC datetime the way SQLite's datetime('now') does."""
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def get_current_user(request: Request) -> dict:
+def _hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(conn, user_id: int) -> str:
+    """Create and store a new refresh token for a user."""
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db.create_refresh_token(conn, user_id, _hash_refresh_token(token), _db_timestamp(expires_at))
+    return token
+
+
+def rotate_refresh_token(conn, token: str) -> tuple[int, str]:
+    """
+    Exchange a refresh token for a new one, revoking the old token.
+    Returns (user_id, new_token). Raises HTTPException (401) if the token
+    is unknown, expired or already used; reuse outside the grace window
+    revokes all of the user's sessions.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+    )
+    record = db.get_refresh_token(conn, _hash_refresh_token(token))
+    if record is None:
+        raise invalid_exception
+
+    now = datetime.utcnow()
+    now_str = _db_timestamp(now)
+    if record["revoked_at"] is not None:
+        grace_start = now - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if record["revoked_at"] < _db_timestamp(grace_start):
+            db.revoke_user_refresh_tokens(conn, record["user_id"], now_str)
+        raise invalid_exception
+    if record["expires_at"] <= now_str:
+        raise invalid_exception
+    if not db.revoke_refresh_token(conn, record["id"], now_str):
+        # Lost a race with a concurrent refresh of the same token
+        raise invalid_exception
+
+    return record["user_id"], issue_refresh_token(conn, record["user_id"])
+
+
+def revoke_refresh_token(conn, token: str) -> None:
+    """Revoke a refresh token if it exists (used on logout)."""
+    record = db.get_refresh_token(conn, _hash_refresh_token(token))
+    if record is not None:
+        db.revoke_refresh_token(conn, record["id"], _db_timestamp(datetime.utcnow()))
+
+
+def revoke_user_sessions(conn, user_id: int) -> None:
+    """Revoke all refresh tokens of a user."""
+    db.revoke_user_refresh_tokens(conn, user_id, _db_timestamp(datetime.utcnow()))
+
+
+def set_refresh_token_cookie(response: Response, refresh_token: str) -> None:
+    """Attach the refresh token cookie, scoped to the API routes."""
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        path="/api",
+        samesite="strict",
+        secure=False  # Set to True in production with HTTPS
+    )
+
+
+async def authenticate_user(conn, email: str, password: str) -> db.Record | None:
+    """Authenticate a user by email and password (database calls run in the threadpool)."""
+    user = await run_in_threadpool(db.get_user_by_email, conn, email)
+    if not user:
+        return None
+    valid, new_hash = await run_password_job(
+        pwd_context.verify_and_update, password, user["password_hash"]
+    )
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(db.update_user_password_hash, conn, user["id"], new_hash)
+    return user
+
+
+def get_current_user(
+    request: Request,
+    conn: db.LazyConnection = Depends(db.get_request_db)
+) -> dict:
     """
     Get the current authenticated user from the request.
     Raises HTTPException if not authenticated.
@@ -70,7 +264,7 @@ def get_current_user(request: Request) -> dict:
             raise credentials_exception
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         user_id: int = payload.get("user_id")
         if email is None or user_id is None:
@@ -78,11 +272,12 @@ def get_current_user(request: Request) -> dict:
     except JWTError:
         raise credentials_exception
 
-    with db.get_db() as conn:
-        user = db.get_user_by_id(conn, user_id)
-        if user is None:
-            raise credentials_exception
-        return user
+    # Always looked up (through the user cache), even with profile claims in
+    # the token: a deleted user loses access and profile fields stay current
+    user = db.get_cached_user_by_id(conn, user_id)
+    if user is None:
+        raise credentials_exception
+    return user
 
 
 def verify_token_for_page(request: Request) -> bool:
@@ -95,10 +290,7 @@ def verify_token_for_page(request: Request) -> bool:
         return False
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        exp = payload.get("exp")
-        if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            return False
+        decode_access_token(token)
         return True
     except JWTError:
         return False
@@ -0,0 +1,175 @@
+"""Content-encoding helpers and response compression (brotli, or gzip for clients without br)."""
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is a requirement; gzip keeps working without it
+    brotli = None
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress data with the given content-coding ("br" or "gzip")."""
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(data, quality=11 if level is None else level)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}."""
+    accepted = {}
+    if not header:
+        return accepted
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(header: str | None, available: tuple[str, ...]) -> str | None:
+    """Pick the preferred available encoding the client accepts, or None for identity."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class _StreamCompressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress = self._compressor.compress
+            self._flush = self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip.
+    Only bodies of an allowed content type and at least minimum_size bytes
+    are compressed; responses that already carry a Content-Encoding (such
+    as precompressed pages) and partial or empty responses pass through.
+    """
+
+    DEFAULT_CONTENT_TYPES = (
+        "application/json",
+        "application/javascript",
+        "text/html",
+        "text/css",
+        "text/javascript",
+        "text/plain",
+        "image/svg+xml",
+    )
+    LEVELS = {"br": 4, "gzip": 6}
+
+    def __init__(self, app, minimum_size: int = 1024, content_types: tuple[str, ...] | None = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = content_types or self.DEFAULT_CONTENT_TYPES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("accept-encoding"), supported_encodings())
+        if encoding is None or headers.get("range"):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                response_headers = Headers(raw=message["headers"])
+                content_type = response_headers.get("content-type", "").split(";")[0].strip()
+                passthrough = (
+                    message["status"] < 200
+                    or message["status"] in (204, 206, 304)
+                    or "content-encoding" in response_headers
+                    or content_type not in self.content_types
+                )
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _StreamCompressor(encoding, self.LEVELS[encoding])
+                response_headers = MutableHeaders(raw=start_message["headers"])
+                response_headers["Content-Encoding"] = encoding
+                response_headers.add_vary_header("Accept-Encoding")
+                etag = response_headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed bytes differ, so a strong validator no longer holds
+                    response_headers["ETag"] = f"W/{etag}"
+                if "content-length" in response_headers:
+                    del response_headers["content-length"]
+
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    response_headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start_message)
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
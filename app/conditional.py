@@ -0,0 +1,49 @@
+"""Conditional GET helpers: ETag matching and revision-based ETags for user data."""
+from typing import Callable, Iterable
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.auth import get_current_user
+from app import database as db
+
+
+# Browsers keep the response but revalidate it on every use
+REVISION_CACHE_CONTROL = "private, no-cache"
+
+
+def if_none_match(request: Request, etags: Iterable[str]) -> bool:
+    """Whether the request's If-None-Match header matches one of the ETags."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+def revision_etag(user_id: int, *parts) -> str:
+    """ETag for a user's data at the given revision(s)."""
+    return '"u{}-{}"'.format(user_id, "-".join(str(part) for part in parts))
+
+
+def section_etag(section: str) -> Callable:
+    """
+    Route dependency making a section's GET endpoints conditional on its
+    revision. A matching If-None-Match is answered with 304 after a single
+    primary-key lookup, before the handler loads any rows.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        user: dict = Depends(get_current_user),
+        conn: db.LazyConnection = Depends(db.get_request_db)
+    ) -> str:
+        etag = revision_etag(user["id"], section, db.get_revision(conn, user["id"], section))
+        headers = {"ETag": etag, "Cache-Control": REVISION_CACHE_CONTROL}
+        if if_none_match(request, {etag}):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return dependency
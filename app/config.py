@@ -1,5 +1,6 @@
 """Application configuration using environment variables."""
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,17 +17,85 @@ class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+    # A rotated refresh token presented again within this window is rejected
+    # without being treated as token theft (e.g. two tabs refreshing at once)
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = int(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "30"))
+    # Embed non-sensitive profile fields in access tokens for clients to read. Requests
+    # still authenticate against the user row (cached for USER_CACHE_TTL_SECONDS)
+    JWT_PROFILE_CLAIMS: bool = os.getenv("JWT_PROFILE_CLAIMS", "false").lower() == "true"
+    
+    # Password hashing (bcrypt) runs in its own bounded executor
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "8"))
+    
+    # Authenticated-user cache (per worker process)
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    
+    # Verified access-token claims cache (per worker process)
+    JWT_CACHE_MAX_SIZE: int = int(os.getenv("JWT_CACHE_MAX_SIZE", "4096"))
+    
+    # Autocomplete indexes (per worker process); writes in another worker
+    # become visible here once the index expires
+    SUGGESTION_INDEX_MAX_USERS: int = int(os.getenv("SUGGESTION_INDEX_MAX_USERS", "256"))
+    SUGGESTION_INDEX_TTL_SECONDS: int = int(os.getenv("SUGGESTION_INDEX_TTL_SECONDS", "60"))
+    
+    # Change feed history; clients whose cursor is older get a full snapshot
+    CHANGE_LOG_RETENTION_DAYS: int = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30"))
+    
+    # Log a warning when one request runs the same statement more often than
+    # this (a likely N+1 query, see app.querylog)
+    DB_REPEATED_QUERY_WARN: int = int(os.getenv("DB_REPEATED_QUERY_WARN", "10"))
+    
+    # Profile photo uploads; larger files, and images with more pixels
+    # (checked from the header, against decompression bombs), are rejected
+    # before decoding
+    PHOTO_MAX_UPLOAD_BYTES: int = int(os.getenv("PHOTO_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    PHOTO_MAX_PIXELS: int = int(os.getenv("PHOTO_MAX_PIXELS", "50000000"))
+    PHOTO_DECODE_CONCURRENCY: int = int(os.getenv("PHOTO_DECODE_CONCURRENCY", "2"))
+    
+    # /metrics: with several workers, each writes its metrics to METRICS_DIR
+    # every METRICS_FLUSH_SECONDS and a scrape merges them. METRICS_TOKEN,
+    # if set, is required as a bearer token.
+    METRICS_DIR: str = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    
+    # Request profiling (app.profiling): requests to PROFILE_ROUTES sending
+    # X-Profile-Token: PROFILE_TOKEN are profiled, as is a PROFILE_SAMPLE_RATE
+    # fraction of the others; the newest PROFILE_KEEP profiles are kept
+    PROFILE_TOKEN: str = os.getenv("PROFILE_TOKEN", "")
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_ROUTES: tuple[str, ...] = tuple(
+        route.strip() for route in os.getenv("PROFILE_ROUTES", "/generate-pdf,/api/ats-optimize").split(",")
+        if route.strip()
+    )
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "resumer-profiles"))
+    PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "50"))
     
     # LLM Configuration (Anthropic via Azure AI Foundry)
     LLM_API_KEY_ANTHROPIC: str = os.getenv("LLM_API_KEY_ANTHROPIC", "")
     LLM_API_ENDPOINT_ANTHROPIC: str = os.getenv("LLM_API_ENDPOINT_ANTHROPIC", "")
     LLM_DEPLOYMENT_NAME_ANTHROPIC: str = os.getenv("LLM_DEPLOYMENT_NAME_ANTHROPIC", "")
     
+    # Responses smaller than this (bytes) are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    
+    # Re-read frontend pages when they change on disk (development)
+    PAGE_RELOAD: bool = os.getenv("PAGE_RELOAD", "false").lower() == "true"
+    
     @property
     def has_llm_config(self) -> bool:
         """Check if LLM configuration is available."""
         return bool(self.LLM_API_KEY_ANTHROPIC and self.LLM_API_ENDPOINT_ANTHROPIC)
     
+    @property
+    def profiling_enabled(self) -> bool:
+        """Check if any request can be profiled."""
+        return bool(self.PROFILE_TOKEN or self.PROFILE_SAMPLE_RATE > 0)
+    
     @property
     def has_db_config(self) -> bool:
         """Check if database configuration is available."""
@@ -1,14 +1,25 @@
 """Database connection and operations using Turso serverless."""
-from typing import Any, Optional
+import json
+import re
+import sys
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Iterator, Optional
 from contextlib import contextmanager
 
 import turso_serverless
+from fastapi import Request
 
 from app.config import settings
+from app import metrics
+from app import querylog
+from app.cache import TTLCache
 
 
 def get_connection():
     """Get a connection to the Turso database."""
+    metrics.DB_CONNECTIONS_OPENED.inc()
     return turso_serverless.connect(
         settings.DB_URL,
         auth_token=settings.DB_TOKEN
@@ -25,33 +36,205 @@ def get_db():
         conn.close()
 
 
-def row_to_dict(cursor_description: list, row: tuple) -> dict | None:
-    """Convert a database row to a dictionary."""
-    if row is None:
-        return None
-    columns = [col[0] for col in cursor_description]
-    return dict(zip(columns, row))
+class LazyConnection:
+    """Connection proxy that opens the underlying connection on first use."""
+
+    def __init__(self):
+        self._conn = None
+        # Every statement executed through this connection (see app.querylog)
+        self.queries = querylog.QueryLog()
+        # Set while a transaction() block runs: (user_id, section) pairs to
+        # notify once it commits
+        self.pending_notifications: set | None = None
+
+    @property
+    def opened(self) -> bool:
+        """Whether the underlying connection has been opened."""
+        return self._conn is not None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = get_connection()
+        return self._conn
+
+    def execute(self, query: str, params: tuple = ()):
+        conn = self._connection()
+        function = _query_caller()
+        started = time.perf_counter()
+        try:
+            cursor = conn.execute(query, params)
+        finally:
+            seconds = time.perf_counter() - started
+            metrics.DB_QUERY_SECONDS.labels(function).observe(seconds)
+            recorded = self.queries.record(query, function, seconds)
+        return querylog.RecordedCursor(cursor, recorded)
+
+    @property
+    def IntegrityError(self) -> type[Exception]:
+        """The driver's IntegrityError (DB-API connection attribute), for except clauses."""
+        return self._connection().IntegrityError
+
+    def commit(self) -> None:
+        # Inside transaction() the block's end commits
+        if self._conn is not None and self.pending_notifications is None:
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        if self._conn is not None:
+            self._conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a group of writes as one transaction. Commits requested by the
+        CRUD functions inside the block are deferred to its end, an exception
+        rolls everything back, and change listeners run after the commit.
+        """
+        if self.pending_notifications is not None:
+            raise RuntimeError("transaction() blocks do not nest")
+        self.pending_notifications = set()
+        try:
+            yield self
+        except BaseException:
+            self.pending_notifications = None
+            self.rollback()
+            raise
+        pending, self.pending_notifications = self.pending_notifications, None
+        self.commit()
+        for user_id, section in sorted(pending):
+            notify_user_data_change(user_id, section)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Helpers that run a statement on behalf of the function that called them
+_QUERY_HELPERS = frozenset({"execute", "fetch_one", "fetch_all", "fetch_dicts"})
+
+
+def _query_caller() -> str:
+    """
+    Name of the function a statement is attributed to in db_query_seconds:
+    the first caller outside the fetch helpers, prefixed with its module
+    unless it is defined in this one.
+    """
+    frame = sys._getframe(2)
+    while frame.f_back is not None and (
+        frame.f_code.co_name in _QUERY_HELPERS or frame.f_code.co_name.startswith("<")
+    ):
+        frame = frame.f_back
+    module = frame.f_globals.get("__name__")
+    name = frame.f_code.co_name
+    return name if module == __name__ else f"{module}.{name}"
+
+
+def get_request_db(request: Request) -> Iterator[LazyConnection]:
+    """
+    FastAPI dependency yielding one lazily opened connection per request.
+    FastAPI caches dependencies per request, so auth and route handlers share it.
+    The statements it ran are checked for repeats when the request ends.
+    """
+    conn = LazyConnection()
+    try:
+        yield conn
+    finally:
+        metrics.DB_CONNECTIONS_PER_REQUEST.observe(1 if conn.opened else 0)
+        conn.close()
+        querylog.finish(conn.queries, f"{request.method} {request.url.path}")
+
+
+class Record(Mapping):
+    """
+    A read-only result row backed by the row tuple. Columns read as
+    record["name"] or record.name, and it works wherever a mapping does
+    (dict(record), **record). Subclasses made by record_type() hold the
+    column names, so each row costs one small object and no dict.
+    """
+    __slots__ = ("_values",)
+    _fields: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+
+    def __init__(self, values: tuple):
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._index.get(key)
+        return default if index is None else self._values[index]
+
+    def to_dict(self) -> dict:
+        return dict(zip(self._fields, self._values))
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
 
 
-def rows_to_dicts(cursor_description: list, rows: list) -> list[dict]:
-    """Convert multiple database rows to dictionaries."""
-    return [row_to_dict(cursor_description, row) for row in rows]
+@lru_cache(maxsize=256)
+def record_type(columns: tuple[str, ...]) -> type[Record]:
+    """The Record subclass for a column list, built once per distinct query shape."""
+    return type("Record", (Record,), {
+        "__slots__": (),
+        "_fields": columns,
+        "_index": {name: index for index, name in enumerate(columns)},
+    })
 
 
-def fetch_one(conn, query: str, params: tuple = ()) -> dict | None:
-    """Execute a query and fetch one row as a dictionary."""
+def _columns(cursor) -> tuple[str, ...]:
+    return tuple(col[0] for col in cursor.description)
+
+
+def fetch_one(conn, query: str, params: tuple = ()) -> Record | None:
+    """Execute a query and fetch one row as a Record."""
     cursor = conn.execute(query, params)
     row = cursor.fetchone()
     if row is None:
         return None
-    return row_to_dict(cursor.description, row)
+    return record_type(_columns(cursor))(row)
 
 
-def fetch_all(conn, query: str, params: tuple = ()) -> list[dict]:
-    """Execute a query and fetch all rows as dictionaries."""
+def fetch_all(conn, query: str, params: tuple = ()) -> list[Record]:
+    """Execute a query and fetch all rows as Records."""
     cursor = conn.execute(query, params)
     rows = cursor.fetchall()
-    return rows_to_dicts(cursor.description, rows)
+    if not rows:
+        return []
+    factory = record_type(_columns(cursor))
+    return [factory(row) for row in rows]
+
+
+def fetch_dicts(conn, query: str, params: tuple = ()) -> list[dict]:
+    """
+    Execute a query and fetch all rows as dicts, for rows that are returned
+    to clients as-is (JSON serializers take dicts natively) or extended with
+    bullet_points.
+    """
+    cursor = conn.execute(query, params)
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    columns = _columns(cursor)
+    return [dict(zip(columns, row)) for row in rows]
 
 
 def execute(conn, query: str, params: tuple = ()) -> int:
@@ -61,149 +244,454 @@ def execute(conn, query: str, params: tuple = ()) -> int:
     return cursor.lastrowid
 
 
-def init_database():
-    """Initialize database with schema."""
-    with get_db() as conn:
-        # Users table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                phone TEXT,
-                location TEXT,
-                linkedin TEXT,
-                github TEXT,
-                website TEXT,
-                created_at TEXT DEFAULT (datetime('now'))
-            )
-        """)
-        
-        # Skills table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS skills (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                skill_name TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                UNIQUE(skill_name, user_id)
-            )
-        """)
-        
-        # Skill bullets table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS skill_bullets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                skill_id INTEGER NOT NULL,
-                FOREIGN KEY (skill_id) REFERENCES skills(id) ON DELETE CASCADE,
-                UNIQUE(text, skill_id)
-            )
-        """)
-        
-        # Experiences table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS experiences (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                experience_name TEXT NOT NULL,
-                start_year TEXT,
-                end_year TEXT,
-                ongoing INTEGER DEFAULT 0,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Experience bullets table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS experience_bullets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                experience_id INTEGER NOT NULL,
-                FOREIGN KEY (experience_id) REFERENCES experiences(id) ON DELETE CASCADE,
-                UNIQUE(text, experience_id)
-            )
-        """)
-        
-        # Projects table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_name TEXT NOT NULL,
-                github_link TEXT,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Project bullets table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS project_bullets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                project_id INTEGER NOT NULL,
-                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                UNIQUE(text, project_id)
-            )
-        """)
-        
-        # Education table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS education (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                education_name TEXT NOT NULL,
-                institution TEXT NOT NULL,
-                start TEXT,
-                end TEXT,
-                grade TEXT,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # References table (using 'user_references' since 'references' is a reserved keyword)
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS user_references (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                referer_name TEXT NOT NULL,
-                referer_institute TEXT NOT NULL,
-                position TEXT,
-                connection_type TEXT,
-                institution_url TEXT,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Summaries table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS summaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                UNIQUE(text, user_id)
-            )
-        """)
-        
-        conn.commit()
+# =============================================================================
+# FULL-TEXT SEARCH
+# =============================================================================
+
+# Searchable columns, one FTS5 row per source row (see app.migrations for the
+# table and its sync triggers). The rowid is source_id * 16 + code, so
+# triggers can update and delete by rowid; owner holds "u<user id>" so a
+# MATCH only ever walks one user's postings.
+# (section, code, table, body, owner, parent) with {r} standing for the row
+SEARCH_SOURCES = (
+    ("summaries", 0, "summaries", "{r}.text", "{r}.user", "NULL"),
+    ("skills", 1, "skills", "{r}.skill_name", "{r}.user", "NULL"),
+    ("skill_bullets", 2, "skill_bullets", "{r}.text",
+     "(SELECT user FROM skills WHERE id = {r}.skill)", "{r}.skill"),
+    ("experiences", 3, "experiences", "{r}.experience_name", "{r}.user", "NULL"),
+    ("experience_bullets", 4, "experience_bullets", "{r}.text",
+     "(SELECT user FROM experiences WHERE id = {r}.experience)", "{r}.experience"),
+    ("projects", 5, "projects", "{r}.project_name", "{r}.user", "NULL"),
+    ("project_bullets", 6, "project_bullets", "{r}.text",
+     "(SELECT user FROM projects WHERE id = {r}.project)", "{r}.project"),
+    ("educations", 7, "education", "{r}.education_name || ' ' || {r}.institution", "{r}.user", "NULL"),
+    ("references", 8, "user_references",
+     "{r}.referer_name || ' ' || {r}.referer_institute || ' ' || COALESCE({r}.position, '')",
+     "{r}.user", "NULL"),
+)
+SEARCH_SECTIONS = tuple(source[0] for source in SEARCH_SOURCES)
+
+
+def search_match_expression(user_id: int, query: str) -> str | None:
+    """
+    Build an FTS5 MATCH expression finding rows of one user whose text has
+    every word of the query as a word prefix. None if the query has no words.
+    """
+    terms = re.findall(r"\w+", query.casefold())
+    if not terms:
+        return None
+    body = " ".join(f'"{term}"*' for term in terms)
+    return f"owner : u{int(user_id)} AND body : ({body})"
+
+
+def search_profile(conn, user_id: int, query: str, sections: list[str] = None,
+                   limit: int = 20) -> list[Record]:
+    """Full-text search over a user's profile data, best matches first."""
+    match = search_match_expression(user_id, query)
+    if match is None:
+        return []
+    sql = """SELECT section, item_id AS id, parent_id, body AS text,
+                    bm25(search_index, 1.0, 0.0) AS score
+             FROM search_index WHERE search_index MATCH ?"""
+    params: list = [match]
+    if sections:
+        sql += f" AND section IN ({', '.join('?' * len(sections))})"
+        params.extend(sections)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+    return fetch_all(conn, sql, tuple(params))
+
+
+def _search_ids_sql(section: str) -> str:
+    """Subquery selecting IDs of a section's rows matching the next MATCH parameter."""
+    return (
+        "SELECT item_id FROM search_index "
+        f"WHERE search_index MATCH ? AND section = '{section}'"
+    )
+
+
+# =============================================================================
+# CHANGE NOTIFICATION
+# =============================================================================
+
+# Callables run as listener(user_id, section) after a user's data is written
+_change_listeners: list = []
+
+
+def on_user_data_change(listener):
+    """Register a callback for writes to a user's profile sections."""
+    _change_listeners.append(listener)
+    return listener
+
+
+def notify_user_data_change(user_id: int, section: str) -> None:
+    """Tell listeners that a section of a user's profile data changed."""
+    for listener in _change_listeners:
+        listener(user_id, section)
+
+
+# =============================================================================
+# REVISIONS
+# =============================================================================
+
+# Sections with their own revision counter
+REVISION_SECTIONS = (
+    "profile", "summaries", "skills", "experiences", "projects", "educations", "references",
+)
+
+
+REVISION_SQL = "SELECT revision FROM user_revisions WHERE user_id = ? AND section = ?"
+REVISIONS_SQL = "SELECT section, revision FROM user_revisions WHERE user_id = ?"
+
+
+def get_revision(conn, user_id: int, section: str) -> int:
+    """Get the revision of one section of a user's data (0 if never written)."""
+    row = conn.execute(
+        REVISION_SQL,
+        (user_id, section)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def get_revisions(conn, user_id: int) -> dict[str, int]:
+    """Get the revision of every section of a user's data."""
+    rows = conn.execute(
+        REVISIONS_SQL,
+        (user_id,)
+    ).fetchall()
+    revisions = dict.fromkeys(REVISION_SECTIONS, 0)
+    revisions.update({section: revision for section, revision in rows})
+    return revisions
+
+
+def _commit_change(conn, user_id: int, section: str,
+                   item_id: int = None, op: str = None) -> None:
+    """
+    Bump the section's revision and, for item writes, append to the change
+    log, all in the same transaction as the write; then commit and notify.
+    """
+    conn.execute(
+        """INSERT INTO user_revisions (user_id, section, revision) VALUES (?, ?, 1)
+           ON CONFLICT (user_id, section) DO UPDATE SET revision = revision + 1""",
+        (user_id, section)
+    )
+    if op is not None:
+        conn.execute(
+            "INSERT INTO change_log (user_id, section, item_id, op) VALUES (?, ?, ?, ?)",
+            (user_id, section, item_id, op)
+        )
+    conn.commit()
+    _notify_after_commit(conn, user_id, section)
+
+
+def _notify_after_commit(conn, user_id: int, section: str) -> None:
+    """Notify now, or when the enclosing LazyConnection.transaction() commits."""
+    pending = getattr(conn, "pending_notifications", None)
+    if pending is not None:
+        pending.add((user_id, section))
+    else:
+        notify_user_data_change(user_id, section)
+
+
+# =============================================================================
+# SECTION LISTS
+# =============================================================================
+
+# Section -> (table, bullet table, bullet parent column)
+SECTION_TABLES = {
+    "summaries": ("summaries", None, None),
+    "skills": ("skills", "skill_bullets", "skill"),
+    "experiences": ("experiences", "experience_bullets", "experience"),
+    "projects": ("projects", "project_bullets", "project"),
+    "educations": ("education", None, None),
+    "references": ("user_references", None, None),
+}
+
+# Largest id list bound into one IN (...) query
+_ID_CHUNK = 500
+
+# Per-section statements. app.migrations.QUERY_PLANS checks these same
+# strings, so change a query here and its plan is checked as it runs.
+ITEM_BY_ID_SQL = {
+    section: f"SELECT * FROM {table} WHERE id = ? AND user = ?"
+    for section, (table, _, _) in SECTION_TABLES.items()
+}
+BULLETS_SQL = {
+    section: f"SELECT text FROM {bullets} WHERE {parent} = ? ORDER BY id"
+    for section, (_, bullets, parent) in SECTION_TABLES.items() if bullets
+}
+BULLETS_LIKE_SQL = {
+    section: f"SELECT text FROM {bullets} WHERE {parent} = ? AND text LIKE ? ORDER BY id"
+    for section, (_, bullets, parent) in SECTION_TABLES.items() if bullets
+}
+# {ids} is one ? per parent; ordering by parent first lets the index
+# return each parent's bullets in id order without a sort
+BULLETS_OF_PARENTS_SQL = {
+    section: f"SELECT {parent}, text FROM {bullets} WHERE {parent} IN ({{ids}}) ORDER BY {parent}, id"
+    for section, (_, bullets, parent) in SECTION_TABLES.items() if bullets
+}
+
+
+def section_list_sql(section: str, columns: tuple[str, ...] = None, search: bool = False,
+                     after: bool = False, limit: bool = False) -> str:
+    """
+    The list query of a section, newest first. Its parameters are the user
+    id, then the MATCH expression if search, the id if after and the row
+    count if limit.
+    """
+    table = SECTION_TABLES[section][0]
+    selected = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+    sql = f"SELECT {selected} FROM {table} WHERE user = ?"
+    if search:
+        sql += f" AND id IN ({_search_ids_sql(section)})"
+    if after:
+        sql += " AND id < ?"
+    sql += " ORDER BY id DESC"
+    if limit:
+        sql += " LIMIT ?"
+    return sql
+
+
+def _attach_bullets(conn, section: str, items: list[dict]) -> None:
+    """Set bullet_points on items of a bulleted section, one query per chunk of items."""
+    if section not in BULLETS_OF_PARENTS_SQL or not items:
+        return
+    by_parent = {}
+    for item in items:
+        item["bullet_points"] = []
+        by_parent[item["id"]] = item
+    ids = list(by_parent)
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        rows = conn.execute(
+            BULLETS_OF_PARENTS_SQL[section].format(ids=", ".join("?" * len(chunk))),
+            tuple(chunk)
+        ).fetchall()
+        for parent_id, text in rows:
+            by_parent[parent_id]["bullet_points"].append(text)
+
+
+def list_section_items(conn, user_id: int, section: str, query: str = None,
+                       limit: int = None, after: int = None, bullets: bool = True,
+                       columns: tuple[str, ...] = None) -> list[dict]:
+    """
+    Get a user's items in one section, newest first. query filters through
+    the full-text index; limit and after page through the list by id
+    (after is the last id of the previous page). Bulleted sections get
+    bullet_points unless bullets is False. columns (which must include id)
+    selects only those columns, so rows can be returned to clients as-is.
+    """
+    params: list = [user_id]
+    if query:
+        match = search_match_expression(user_id, query)
+        if match is None:
+            return []
+        params.append(match)
+    if after is not None:
+        params.append(after)
+    if limit is not None:
+        params.append(limit)
+    sql = section_list_sql(section, columns, bool(query), after is not None, limit is not None)
+    items = fetch_dicts(conn, sql, tuple(params))
+    if bullets:
+        _attach_bullets(conn, section, items)
+    return items
+
+
+def get_section_items(conn, user_id: int, section: str, ids: list[int] = None,
+                      columns: tuple[str, ...] = None) -> list[dict]:
+    """
+    Get a user's items in one section, newest first, with bullet_points for
+    bulleted sections; ids restricts the result to those items. columns
+    (which must include id) selects only those columns.
+    """
+    if ids is None:
+        return list_section_items(conn, user_id, section, columns=columns)
+    table = SECTION_TABLES[section][0]
+    selected = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+    ids = list(ids)
+    items = []
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        items.extend(fetch_dicts(
+            conn,
+            f"SELECT {selected} FROM {table} WHERE user = ? AND id IN ({', '.join('?' * len(chunk))})",
+            (user_id, *chunk)
+        ))
+    items.sort(key=lambda item: item["id"], reverse=True)
+    _attach_bullets(conn, section, items)
+    return items
+
+
+def _json_object_sql(fields: tuple[str, ...], row: str) -> str:
+    return ", ".join(f"'{field}', {row}.\"{field}\"" for field in fields)
+
+
+def get_profile_bundle(conn, user_id: int, profile_fields: tuple[str, ...],
+                       sections: dict[str, tuple[str, ...]]) -> dict:
+    """
+    Get the user's profile and whole sections in a single statement (one
+    round trip to Turso): each part is aggregated to JSON by SQLite. sections
+    maps a section to the fields of each item, newest item first; a
+    bullet_points field is filled from the section's bullet table.
+    Returns {"profile": {...} | None, section: [...]}.
+    """
+    parts = [f"SELECT 'profile', json_object({_json_object_sql(profile_fields, 'u')}) FROM users u WHERE u.id = ?"]
+    params = [user_id]
+    for section, fields in sections.items():
+        table, bullet_table, parent = SECTION_TABLES[section]
+        item = _json_object_sql(tuple(f for f in fields if f != "bullet_points"), "t")
+        if "bullet_points" in fields and bullet_table:
+            item += f""", 'bullet_points', json((SELECT json_group_array(text) FROM
+                (SELECT text FROM {bullet_table} WHERE {parent} = t.id ORDER BY id)))"""
+        parts.append(
+            f"""SELECT '{section}', json_group_array(json(item)) FROM
+                (SELECT json_object({item}) AS item FROM {table} t WHERE t.user = ? ORDER BY t.id DESC)"""
+        )
+        params.append(user_id)
+
+    bundle = {"profile": None, **{section: [] for section in sections}}
+    for key, value in conn.execute(" UNION ALL ".join(parts), tuple(params)).fetchall():
+        bundle[key] = json.loads(value)
+    return bundle
+
+
+# =============================================================================
+# CHANGE FEED
+# =============================================================================
+
+CHANGES_SQL = "SELECT id, section, item_id, op FROM change_log WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?"
+PRUNE_CHANGE_LOG_SQL = """DELETE FROM change_log WHERE created_at < ?
+    AND id < (SELECT MAX(id) FROM change_log)"""
+
+
+def get_changes(conn, user_id: int, since: int, limit: int) -> list[tuple]:
+    """Get up to limit (id, section, item_id, op) change log rows after the cursor, oldest first."""
+    return conn.execute(
+        CHANGES_SQL,
+        (user_id, since, limit)
+    ).fetchall()
+
+
+def get_change_cursor(conn) -> int:
+    """Get the id of the latest change log row (0 if none); a snapshot taken after this is current to it."""
+    row = conn.execute("SELECT MAX(id) FROM change_log").fetchone()
+    return row[0] or 0
+
+
+def get_change_log_floor(conn) -> int:
+    """Get the cursor below which the change log has been pruned."""
+    row = conn.execute("SELECT MIN(id) FROM change_log").fetchone()
+    return row[0] - 1 if row[0] is not None else 0
+
+
+def prune_change_log(conn, older_than: str) -> int:
+    """
+    Delete change log rows created before older_than (an ISO timestamp),
+    always keeping the newest row so the pruned floor stays known.
+    Returns the number of rows deleted.
+    """
+    cursor = conn.execute(PRUNE_CHANGE_LOG_SQL, (older_than,))
+    conn.commit()
+    return cursor.rowcount
+
+
+# =============================================================================
+# BATCHED WRITES
+# =============================================================================
+
+def _insert_bullets(conn, table: str, parent: str, parent_id: int, bullet_points: list[str]) -> None:
+    """Insert an item's bullets with one multi-row statement; repeated texts are stored once."""
+    if not bullet_points:
+        return
+    # Bullet texts are unique per item
+    bullet_points = list(dict.fromkeys(bullet_points))
+    for start in range(0, len(bullet_points), _ID_CHUNK):
+        chunk = bullet_points[start:start + _ID_CHUNK]
+        params = []
+        for point in chunk:
+            params.extend((point, parent_id))
+        conn.execute(
+            f"INSERT INTO {table} (text, {parent}) VALUES {', '.join(['(?, ?)'] * len(chunk))}",
+            tuple(params)
+        )
+
+
+def get_existing_ids(conn, user_id: int, section: str, ids: list[int]) -> set[int]:
+    """Get which of the given item IDs in a section belong to the user."""
+    table = SECTION_TABLES[section][0]
+    ids = list(ids)
+    found = set()
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        rows = conn.execute(
+            f"SELECT id FROM {table} WHERE user = ? AND id IN ({', '.join('?' * len(chunk))})",
+            (user_id, *chunk)
+        ).fetchall()
+        found.update(row[0] for row in rows)
+    return found
+
+
+def delete_items(conn, user_id: int, section: str, ids: list[int]) -> None:
+    """Delete several of a user's items in one section (bullets cascade)."""
+    table = SECTION_TABLES[section][0]
+    ids = list(ids)
+    if not ids:
+        return
+    for start in range(0, len(ids), _ID_CHUNK):
+        chunk = ids[start:start + _ID_CHUNK]
+        conn.execute(
+            f"DELETE FROM {table} WHERE user = ? AND id IN ({', '.join('?' * len(chunk))})",
+            (user_id, *chunk)
+        )
+        params = []
+        for item_id in chunk:
+            params.extend((user_id, section, item_id, "delete"))
+        conn.execute(
+            "INSERT INTO change_log (user_id, section, item_id, op) VALUES "
+            + ", ".join(["(?, ?, ?, ?)"] * len(chunk)),
+            tuple(params)
+        )
+    _commit_change(conn, user_id, section)
 
 
 # =============================================================================
 # USER CRUD OPERATIONS
 # =============================================================================
 
-def get_user_by_email(conn, email: str) -> dict | None:
+USER_BY_EMAIL_SQL = "SELECT * FROM users WHERE email = ?"
+
+
+def get_user_by_email(conn, email: str) -> Record | None:
     """Get a user by email."""
-    return fetch_one(conn, "SELECT * FROM users WHERE email = ?", (email,))
+    return fetch_one(conn, USER_BY_EMAIL_SQL, (email,))
 
 
-def get_user_by_id(conn, user_id: int) -> dict | None:
+def get_user_by_id(conn, user_id: int) -> Record | None:
     """Get a user by ID."""
     return fetch_one(conn, "SELECT * FROM users WHERE id = ?", (user_id,))
 
 
+# User rows keyed by ID, without the password hash
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    name="user"
+)
+
+
+def get_cached_user_by_id(conn, user_id: int) -> dict | None:
+    """Get a user by ID through the in-process user cache."""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = get_user_by_id(conn, user_id)
+        if user is None:
+            return None
+        user = {name: value for name, value in user.items() if name != "password_hash"}
+        user_cache.set(user_id, user)
+    return dict(user)
+
+
 def create_user(conn, name: str, email: str, password_hash: str, 
                 phone: str = None, location: str = None, linkedin: str = None,
                 github: str = None, website: str = None) -> int:
@@ -233,6 +721,67 @@ def update_user(conn, user_id: int, name: str, email: str, phone: str = None,
                linkedin = ?, github = ?, website = ? WHERE id = ?""",
             (name, email, phone, location, linkedin, github, website, user_id)
         )
+    _commit_change(conn, user_id, "profile")
+    user_cache.pop(user_id)
+
+
+def update_user_password_hash(conn, user_id: int, password_hash: str) -> None:
+    """Replace a user's password hash (e.g. after a bcrypt cost change)."""
+    conn.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ?",
+        (password_hash, user_id)
+    )
+    conn.commit()
+
+
+# =============================================================================
+# REFRESH TOKEN OPERATIONS
+# =============================================================================
+
+def create_refresh_token(conn, user_id: int, token_hash: str, expires_at: str) -> int:
+    """Store a refresh token hash and return its ID."""
+    cursor = conn.execute(
+        "INSERT INTO refresh_tokens (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+        (token_hash, user_id, expires_at)
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+REFRESH_TOKEN_SQL = "SELECT * FROM refresh_tokens WHERE token_hash = ?"
+REVOKE_USER_REFRESH_TOKENS_SQL = "UPDATE refresh_tokens SET revoked_at = ? WHERE user_id = ? AND revoked_at IS NULL"
+PURGE_USER_REFRESH_TOKENS_SQL = "DELETE FROM refresh_tokens WHERE user_id = ? AND expires_at < ?"
+
+
+def get_refresh_token(conn, token_hash: str) -> Record | None:
+    """Get a refresh token by its hash."""
+    return fetch_one(
+        conn,
+        REFRESH_TOKEN_SQL,
+        (token_hash,)
+    )
+
+
+def revoke_refresh_token(conn, token_id: int, revoked_at: str) -> bool:
+    """Revoke a refresh token. Returns False if it was already revoked."""
+    cursor = conn.execute(
+        "UPDATE refresh_tokens SET revoked_at = ? WHERE id = ? AND revoked_at IS NULL",
+        (revoked_at, token_id)
+    )
+    conn.commit()
+    return cursor.rowcount > 0
+
+
+def revoke_user_refresh_tokens(conn, user_id: int, revoked_at: str) -> None:
+    """Revoke every active refresh token of a user and purge expired ones."""
+    conn.execute(
+        REVOKE_USER_REFRESH_TOKENS_SQL,
+        (revoked_at, user_id)
+    )
+    conn.execute(
+        PURGE_USER_REFRESH_TOKENS_SQL,
+        (user_id, revoked_at)
+    )
     conn.commit()
 
 
@@ -240,31 +789,23 @@ def update_user(conn, user_id: int, name: str, email: str, phone: str = None,
 # SUMMARIES CRUD OPERATIONS
 # =============================================================================
 
-def get_summaries(conn, user_id: int, query: str = None) -> list[dict]:
+def get_summaries(conn, user_id: int, query: str = None, limit: int = None,
+                  after: int = None,
+                  columns: tuple[str, ...] = None) -> list[dict]:
     """Get all summaries for a user, optionally filtered by query."""
-    if query:
-        return fetch_all(
-            conn,
-            "SELECT * FROM summaries WHERE user = ? AND text LIKE ? ORDER BY id DESC",
-            (user_id, f"%{query}%")
-        )
-    return fetch_all(
-        conn, 
-        "SELECT * FROM summaries WHERE user = ? ORDER BY id DESC", 
-        (user_id,)
-    )
+    return list_section_items(conn, user_id, "summaries", query, limit, after, columns=columns)
 
 
-def get_summary_by_id(conn, summary_id: int, user_id: int) -> dict | None:
+def get_summary_by_id(conn, summary_id: int, user_id: int) -> Record | None:
     """Get a summary by ID and user ID."""
     return fetch_one(
         conn, 
-        "SELECT * FROM summaries WHERE id = ? AND user = ?", 
+        ITEM_BY_ID_SQL["summaries"],
         (summary_id, user_id)
     )
 
 
-def get_summary_by_text(conn, text: str, user_id: int) -> dict | None:
+def get_summary_by_text(conn, text: str, user_id: int) -> Record | None:
     """Get a summary by text and user ID."""
     return fetch_one(
         conn, 
@@ -279,75 +820,55 @@ def create_summary(conn, text: str, user_id: int) -> int:
         "INSERT INTO summaries (text, user) VALUES (?, ?)",
         (text, user_id)
     )
-    conn.commit()
+    _commit_change(conn, user_id, "summaries", cursor.lastrowid, "create")
     return cursor.lastrowid
 
 
-def update_summary(conn, summary_id: int, text: str) -> None:
+def update_summary(conn, summary_id: int, user_id: int, text: str) -> None:
     """Update a summary's text."""
-    conn.execute("UPDATE summaries SET text = ? WHERE id = ?", (text, summary_id))
-    conn.commit()
+    conn.execute(
+        "UPDATE summaries SET text = ? WHERE id = ? AND user = ?",
+        (text, summary_id, user_id)
+    )
+    _commit_change(conn, user_id, "summaries", summary_id, "update")
 
 
-def delete_summary(conn, summary_id: int) -> None:
+def delete_summary(conn, summary_id: int, user_id: int) -> None:
     """Delete a summary."""
-    conn.execute("DELETE FROM summaries WHERE id = ?", (summary_id,))
-    conn.commit()
+    conn.execute("DELETE FROM summaries WHERE id = ? AND user = ?", (summary_id, user_id))
+    _commit_change(conn, user_id, "summaries", summary_id, "delete")
 
 
 # =============================================================================
 # SKILLS CRUD OPERATIONS
 # =============================================================================
 
-def get_skills(conn, user_id: int, query: str = None) -> list[dict]:
+def get_skills(conn, user_id: int, query: str = None, limit: int = None,
+               after: int = None, bullets: bool = True,
+               columns: tuple[str, ...] = None) -> list[dict]:
     """Get all skills for a user with their bullets."""
-    if query:
-        skills = fetch_all(
-            conn,
-            "SELECT * FROM skills WHERE user = ? AND skill_name LIKE ? ORDER BY id DESC",
-            (user_id, f"%{query}%")
-        )
-    else:
-        skills = fetch_all(
-            conn, 
-            "SELECT * FROM skills WHERE user = ? ORDER BY id DESC", 
-            (user_id,)
-        )
-    
-    # Fetch bullets for each skill
-    for skill in skills:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM skill_bullets WHERE skill = ?",
-            (skill["id"],)
-        )
-        skill["bullet_points"] = [b["text"] for b in bullets]
-    
-    return skills
+    return list_section_items(conn, user_id, "skills", query, limit, after, bullets, columns=columns)
 
 
 def get_skill_by_id(conn, skill_id: int, user_id: int) -> dict | None:
     """Get a skill by ID and user ID."""
-    skill = fetch_one(
-        conn, 
-        "SELECT * FROM skills WHERE id = ? AND user = ?", 
+    items = fetch_dicts(
+        conn,
+        ITEM_BY_ID_SQL["skills"],
         (skill_id, user_id)
     )
-    if skill:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM skill_bullets WHERE skill = ?",
-            (skill_id,)
-        )
-        skill["bullet_points"] = [b["text"] for b in bullets]
-    return skill
+    _attach_bullets(conn, "skills", items)
+    return items[0] if items else None
+
 
+SKILL_BY_NAME_SQL = "SELECT * FROM skills WHERE skill_name = ? AND user = ?"
 
-def get_skill_by_name(conn, skill_name: str, user_id: int) -> dict | None:
+
+def get_skill_by_name(conn, skill_name: str, user_id: int) -> Record | None:
     """Get a skill by name and user ID."""
     return fetch_one(
         conn, 
-        "SELECT * FROM skills WHERE skill_name = ? AND user = ?", 
+        SKILL_BY_NAME_SQL,
         (skill_name, user_id)
     )
 
@@ -360,38 +881,32 @@ def create_skill(conn, skill_name: str, user_id: int, bullet_points: list[str] =
     )
     skill_id = cursor.lastrowid
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO skill_bullets (text, skill) VALUES (?, ?)",
-                (point, skill_id)
-            )
+    _insert_bullets(conn, "skill_bullets", "skill", skill_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "skills", skill_id, "create")
     return skill_id
 
 
-def update_skill(conn, skill_id: int, skill_name: str, bullet_points: list[str] = None) -> None:
+def update_skill(conn, skill_id: int, user_id: int, skill_name: str,
+                 bullet_points: list[str] = None) -> None:
     """Update a skill's name and bullets."""
-    conn.execute("UPDATE skills SET skill_name = ? WHERE id = ?", (skill_name, skill_id))
+    conn.execute(
+        "UPDATE skills SET skill_name = ? WHERE id = ? AND user = ?",
+        (skill_name, skill_id, user_id)
+    )
     
     # Delete existing bullets and re-insert
     conn.execute("DELETE FROM skill_bullets WHERE skill = ?", (skill_id,))
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO skill_bullets (text, skill) VALUES (?, ?)",
-                (point, skill_id)
-            )
+    _insert_bullets(conn, "skill_bullets", "skill", skill_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "skills", skill_id, "update")
 
 
-def delete_skill(conn, skill_id: int) -> None:
+def delete_skill(conn, skill_id: int, user_id: int) -> None:
     """Delete a skill (bullets will cascade)."""
-    conn.execute("DELETE FROM skills WHERE id = ?", (skill_id,))
-    conn.commit()
+    conn.execute("DELETE FROM skills WHERE id = ? AND user = ?", (skill_id, user_id))
+    _commit_change(conn, user_id, "skills", skill_id, "delete")
 
 
 def get_skill_bullets(conn, skill_id: int, query: str = None) -> list[str]:
@@ -399,13 +914,13 @@ def get_skill_bullets(conn, skill_id: int, query: str = None) -> list[str]:
     if query:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM skill_bullets WHERE skill = ? AND text LIKE ?",
+            BULLETS_LIKE_SQL["skills"],
             (skill_id, f"%{query}%")
         )
     else:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM skill_bullets WHERE skill = ?",
+            BULLETS_SQL["skills"],
             (skill_id,)
         )
     return [b["text"] for b in bullets]
@@ -415,52 +930,26 @@ def get_skill_bullets(conn, skill_id: int, query: str = None) -> list[str]:
 # EXPERIENCES CRUD OPERATIONS
 # =============================================================================
 
-def get_experiences(conn, user_id: int, query: str = None) -> list[dict]:
+def get_experiences(conn, user_id: int, query: str = None, limit: int = None,
+                    after: int = None, bullets: bool = True,
+                    columns: tuple[str, ...] = None) -> list[dict]:
     """Get all experiences for a user with their bullets."""
-    if query:
-        experiences = fetch_all(
-            conn,
-            "SELECT * FROM experiences WHERE user = ? AND experience_name LIKE ? ORDER BY id DESC",
-            (user_id, f"%{query}%")
-        )
-    else:
-        experiences = fetch_all(
-            conn, 
-            "SELECT * FROM experiences WHERE user = ? ORDER BY id DESC", 
-            (user_id,)
-        )
-    
-    # Fetch bullets for each experience
-    for exp in experiences:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM experience_bullets WHERE experience = ?",
-            (exp["id"],)
-        )
-        exp["bullet_points"] = [b["text"] for b in bullets]
-    
-    return experiences
+    return list_section_items(conn, user_id, "experiences", query, limit, after, bullets, columns=columns)
 
 
 def get_experience_by_id(conn, experience_id: int, user_id: int) -> dict | None:
     """Get an experience by ID and user ID."""
-    exp = fetch_one(
-        conn, 
-        "SELECT * FROM experiences WHERE id = ? AND user = ?", 
+    items = fetch_dicts(
+        conn,
+        ITEM_BY_ID_SQL["experiences"],
         (experience_id, user_id)
     )
-    if exp:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM experience_bullets WHERE experience = ?",
-            (experience_id,)
-        )
-        exp["bullet_points"] = [b["text"] for b in bullets]
-    return exp
+    _attach_bullets(conn, "experiences", items)
+    return items[0] if items else None
 
 
 def get_experience_by_details(conn, experience_name: str, start_year: str, 
-                               end_year: str, user_id: int) -> dict | None:
+                               end_year: str, user_id: int) -> Record | None:
     """Get an experience by details."""
     return fetch_one(
         conn,
@@ -480,43 +969,37 @@ def create_experience(conn, experience_name: str, user_id: int,
     )
     exp_id = cursor.lastrowid
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO experience_bullets (text, experience) VALUES (?, ?)",
-                (point, exp_id)
-            )
+    _insert_bullets(conn, "experience_bullets", "experience", exp_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "experiences", exp_id, "create")
     return exp_id
 
 
-def update_experience(conn, experience_id: int, experience_name: str,
+def update_experience(conn, experience_id: int, user_id: int, experience_name: str,
                      start_year: str = None, end_year: str = None,
                      bullet_points: list[str] = None) -> None:
     """Update an experience's details and bullets."""
     conn.execute(
-        "UPDATE experiences SET experience_name = ?, start_year = ?, end_year = ? WHERE id = ?",
-        (experience_name, start_year, end_year, experience_id)
+        """UPDATE experiences SET experience_name = ?, start_year = ?, end_year = ?
+           WHERE id = ? AND user = ?""",
+        (experience_name, start_year, end_year, experience_id, user_id)
     )
     
     # Delete existing bullets and re-insert
     conn.execute("DELETE FROM experience_bullets WHERE experience = ?", (experience_id,))
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO experience_bullets (text, experience) VALUES (?, ?)",
-                (point, experience_id)
-            )
+    _insert_bullets(conn, "experience_bullets", "experience", experience_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "experiences", experience_id, "update")
 
 
-def delete_experience(conn, experience_id: int) -> None:
+def delete_experience(conn, experience_id: int, user_id: int) -> None:
     """Delete an experience (bullets will cascade)."""
-    conn.execute("DELETE FROM experiences WHERE id = ?", (experience_id,))
-    conn.commit()
+    conn.execute(
+        "DELETE FROM experiences WHERE id = ? AND user = ?",
+        (experience_id, user_id)
+    )
+    _commit_change(conn, user_id, "experiences", experience_id, "delete")
 
 
 def get_experience_bullets(conn, experience_id: int, query: str = None) -> list[str]:
@@ -524,13 +1007,13 @@ def get_experience_bullets(conn, experience_id: int, query: str = None) -> list[
     if query:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM experience_bullets WHERE experience = ? AND text LIKE ?",
+            BULLETS_LIKE_SQL["experiences"],
             (experience_id, f"%{query}%")
         )
     else:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM experience_bullets WHERE experience = ?",
+            BULLETS_SQL["experiences"],
             (experience_id,)
         )
     return [b["text"] for b in bullets]
@@ -540,51 +1023,25 @@ def get_experience_bullets(conn, experience_id: int, query: str = None) -> list[
 # PROJECTS CRUD OPERATIONS
 # =============================================================================
 
-def get_projects(conn, user_id: int, query: str = None) -> list[dict]:
+def get_projects(conn, user_id: int, query: str = None, limit: int = None,
+                 after: int = None, bullets: bool = True,
+                 columns: tuple[str, ...] = None) -> list[dict]:
     """Get all projects for a user with their bullets."""
-    if query:
-        projects = fetch_all(
-            conn,
-            "SELECT * FROM projects WHERE user = ? AND project_name LIKE ? ORDER BY id DESC",
-            (user_id, f"%{query}%")
-        )
-    else:
-        projects = fetch_all(
-            conn, 
-            "SELECT * FROM projects WHERE user = ? ORDER BY id DESC", 
-            (user_id,)
-        )
-    
-    # Fetch bullets for each project
-    for proj in projects:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM project_bullets WHERE project = ?",
-            (proj["id"],)
-        )
-        proj["bullet_points"] = [b["text"] for b in bullets]
-    
-    return projects
+    return list_section_items(conn, user_id, "projects", query, limit, after, bullets, columns=columns)
 
 
 def get_project_by_id(conn, project_id: int, user_id: int) -> dict | None:
     """Get a project by ID and user ID."""
-    proj = fetch_one(
-        conn, 
-        "SELECT * FROM projects WHERE id = ? AND user = ?", 
+    items = fetch_dicts(
+        conn,
+        ITEM_BY_ID_SQL["projects"],
         (project_id, user_id)
     )
-    if proj:
-        bullets = fetch_all(
-            conn,
-            "SELECT text FROM project_bullets WHERE project = ?",
-            (project_id,)
-        )
-        proj["bullet_points"] = [b["text"] for b in bullets]
-    return proj
+    _attach_bullets(conn, "projects", items)
+    return items[0] if items else None
 
 
-def get_project_by_details(conn, project_name: str, github_link: str, user_id: int) -> dict | None:
+def get_project_by_details(conn, project_name: str, github_link: str, user_id: int) -> Record | None:
     """Get a project by details."""
     return fetch_one(
         conn,
@@ -602,42 +1059,32 @@ def create_project(conn, project_name: str, user_id: int,
     )
     proj_id = cursor.lastrowid
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO project_bullets (text, project) VALUES (?, ?)",
-                (point, proj_id)
-            )
+    _insert_bullets(conn, "project_bullets", "project", proj_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "projects", proj_id, "create")
     return proj_id
 
 
-def update_project(conn, project_id: int, project_name: str,
+def update_project(conn, project_id: int, user_id: int, project_name: str,
                    github_link: str = None, bullet_points: list[str] = None) -> None:
     """Update a project's details and bullets."""
     conn.execute(
-        "UPDATE projects SET project_name = ?, github_link = ? WHERE id = ?",
-        (project_name, github_link, project_id)
+        "UPDATE projects SET project_name = ?, github_link = ? WHERE id = ? AND user = ?",
+        (project_name, github_link, project_id, user_id)
     )
     
     # Delete existing bullets and re-insert
     conn.execute("DELETE FROM project_bullets WHERE project = ?", (project_id,))
     
-    if bullet_points:
-        for point in bullet_points:
-            conn.execute(
-                "INSERT INTO project_bullets (text, project) VALUES (?, ?)",
-                (point, project_id)
-            )
+    _insert_bullets(conn, "project_bullets", "project", project_id, bullet_points)
     
-    conn.commit()
+    _commit_change(conn, user_id, "projects", project_id, "update")
 
 
-def delete_project(conn, project_id: int) -> None:
+def delete_project(conn, project_id: int, user_id: int) -> None:
     """Delete a project (bullets will cascade)."""
-    conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-    conn.commit()
+    conn.execute("DELETE FROM projects WHERE id = ? AND user = ?", (project_id, user_id))
+    _commit_change(conn, user_id, "projects", project_id, "delete")
 
 
 def get_project_bullets(conn, project_id: int, query: str = None) -> list[str]:
@@ -645,13 +1092,13 @@ def get_project_bullets(conn, project_id: int, query: str = None) -> list[str]:
     if query:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM project_bullets WHERE project = ? AND text LIKE ?",
+            BULLETS_LIKE_SQL["projects"],
             (project_id, f"%{query}%")
         )
     else:
         bullets = fetch_all(
             conn,
-            "SELECT text FROM project_bullets WHERE project = ?",
+            BULLETS_SQL["projects"],
             (project_id,)
         )
     return [b["text"] for b in bullets]
@@ -661,33 +1108,24 @@ def get_project_bullets(conn, project_id: int, query: str = None) -> list[str]:
 # EDUCATION CRUD OPERATIONS
 # =============================================================================
 
-def get_educations(conn, user_id: int, query: str = None) -> list[dict]:
+def get_educations(conn, user_id: int, query: str = None, limit: int = None,
+                   after: int = None,
+                   columns: tuple[str, ...] = None) -> list[dict]:
     """Get all education entries for a user."""
-    if query:
-        return fetch_all(
-            conn,
-            """SELECT * FROM education WHERE user = ? AND 
-               (education_name LIKE ? OR institution LIKE ?) ORDER BY id DESC""",
-            (user_id, f"%{query}%", f"%{query}%")
-        )
-    return fetch_all(
-        conn, 
-        "SELECT * FROM education WHERE user = ? ORDER BY id DESC", 
-        (user_id,)
-    )
+    return list_section_items(conn, user_id, "educations", query, limit, after, columns=columns)
 
 
-def get_education_by_id(conn, education_id: int, user_id: int) -> dict | None:
+def get_education_by_id(conn, education_id: int, user_id: int) -> Record | None:
     """Get an education entry by ID and user ID."""
     return fetch_one(
         conn, 
-        "SELECT * FROM education WHERE id = ? AND user = ?", 
+        ITEM_BY_ID_SQL["educations"],
         (education_id, user_id)
     )
 
 
 def get_education_by_details(conn, education_name: str, institution: str,
-                             start: str, end: str, grade: str, user_id: int) -> dict | None:
+                             start: str, end: str, grade: str, user_id: int) -> Record | None:
     """Get an education entry by details."""
     return fetch_one(
         conn,
@@ -704,51 +1142,51 @@ def create_education(conn, education_name: str, institution: str, user_id: int,
         "INSERT INTO education (education_name, institution, start, end, grade, user) VALUES (?, ?, ?, ?, ?, ?)",
         (education_name, institution, start, end, grade, user_id)
     )
-    conn.commit()
+    _commit_change(conn, user_id, "educations", cursor.lastrowid, "create")
     return cursor.lastrowid
 
 
-def update_education(conn, education_id: int, education_name: str, institution: str,
-                     start: str = None, end: str = None, grade: str = None) -> None:
+def update_education(conn, education_id: int, user_id: int, education_name: str,
+                     institution: str, start: str = None, end: str = None,
+                     grade: str = None) -> None:
     """Update an education entry."""
     conn.execute(
-        "UPDATE education SET education_name = ?, institution = ?, start = ?, end = ?, grade = ? WHERE id = ?",
-        (education_name, institution, start, end, grade, education_id)
+        """UPDATE education SET education_name = ?, institution = ?, start = ?, end = ?, grade = ?
+           WHERE id = ? AND user = ?""",
+        (education_name, institution, start, end, grade, education_id, user_id)
     )
-    conn.commit()
+    _commit_change(conn, user_id, "educations", education_id, "update")
 
 
-def delete_education(conn, education_id: int) -> None:
+def delete_education(conn, education_id: int, user_id: int) -> None:
     """Delete an education entry."""
-    conn.execute("DELETE FROM education WHERE id = ?", (education_id,))
-    conn.commit()
+    conn.execute("DELETE FROM education WHERE id = ? AND user = ?", (education_id, user_id))
+    _commit_change(conn, user_id, "educations", education_id, "delete")
 
 
 # =============================================================================
 # REFERENCES CRUD OPERATIONS
 # =============================================================================
 
-def get_references(conn, user_id: int) -> list[dict]:
+def get_references(conn, user_id: int, query: str = None, limit: int = None,
+                   after: int = None,
+                   columns: tuple[str, ...] = None) -> list[dict]:
     """Get all references for a user."""
-    return fetch_all(
-        conn, 
-        "SELECT * FROM user_references WHERE user = ? ORDER BY id DESC", 
-        (user_id,)
-    )
+    return list_section_items(conn, user_id, "references", query, limit, after, columns=columns)
 
 
-def get_reference_by_id(conn, reference_id: int, user_id: int) -> dict | None:
+def get_reference_by_id(conn, reference_id: int, user_id: int) -> Record | None:
     """Get a reference by ID and user ID."""
     return fetch_one(
         conn, 
-        "SELECT * FROM user_references WHERE id = ? AND user = ?", 
+        ITEM_BY_ID_SQL["references"],
         (reference_id, user_id)
     )
 
 
 def get_reference_by_details(conn, referer_name: str, referer_institute: str,
                              position: str, connection_type: str, 
-                             institution_url: str, user_id: int) -> dict | None:
+                             institution_url: str, user_id: int) -> Record | None:
     """Get a reference by details."""
     return fetch_one(
         conn,
@@ -767,23 +1205,117 @@ def create_reference(conn, referer_name: str, referer_institute: str, user_id: i
            connection_type, institution_url, user) VALUES (?, ?, ?, ?, ?, ?)""",
         (referer_name, referer_institute, position, connection_type, institution_url, user_id)
     )
-    conn.commit()
+    _commit_change(conn, user_id, "references", cursor.lastrowid, "create")
     return cursor.lastrowid
 
 
-def update_reference(conn, reference_id: int, referer_name: str, referer_institute: str,
-                     position: str = None, connection_type: str = None,
-                     institution_url: str = None) -> None:
+def update_reference(conn, reference_id: int, user_id: int, referer_name: str,
+                     referer_institute: str, position: str = None,
+                     connection_type: str = None, institution_url: str = None) -> None:
     """Update a reference."""
     conn.execute(
         """UPDATE user_references SET referer_name = ?, referer_institute = ?, position = ?, 
-           connection_type = ?, institution_url = ? WHERE id = ?""",
-        (referer_name, referer_institute, position, connection_type, institution_url, reference_id)
+           connection_type = ?, institution_url = ? WHERE id = ? AND user = ?""",
+        (referer_name, referer_institute, position, connection_type, institution_url,
+         reference_id, user_id)
     )
-    conn.commit()
+    _commit_change(conn, user_id, "references", reference_id, "update")
 
 
-def delete_reference(conn, reference_id: int) -> None:
+def delete_reference(conn, reference_id: int, user_id: int) -> None:
     """Delete a reference."""
-    conn.execute("DELETE FROM user_references WHERE id = ?", (reference_id,))
+    conn.execute(
+        "DELETE FROM user_references WHERE id = ? AND user = ?",
+        (reference_id, user_id)
+    )
+    _commit_change(conn, user_id, "references", reference_id, "delete")
+
+
+# =============================================================================
+# PROFILE PHOTOS
+# =============================================================================
+
+PHOTO_SQL = "SELECT * FROM photos WHERE user = ? AND id = ? AND rendition = ?"
+PHOTO_RENDITIONS_SQL = "SELECT rendition, width, height FROM photos WHERE user = ? AND id = ?"
+
+
+def get_photo(conn, user_id: int, photo_id: str, rendition: str) -> Record | None:
+    """Get one stored rendition of a user's photo, with its bytes."""
+    return fetch_one(
+        conn,
+        PHOTO_SQL,
+        (user_id, photo_id, rendition)
+    )
+
+
+def get_photo_renditions(conn, user_id: int, photo_id: str) -> list[Record]:
+    """Get the rendition names and sizes stored for a user's photo."""
+    return fetch_all(
+        conn,
+        PHOTO_RENDITIONS_SQL,
+        (user_id, photo_id)
+    )
+
+
+def save_photo(conn, user_id: int, photo_id: str,
+               renditions: dict[str, tuple[str, int, int, bytes]]) -> None:
+    """Store a photo's renditions ({name: (media_type, width, height, data)}) in one statement."""
+    rows = [(user_id, photo_id, name, *rendition) for name, rendition in renditions.items()]
+    conn.execute(
+        f"""INSERT OR IGNORE INTO photos (user, id, rendition, media_type, width, height, data)
+            VALUES {', '.join(['(?, ?, ?, ?, ?, ?, ?)'] * len(rows))}""",
+        tuple(value for row in rows for value in row)
+    )
     conn.commit()
+
+
+# =============================================================================
+# SUGGESTION INDEX QUERIES
+# =============================================================================
+
+def get_suggestion_rows(conn, user_id: int) -> dict[str, list[Record]]:
+    """Get the id/name columns of every section a user can autocomplete."""
+    return {
+        "skills": fetch_all(
+            conn,
+            "SELECT id, skill_name FROM skills WHERE user = ? ORDER BY id DESC",
+            (user_id,)
+        ),
+        "experiences": fetch_all(
+            conn,
+            """SELECT id, experience_name, start_year, end_year, ongoing
+               FROM experiences WHERE user = ? ORDER BY id DESC""",
+            (user_id,)
+        ),
+        "projects": fetch_all(
+            conn,
+            "SELECT id, project_name, github_link FROM projects WHERE user = ? ORDER BY id DESC",
+            (user_id,)
+        ),
+        "educations": fetch_all(
+            conn,
+            "SELECT id, education_name, institution FROM education WHERE user = ? ORDER BY id DESC",
+            (user_id,)
+        ),
+        "summaries": fetch_all(
+            conn,
+            "SELECT id, text FROM summaries WHERE user = ? ORDER BY id DESC",
+            (user_id,)
+        ),
+    }
+
+
+# Every bullet of a user's items in a bulleted section, with its parent ID
+SUGGESTION_BULLETS_SQL = {
+    section: f"""SELECT b.id, b.{parent} AS parent_id, b.text FROM {bullets} b
+        JOIN {table} p ON p.id = b.{parent} WHERE p.user = ?"""
+    for section, (table, bullets, parent) in SECTION_TABLES.items() if bullets
+}
+
+
+def get_suggestion_bullet_rows(conn, user_id: int) -> dict[str, list[Record]]:
+    """Get every bullet of a user's skills, experiences and projects, with its parent ID."""
+    return {
+        SECTION_TABLES[section][1]: fetch_all(conn, sql, (user_id,))
+        for section, sql in SUGGESTION_BULLETS_SQL.items()
+    }
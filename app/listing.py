@@ -0,0 +1,66 @@
+"""
+List endpoint helpers: keyset pagination and field projection.
+
+Section lists are ordered newest first (id DESC). With ?limit=N a list
+returns at most N items and, when more remain, a Link header pointing at
+the next page (?after=<last id seen>). ?fields=a,b returns only those keys
+plus id; sections with bullets skip loading them unless bullet_points is
+asked for. Only the projected columns are selected, so the rows the
+database layer returns are the response items as-is.
+"""
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Query, Request, Response
+
+
+MAX_PAGE_SIZE = 500
+
+# Shared query parameters for section list routes
+LIMIT_QUERY = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all items when omitted")
+AFTER_QUERY = Query(None, ge=1, description="Return items older than this id (the last id of the previous page)")
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return")
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[tuple[str, ...]]:
+    """
+    Parse a fields= projection; None means every field. Unknown names are a
+    400. id is always included: pages are linked by it.
+    """
+    if fields is None:
+        return None
+    wanted = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in wanted if name not in allowed]
+    if unknown or not wanted:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "fields is empty"
+        )
+    return tuple(dict.fromkeys(("id",) + wanted))
+
+
+def columns(fields: Optional[tuple[str, ...]]) -> Optional[tuple[str, ...]]:
+    """Table columns to select for a projection (bullet_points is not one); None selects all."""
+    if fields is None:
+        return None
+    return tuple(name for name in fields if name != "bullet_points")
+
+
+def wants(fields: Optional[tuple[str, ...]], name: str) -> bool:
+    """Whether a projection includes name."""
+    return fields is None or name in fields
+
+
+def fetch_limit(limit: Optional[int]) -> Optional[int]:
+    """Rows to fetch for a page: one extra to learn whether another page follows."""
+    return None if limit is None else limit + 1
+
+
+def paginate(request: Request, response: Response, items: list[dict], limit: Optional[int]) -> list[dict]:
+    """Trim items fetched with fetch_limit() to the page and link the next one."""
+    if limit is None or len(items) <= limit:
+        return items
+    items = items[:limit]
+    next_url = request.url.include_query_params(after=items[-1]["id"])
+    response.headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+    return items
+
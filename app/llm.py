@@ -1,14 +1,21 @@
 """LLM client setup and ATS optimization functions."""
-from typing import List, Optional
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
 
 from fastapi import HTTPException
-from anthropic import AsyncAnthropicFoundry
-import instructor
-from instructor import Instructor
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.models import Skill, Experience, Project, ATSResumeData, ATSGapsResponse
 from app import database as db
+from app import metrics
+
+if TYPE_CHECKING:
+    from instructor import Instructor
+
+logger = logging.getLogger(__name__)
 
 
 # LLM Prompts
@@ -33,11 +40,13 @@ Only include user-confirmed additional skills.
 """
 
 
-# Global client reference (set during app startup)
-_anthropic_client: Optional[Instructor] = None
+# Global client reference, created on first use: importing the anthropic and
+# instructor SDKs takes over a second, which cold starts should not pay for
+_anthropic_client: Optional["Instructor"] = None
+_client_lock = threading.Lock()
 
 
-def init_llm_client() -> Optional[Instructor]:
+def init_llm_client() -> Optional["Instructor"]:
     """Initialize the Anthropic LLM client."""
     global _anthropic_client
     
@@ -45,6 +54,9 @@ def init_llm_client() -> Optional[Instructor]:
         return None
     
     try:
+        from anthropic import AsyncAnthropicFoundry
+        import instructor
+
         client = AsyncAnthropicFoundry(
             api_key=settings.LLM_API_KEY_ANTHROPIC,
             base_url=settings.LLM_API_ENDPOINT_ANTHROPIC,
@@ -56,11 +68,25 @@ def init_llm_client() -> Optional[Instructor]:
         raise RuntimeError(f"Failed to initialize Anthropic client: {e}") from e
 
 
-def get_llm_client() -> Optional[Instructor]:
-    """Get the LLM client instance."""
+def get_llm_client() -> Optional["Instructor"]:
+    """Get the LLM client instance, initializing it on first use."""
+    if _anthropic_client is None and settings.has_llm_config:
+        with _client_lock:
+            if _anthropic_client is None:
+                try:
+                    init_llm_client()
+                except RuntimeError as e:
+                    logger.warning(f"LLM client initialization failed: {e}")
     return _anthropic_client
 
 
+async def get_llm_client_async() -> Optional["Instructor"]:
+    """get_llm_client for async code; the first call imports the SDKs off the event loop."""
+    if _anthropic_client is not None:
+        return _anthropic_client
+    return await run_in_threadpool(get_llm_client)
+
+
 def fetch_user_skills(conn, user_id: int) -> List[Skill]:
     """Fetch all skills for a user as Skill models."""
     skills_data = db.get_skills(conn, user_id)
@@ -100,17 +126,35 @@ def fetch_user_projects(conn, user_id: int) -> List[Project]:
     ]
 
 
-async def run_ats_gaps(job_description: str, user_id: int) -> ATSGapsResponse:
+async def _complete(client: "Instructor", task: str, **kwargs):
+    """
+    One structured completion for a task (instructor's create), recording
+    its latency in llm_call_seconds and its token usage in llm_tokens_total.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response, completion = await client.completions.create_with_completion(**kwargs)
+        outcome = "ok"
+    finally:
+        metrics.LLM_CALL_SECONDS.labels(task, outcome).observe(time.perf_counter() - started)
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        metrics.LLM_TOKENS.labels(task, "input").inc(getattr(usage, "input_tokens", 0) or 0)
+        metrics.LLM_TOKENS.labels(task, "output").inc(getattr(usage, "output_tokens", 0) or 0)
+    return response
+
+
+async def run_ats_gaps(conn, job_description: str, user_id: int) -> ATSGapsResponse:
     """Run ATS gaps analysis to find missing skills."""
-    client = get_llm_client()
+    client = await get_llm_client_async()
     
     if not client:
         raise HTTPException(status_code=503, detail="LLM client not configured")
     
-    with db.get_db() as conn:
-        skills = fetch_user_skills(conn, user_id)
-        experience = fetch_user_experiences(conn, user_id)
-        projects = fetch_user_projects(conn, user_id)
+    skills = fetch_user_skills(conn, user_id)
+    experience = fetch_user_experiences(conn, user_id)
+    projects = fetch_user_projects(conn, user_id)
     
     input_str = f"Job Description:\n{job_description}\n\n"
     input_str += "User's Skills:\n"
@@ -124,7 +168,9 @@ async def run_ats_gaps(job_description: str, user_id: int) -> ATSGapsResponse:
         input_str += proj.to_ai_context_string() + "\n"
     
     try:
-        response = await client.completions.create(
+        response = await _complete(
+            client,
+            "ats_gaps",
             model=settings.LLM_DEPLOYMENT_NAME_ANTHROPIC,
             messages=[
                 {"role": "system", "content": PROMPT_GAPS},
@@ -140,20 +186,20 @@ async def run_ats_gaps(job_description: str, user_id: int) -> ATSGapsResponse:
 
 
 async def run_ats_optimization(
+    conn,
     job_description: str, 
     user_id: int, 
     selected_missing_skills: Optional[List[str]] = None
 ) -> ATSResumeData:
     """Run ATS optimization to tailor resume for a job."""
-    client = get_llm_client()
+    client = await get_llm_client_async()
     
     if not client:
         raise HTTPException(status_code=503, detail="LLM client not configured")
     
-    with db.get_db() as conn:
-        skills = fetch_user_skills(conn, user_id)
-        experience = fetch_user_experiences(conn, user_id)
-        projects = fetch_user_projects(conn, user_id)
+    skills = fetch_user_skills(conn, user_id)
+    experience = fetch_user_experiences(conn, user_id)
+    projects = fetch_user_projects(conn, user_id)
     
     input_str = f"Job Description:\n{job_description}\n\n"
     input_str += "User's Skills:\n"
@@ -172,7 +218,9 @@ async def run_ats_optimization(
             input_str += f"- {skill}\n"
     
     try:
-        response = await client.completions.create(
+        response = await _complete(
+            client,
+            "ats_optimize",
             model=settings.LLM_DEPLOYMENT_NAME_ANTHROPIC,
             messages=[
                 {"role": "system", "content": PROMPT_FINAL},
@@ -0,0 +1,371 @@
+"""
+In-process metric collectors (counters, gauges and histograms).
+
+Every metric defined here is added to REGISTRY, which app.prometheus
+renders at /metrics. Family splits a metric by label values; Callback
+reads values kept elsewhere (cache counters, threadpool state) when the
+registry is collected.
+"""
+import threading
+from bisect import bisect_left
+from typing import Callable
+
+import anyio.to_thread
+
+from app import cache
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every metric created with the default registry, in definition order
+REGISTRY: list = []
+
+
+class Counter:
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, registry: list | None = REGISTRY):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def sample(self) -> float:
+        return self._value
+
+    def collect(self) -> list[tuple[dict, float]]:
+        return [({}, self.sample())]
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, registry: list | None = REGISTRY):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def sample(self) -> float:
+        return self._value
+
+    def collect(self) -> list[tuple[dict, float]]:
+        return [({}, self.sample())]
+
+
+class Histogram:
+    """Bucketed distribution of observed values."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS,
+                 registry: list | None = REGISTRY):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Return cumulative bucket counts, sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+    def sample(self) -> dict:
+        return self.snapshot()
+
+    def collect(self) -> list[tuple[dict, dict]]:
+        return [({}, self.sample())]
+
+
+class Family:
+    """
+    One metric split by label values, e.g.
+    HTTP_REQUESTS.labels("GET", "/api/skills", "200").inc().
+    Children are created on first use, so label values must come from a
+    small fixed set (route templates, not raw paths).
+    """
+
+    def __init__(self, metric: type, name: str, description: str, labelnames: tuple[str, ...],
+                 registry: list | None = REGISTRY, **options):
+        self.kind = metric.kind
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._metric = metric
+        self._options = options
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.append(self)
+
+    def labels(self, *values):
+        """The child metric for one combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._metric(self.name, self.description, registry=None, **self._options)
+                    self._children[values] = child
+        return child
+
+    def snapshot(self) -> dict[tuple, object]:
+        """Each label combination's sample."""
+        with self._lock:
+            children = dict(self._children)
+        return {values: child.sample() for values, child in children.items()}
+
+    def collect(self) -> list[tuple[dict, object]]:
+        return [
+            (dict(zip(self.labelnames, values)), sample)
+            for values, sample in sorted(self.snapshot().items())
+        ]
+
+
+class Callback:
+    """A metric whose samples are read when collected: read() -> {label values: value}."""
+
+    def __init__(self, kind: str, name: str, description: str, labelnames: tuple[str, ...],
+                 read: Callable[[], dict[tuple, float]], registry: list | None = REGISTRY):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._read = read
+        if registry is not None:
+            registry.append(self)
+
+    def collect(self) -> list[tuple[dict, float]]:
+        return [
+            (dict(zip(self.labelnames, values)), value)
+            for values, value in sorted(self._read().items())
+        ]
+
+
+def collect() -> list[tuple[str, str, str, list]]:
+    """Every registered metric as (name, kind, description, [(labels, sample)])."""
+    return [
+        (metric.name, metric.kind, metric.description, metric.collect())
+        for metric in REGISTRY
+    ]
+
+
+def _threadpool_state() -> dict[tuple, float]:
+    # The limiter belongs to the running event loop; there is none to read
+    # when collecting from a plain thread
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return {}
+    return {
+        ("running",): limiter.borrowed_tokens,
+        ("waiting",): limiter.statistics().tasks_waiting,
+        ("limit",): limiter.total_tokens,
+    }
+
+
+def _cache_stats(read: Callable[[cache.TTLCache], float]) -> Callable[[], dict[tuple, float]]:
+    return lambda: {(name,): read(c) for name, c in cache.named_caches().items()}
+
+
+# =============================================================================
+# HTTP METRICS
+# =============================================================================
+
+HTTP_REQUESTS = Family(
+    Counter,
+    "http_requests_total",
+    "Requests served, by method, route template and status code",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Family(
+    Histogram,
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response",
+    ("method", "route"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+# =============================================================================
+# EXECUTOR METRICS
+# =============================================================================
+
+THREADPOOL_TASKS = Callback(
+    "gauge",
+    "threadpool_tasks",
+    "Sync routes and dependencies in the worker threadpool: running, waiting for a thread, and the thread limit",
+    ("state",),
+    _threadpool_state
+)
+
+
+# =============================================================================
+# DATABASE METRICS
+# =============================================================================
+
+DB_CONNECTIONS_OPENED = Counter(
+    "db_connections_opened_total",
+    "Database connections opened"
+)
+DB_CONNECTIONS_PER_REQUEST = Histogram(
+    "db_connections_per_request",
+    "Database connections opened while serving one request",
+    buckets=(0, 1, 2, 3, 5)
+)
+DB_QUERY_SECONDS = Family(
+    Histogram,
+    "db_query_seconds",
+    "Time to execute one statement, by the app.database function that ran it (the _count is the query count)",
+    ("function",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Statements executed while serving one request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+
+
+# =============================================================================
+# CACHE METRICS
+# =============================================================================
+
+CACHE_HITS = Callback(
+    "counter",
+    "cache_hits_total",
+    "Lookups answered by an in-process cache",
+    ("cache",),
+    _cache_stats(lambda c: c.hits)
+)
+CACHE_MISSES = Callback(
+    "counter",
+    "cache_misses_total",
+    "Lookups an in-process cache could not answer (missing or expired)",
+    ("cache",),
+    _cache_stats(lambda c: c.misses)
+)
+CACHE_ENTRIES = Callback(
+    "gauge",
+    "cache_entries",
+    "Entries held by an in-process cache",
+    ("cache",),
+    _cache_stats(len)
+)
+
+
+# =============================================================================
+# PASSWORD HASHING METRICS
+# =============================================================================
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hash/verify jobs running or queued"
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying one password",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Time a password job waited for a free hashing worker",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password jobs rejected because the hashing queue was full"
+)
+
+
+# =============================================================================
+# PDF GENERATION METRICS
+# =============================================================================
+
+PDF_STAGE_SECONDS = Family(
+    Histogram,
+    "pdf_stage_seconds",
+    "Time spent in each stage of /generate-pdf (stage=total for the whole request)",
+    ("stage",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+# =============================================================================
+# PHOTO METRICS
+# =============================================================================
+
+PHOTO_DECODES_IN_FLIGHT = Gauge(
+    "photo_decodes_in_flight",
+    "Photo uploads being decoded (limited to PHOTO_DECODE_CONCURRENCY per worker)"
+)
+
+
+# =============================================================================
+# LLM METRICS
+# =============================================================================
+
+LLM_CALL_SECONDS = Family(
+    Histogram,
+    "llm_call_seconds",
+    "Time for one structured LLM call including validation retries, by task and outcome",
+    ("task", "outcome"),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+)
+LLM_TOKENS = Family(
+    Counter,
+    "llm_tokens_total",
+    "Tokens reported by the LLM API, by task and kind (input or output)",
+    ("task", "kind")
+)
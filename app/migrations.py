@@ -0,0 +1,393 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once, in order, and is recorded in schema_migrations.
+Add new schema changes as a new migration at the end; never edit one that
+has shipped. Run `python -m app.migrations` to migrate the configured
+database. QUERY_PLANS lists the queries that must use an index; the tests
+(and `python -m scripts.check_migrations`) verify them on a scratch SQLite
+database.
+"""
+import sqlite3
+from typing import Callable
+
+import turso_serverless
+
+from app import database as db
+
+
+# (version, name, apply(conn)) in the order they run
+MIGRATIONS: list[tuple[int, str, Callable]] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration function."""
+    def register(apply: Callable) -> Callable:
+        if MIGRATIONS and MIGRATIONS[-1][0] >= version:
+            raise ValueError(f"Migration {version} is out of order")
+        MIGRATIONS.append((version, name, apply))
+        return apply
+    return register
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+@migration(1, "initial schema")
+def _initial_schema(conn) -> None:
+    # Owner columns are named as the queries in app.database use them
+    # (user, skill, experience, project)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            phone TEXT,
+            location TEXT,
+            linkedin TEXT,
+            github TEXT,
+            website TEXT,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            skill_name TEXT NOT NULL,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE,
+            UNIQUE(skill_name, user)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skill_bullets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            skill INTEGER NOT NULL,
+            FOREIGN KEY (skill) REFERENCES skills(id) ON DELETE CASCADE,
+            UNIQUE(text, skill)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS experiences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            experience_name TEXT NOT NULL,
+            start_year TEXT,
+            end_year TEXT,
+            ongoing INTEGER DEFAULT 0,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS experience_bullets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            experience INTEGER NOT NULL,
+            FOREIGN KEY (experience) REFERENCES experiences(id) ON DELETE CASCADE,
+            UNIQUE(text, experience)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT NOT NULL,
+            github_link TEXT,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_bullets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            project INTEGER NOT NULL,
+            FOREIGN KEY (project) REFERENCES projects(id) ON DELETE CASCADE,
+            UNIQUE(text, project)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS education (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            education_name TEXT NOT NULL,
+            institution TEXT NOT NULL,
+            start TEXT,
+            end TEXT,
+            grade TEXT,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    # 'user_references' since 'references' is a reserved keyword
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_references (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            referer_name TEXT NOT NULL,
+            referer_institute TEXT NOT NULL,
+            position TEXT,
+            connection_type TEXT,
+            institution_url TEXT,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            user INTEGER NOT NULL,
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE,
+            UNIQUE(text, user)
+        )
+    """)
+    # Only the SHA-256 of each refresh token is stored
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS refresh_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token_hash TEXT NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            expires_at TEXT NOT NULL,
+            revoked_at TEXT,
+            created_at TEXT DEFAULT (datetime('now')),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+
+def _search_row_sql(section: str, code: int, body: str, owner: str, parent: str, r: str) -> str:
+    return (
+        f"{r}.id * 16 + {code}, {body.format(r=r)}, 'u' || {owner.format(r=r)}, "
+        f"'{section}', {r}.id, {parent.format(r=r)}"
+    )
+
+
+@migration(2, "full-text search index")
+def _search_index(conn) -> None:
+    # Databases initialised before migrations existed may already have it
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    ).fetchone()
+    if exists:
+        return
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE search_index USING fts5(
+            body,
+            owner,
+            section UNINDEXED,
+            item_id UNINDEXED,
+            parent_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    columns = "rowid, body, owner, section, item_id, parent_id"
+    for section, code, table, body, owner, parent in db.SEARCH_SOURCES:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index ({columns})
+                VALUES ({_search_row_sql(section, code, body, owner, parent, "new")});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE ON {table} BEGIN
+                UPDATE search_index SET body = {body.format(r="new")}
+                WHERE rowid = old.id * 16 + {code};
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 16 + {code};
+            END
+        """)
+        conn.execute(f"""
+            INSERT INTO search_index ({columns})
+            SELECT {_search_row_sql(section, code, body, owner, parent, table)} FROM {table}
+        """)
+
+
+@migration(3, "owner and parent indexes")
+def _owner_indexes(conn) -> None:
+    # Per-user lists filter on the owner and order by id; the index carries
+    # the rowid, so "WHERE user = ? ORDER BY id DESC" needs no sort
+    for table in ("summaries", "skills", "experiences", "projects", "education", "user_references"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_user ON {table}(user)")
+    # Bullet lookups by parent read only text (and id), so these cover them
+    for table, parent in (
+        ("skill_bullets", "skill"),
+        ("experience_bullets", "experience"),
+        ("project_bullets", "project"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{parent} ON {table}({parent}, text)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens(user_id, expires_at)"
+    )
+
+
+@migration(4, "per-section revisions")
+def _user_revisions(conn) -> None:
+    # Bumped with every write to a section; list endpoints use it as their ETag
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_revisions (
+            user_id INTEGER NOT NULL,
+            section TEXT NOT NULL,
+            revision INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, section)
+        ) WITHOUT ROWID
+    """)
+
+
+@migration(5, "change log")
+def _change_log(conn) -> None:
+    # One row per item written, in the same transaction as the write; ids are
+    # the sync cursors handed to clients by /api/changes. AUTOINCREMENT keeps
+    # ids from being reused after old rows are pruned.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            section TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_log_user ON change_log(user_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_log_created ON change_log(created_at)")
+
+
+@migration(6, "profile photos")
+def _photos(conn) -> None:
+    # Renditions of uploaded photos, keyed by a hash of the upload, so the
+    # same file uploaded again is found without decoding it
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS photos (
+            user INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            rendition TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            created_at TEXT DEFAULT (datetime('now')),
+            PRIMARY KEY (user, id, rendition),
+            FOREIGN KEY (user) REFERENCES users(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+
+
+@migration(7, "bullet indexes in id order")
+def _bullet_order_indexes(conn) -> None:
+    # Bullets are read in id order; (parent, text) returned them by text and
+    # made every lookup sort. (parent, id, text) covers the lookups and the
+    # IN (...) over many parents, already in order.
+    for table, parent in (
+        ("skill_bullets", "skill"),
+        ("experience_bullets", "experience"),
+        ("project_bullets", "project"),
+    ):
+        conn.execute(f"DROP INDEX IF EXISTS idx_{table}_{parent}")
+        conn.execute(f"CREATE INDEX idx_{table}_{parent} ON {table}({parent}, id, text)")
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def schema_version(conn) -> int:
+    """
+    Return the highest applied migration version (0 for a new database).
+    An up-to-date database costs this one query; the bookkeeping table is
+    only created when it is missing.
+    """
+    try:
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+    except (sqlite3.OperationalError, turso_serverless.OperationalError):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        return 0
+
+
+def migrate(conn) -> list[int]:
+    """Apply pending migrations in order and return the versions applied."""
+    current = schema_version(conn)
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        apply(conn)
+        # OR IGNORE: another instance may have finished the same migration first
+        conn.execute(
+            "INSERT OR IGNORE INTO schema_migrations (version, name) VALUES (?, ?)",
+            (version, name)
+        )
+        conn.commit()
+        applied.append(version)
+    return applied
+
+
+def init_database() -> list[int]:
+    """Bring the configured database up to the latest schema."""
+    with db.get_db() as conn:
+        return migrate(conn)
+
+
+# =============================================================================
+# QUERY PLAN CHECKS
+# =============================================================================
+
+def _owner_index(section: str) -> str:
+    return f"idx_{db.SECTION_TABLES[section][0]}_user"
+
+
+def _parent_index(section: str) -> str:
+    _, bullets, parent = db.SECTION_TABLES[section]
+    return f"COVERING INDEX idx_{bullets}_{parent}"
+
+
+# Queries app.database runs, taken from its own constants, and the index
+# each must use
+QUERY_PLANS = (
+    *((db.section_list_sql(section), _owner_index(section)) for section in db.SECTION_TABLES),
+    *((db.section_list_sql(section, search=True), _owner_index(section)) for section in db.SECTION_TABLES),
+    (db.section_list_sql("skills", ("id", "skill_name"), after=True, limit=True), "idx_skills_user"),
+    (db.section_list_sql("skills", ("id", "skill_name"), search=True, after=True, limit=True), "idx_skills_user"),
+    *((sql, "PRIMARY KEY") for sql in db.ITEM_BY_ID_SQL.values()),
+    (db.SKILL_BY_NAME_SQL, "sqlite_autoindex_skills_1"),
+    *((sql, _parent_index(section)) for section, sql in db.BULLETS_SQL.items()),
+    *((sql, _parent_index(section)) for section, sql in db.BULLETS_LIKE_SQL.items()),
+    *((sql.format(ids="?, ?, ?"), _parent_index(section)) for section, sql in db.BULLETS_OF_PARENTS_SQL.items()),
+    *((sql, _parent_index(section)) for section, sql in db.SUGGESTION_BULLETS_SQL.items()),
+    (db.REFRESH_TOKEN_SQL, "sqlite_autoindex_refresh_tokens_1"),
+    (db.REVOKE_USER_REFRESH_TOKENS_SQL, "idx_refresh_tokens_user"),
+    (db.PURGE_USER_REFRESH_TOKENS_SQL, "idx_refresh_tokens_user"),
+    (db.USER_BY_EMAIL_SQL, "sqlite_autoindex_users_1"),
+    (db.REVISION_SQL, "PRIMARY KEY"),
+    (db.REVISIONS_SQL, "PRIMARY KEY"),
+    (db.CHANGES_SQL, "idx_change_log_user"),
+    (db.PRUNE_CHANGE_LOG_SQL, "idx_change_log_created"),
+    (db.PHOTO_SQL, "PRIMARY KEY"),
+    (db.PHOTO_RENDITIONS_SQL, "PRIMARY KEY"),
+)
+
+
+def check_query_plans(conn) -> list[str]:
+    """Run EXPLAIN QUERY PLAN over QUERY_PLANS and describe every query that misses its index."""
+    problems = []
+    for query, expected in QUERY_PLANS:
+        params = (None,) * query.count("?")
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()]
+        if not any(expected in detail for detail in plan) or any("TEMP B-TREE" in detail for detail in plan):
+            problems.append(f"{' '.join(query.split())}\n    expected {expected}, got: {'; '.join(plan)}")
+    return problems
+
+
+if __name__ == "__main__":
+    print(f"applied migrations: {init_database() or 'none'}")
@@ -1,5 +1,5 @@
 """Pydantic models for request/response validation."""
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -128,7 +128,7 @@ class ResumeData(BaseModel):
     name: str
     contact: Contact
     summary: Optional[str] = None
-    image_base64: Optional[str] = None
+    photo_id: Optional[str] = None  # from POST /api/photos
     skills: List[Skill]
     experience: List[Experience]
     projects: List[Project]
@@ -137,6 +137,22 @@ class ResumeData(BaseModel):
     job_description: Optional[str] = None
 
 
+# =============================================================================
+# BATCH MODELS
+# =============================================================================
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    section: Literal["summaries", "skills", "experiences", "projects", "educations", "references"]
+    id: Optional[int] = None
+    # Validated against the section's model by the batch route
+    data: Optional[dict] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(min_length=1, max_length=100)
+
+
 # =============================================================================
 # ATS MODELS
 # =============================================================================
@@ -0,0 +1,130 @@
+"""
+Profile photo renditions.
+
+An upload is decoded once, downsized to each rendition and stored by a hash
+of the uploaded bytes (see db.save_photo). Resume data refers to the photo
+by that id and templates load it from photo_url(); server-side rendering
+resolves the URL to the stored bytes, so nothing is decoded per render.
+
+Decoding is bounded: the pixel count is checked from the header, JPEGs
+decode at a reduced scale close to the largest rendition, and the routes
+limit how many decodes run at once.
+"""
+import base64
+import hashlib
+import io
+import time
+import warnings
+
+from app.config import settings
+
+
+# Print size of the photo in html_templates (.profile-image img: 3.5cm wide) at 300 dpi
+PRINT_WIDTH_PX = round(3.5 / 2.54 * 300)
+
+# Rendition name -> maximum width in pixels; heights keep the aspect ratio
+# up to twice the width
+RENDITIONS = {
+    "print": PRINT_WIDTH_PX,
+    "thumb": 96,
+}
+
+ACCEPTED_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+JPEG_QUALITY = 85
+
+
+def content_id(data: bytes) -> str:
+    """Id of an upload: a hash of its bytes, so re-uploads map to the stored photo."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def photo_url(photo_id: str, rendition: str = "print") -> str:
+    """URL of a stored rendition (GET /api/photos/{id}/{rendition})."""
+    return f"/api/photos/{photo_id}/{rendition}"
+
+
+def data_uri(media_type: str, data: bytes) -> str:
+    return f"data:{media_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def _fit(image, max_width: int):
+    """image scaled down to max_width by at most twice that height (never up)."""
+    from PIL import Image
+
+    scale = min(1.0, max_width / image.width, max_width * 2 / image.height)
+    if scale == 1.0:
+        return image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    # reducing_gap box-averages large downscales before the LANCZOS pass
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def make_renditions(data: bytes, stages: dict[str, float] = None) -> dict[str, tuple[str, int, int, bytes]]:
+    """
+    Decode an uploaded image and encode every rendition:
+    {name: (media_type, width, height, bytes)}. Images with transparency
+    become PNG, the rest JPEG. Raises ValueError when the upload is not an
+    image in ACCEPTED_FORMATS or has more than PHOTO_MAX_PIXELS pixels.
+    stages, if given, receives the milliseconds spent in each step.
+    """
+    # Imported here: Pillow is only needed by uploads
+    from PIL import Image, ImageOps
+
+    stages = {} if stages is None else stages
+    started = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal started
+        now = time.perf_counter()
+        stages[stage] = (now - started) * 1000
+        started = now
+
+    too_large = f"Photos are limited to {settings.PHOTO_MAX_PIXELS / 1_000_000:g} megapixels."
+
+    # Opening reads only the header, so the size is checked before any
+    # pixel is decoded (Pillow's own bomb warning is redundant with that)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(io.BytesIO(data), formats=ACCEPTED_FORMATS)
+    except Image.DecompressionBombError as e:
+        raise ValueError(too_large) from e
+    except Exception as e:
+        raise ValueError("The file is not a readable image in a supported format.") from e
+    width, height = image.size
+    if width * height > settings.PHOTO_MAX_PIXELS:
+        raise ValueError(f"The image is {width}x{height}. {too_large}")
+    lap("open")
+
+    # JPEG decodes at 1/2, 1/4 or 1/8 scale when that still covers the
+    # largest rendition (in either orientation, as EXIF may rotate it)
+    largest = max(RENDITIONS.values())
+    image.draft(None, (largest, largest))
+    try:
+        image.load()
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    except Exception as e:
+        raise ValueError("The image data is corrupt.") from e
+    lap("decode")
+
+    # Largest first, each rendition resized from the previous one
+    resized = {}
+    for name, max_width in sorted(RENDITIONS.items(), key=lambda item: -item[1]):
+        image = _fit(image, max_width)
+        resized[name] = image
+    lap("resize")
+
+    media_type, encode_format = ("image/png", "PNG") if has_alpha else ("image/jpeg", "JPEG")
+
+    renditions = {}
+    for name, rendition in resized.items():
+        buffer = io.BytesIO()
+        if encode_format == "JPEG":
+            rendition.save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        else:
+            rendition.save(buffer, format="PNG", optimize=True)
+        renditions[name] = (media_type, rendition.width, rendition.height, buffer.getvalue())
+    lap("encode")
+    return renditions
@@ -0,0 +1,236 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware profiles requests to PROFILE_ROUTES that carry
+X-Profile-Token: <PROFILE_TOKEN>, and a PROFILE_SAMPLE_RATE fraction of
+the rest. While such a request runs, a sampler thread records the stack of
+every thread in the worker every SAMPLE_INTERVAL, so the event loop and the
+threadpool threads that render PDFs both show up. The result is stored in
+PROFILE_DIR as a speedscope file (open it at https://www.speedscope.app),
+listed and downloaded through /api/profiles; the profiled response names
+it in X-Profile-Id.
+
+Other requests served by the worker at the same time appear in the same
+profile, and a worker profiles one request at a time. The middleware is
+only installed when PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set, so it
+costs nothing otherwise.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+
+
+SAMPLE_INTERVAL = 0.005
+
+PROFILE_SUFFIX = ".speedscope.json"
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[a-z0-9-]+-[0-9a-f]{6}$")
+
+logger = logging.getLogger(__name__)
+
+# One profile per worker at a time: the sampler already sees every thread
+_profiling = threading.Lock()
+
+
+class Sampler:
+    """
+    Samples the stack of every thread from a background thread until
+    stop(). Consecutive identical samples of a thread are merged into one
+    weighted sample, so threads that wait (idle workers, an event loop
+    awaiting the LLM) stay small however long the request takes.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        # (name, file, first line) of each function seen, indexed by code object
+        self.frames: list[tuple[str, str, int]] = []
+        self._frame_ids: dict = {}
+        # Distinct stacks (frame ids, outermost first), indexed by the stack
+        self.stacks: list[tuple[int, ...]] = []
+        self._stack_ids: dict[tuple[int, ...], int] = {}
+        # Thread id -> [[stack id, seconds], ...]
+        self.runs: dict[int, list[list]] = {}
+        self.thread_names: dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self.started = self.stopped = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+        self.thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+    def _stack_id(self, frame) -> int:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            frame_id = self._frame_ids.get(code)
+            if frame_id is None:
+                frame_id = self._frame_ids[code] = len(self.frames)
+                self.frames.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            stack.append(frame_id)
+            frame = frame.f_back
+        stack = tuple(reversed(stack))
+        stack_id = self._stack_ids.get(stack)
+        if stack_id is None:
+            stack_id = self._stack_ids[stack] = len(self.stacks)
+            self.stacks.append(stack)
+        return stack_id
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        last = self.started
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack_id = self._stack_id(frame)
+                runs = self.runs.setdefault(thread_id, [])
+                if runs and runs[-1][0] == stack_id:
+                    runs[-1][1] += elapsed
+                else:
+                    runs.append([stack_id, elapsed])
+
+    def speedscope(self, name: str, main_thread: int) -> dict:
+        """
+        The samples in speedscope's file format, one profile per thread that
+        did something: main_thread first, then threads whose stack changed.
+        """
+        threads = [main_thread] + [
+            thread_id for thread_id, runs in self.runs.items()
+            if thread_id != main_thread and len(runs) > 1
+        ]
+        profiles = []
+        for thread_id in threads:
+            runs = self.runs.get(thread_id, [])
+            weights = [round(seconds * 1000, 3) for _, seconds in runs]
+            profiles.append({
+                "type": "sampled",
+                "name": self.thread_names.get(thread_id, str(thread_id)),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": [list(self.stacks[stack_id]) for stack_id, _ in runs],
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.profiling",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [
+                {"name": function, "file": file, "line": line}
+                for function, file, line in self.frames
+            ]},
+            "profiles": profiles,
+        }
+
+
+def profile_path(profile_id: str) -> str | None:
+    """Path of a stored profile, or None if profile_id is not a valid id."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    return os.path.join(settings.PROFILE_DIR, profile_id + PROFILE_SUFFIX)
+
+
+def new_profile_id(path: str) -> str:
+    """Sortable id for a profile of a request to path: time, route and a random suffix."""
+    route = re.sub(r"[^a-z0-9]+", "-", path.lower()).strip("-") or "root"
+    return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{route}-{secrets.token_hex(3)}"
+
+
+def save_profile(profile_id: str, profile: dict) -> None:
+    """Store a profile, then drop the oldest beyond PROFILE_KEEP."""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = profile_path(profile_id)
+    with open(path + ".tmp", "w") as f:
+        json.dump(profile, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+    stored = sorted(name for name in os.listdir(settings.PROFILE_DIR) if name.endswith(PROFILE_SUFFIX))
+    for name in stored[:-settings.PROFILE_KEEP]:
+        try:
+            os.remove(os.path.join(settings.PROFILE_DIR, name))
+        except OSError:
+            pass
+
+
+def list_profiles() -> list[dict]:
+    """Stored profiles, newest first."""
+    try:
+        entries = [entry for entry in os.scandir(settings.PROFILE_DIR) if entry.name.endswith(PROFILE_SUFFIX)]
+    except FileNotFoundError:
+        return []
+    return [
+        {"id": entry.name[:-len(PROFILE_SUFFIX)], "bytes": entry.stat().st_size}
+        for entry in sorted(entries, key=lambda entry: entry.name, reverse=True)
+    ]
+
+
+def _requested(scope) -> bool:
+    """Whether to profile this request: a valid X-Profile-Token, or the sample rate."""
+    token = Headers(scope=scope).get("x-profile-token")
+    if token and settings.PROFILE_TOKEN and secrets.compare_digest(token, settings.PROFILE_TOKEN):
+        return True
+    return random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling selected requests to PROFILE_ROUTES (see module docstring)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.routes = frozenset(settings.PROFILE_ROUTES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.routes or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _profiling.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id(scope["path"])
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        sampler = Sampler()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            try:
+                # Joining the sampler thread can wait up to one interval; not on the event loop
+                await asyncio.to_thread(sampler.stop)
+            finally:
+                _profiling.release()
+            elapsed_ms = (sampler.stopped - sampler.started) * 1000
+            name = f"{scope['method']} {scope['path']} -> {status} in {elapsed_ms:.0f} ms"
+            try:
+                profile = sampler.speedscope(name, threading.get_ident())
+                await asyncio.to_thread(save_profile, profile_id, profile)
+                logger.info(f"Profiled {name}: {profile_id}")
+            except OSError as e:
+                logger.warning(f"Could not store profile {profile_id}: {e}")
@@ -0,0 +1,200 @@
+"""
+Prometheus text exposition (format 0.0.4) of the app.metrics registry.
+
+A single worker serves its own collectors. Under uvicorn --workers N each
+worker only counts what it served, so with METRICS_DIR set every worker
+also writes its samples to a file there (every METRICS_FLUSH_SECONDS, and
+before it answers a scrape) and the worker answering /metrics adds up the
+files of the workers that are still running. A worker removes its file when
+it shuts down, and files left by workers that died are removed when they
+are next read, so METRICS_DIR holds one file per live worker.
+
+Other workers' numbers can therefore lag by up to METRICS_FLUSH_SECONDS, and
+counters drop when a worker exits; rate() and increase() treat that as a
+counter reset.
+Ratios are left to the query, e.g. the hit ratio of each cache:
+
+    sum by (cache) (rate(cache_hits_total[5m]))
+      / sum by (cache) (rate(cache_hits_total[5m]) + rate(cache_misses_total[5m]))
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+
+from app.config import settings
+from app import metrics
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+# Start time of each process that wrote a snapshot, so a reused pid does
+# not overwrite the file of a worker that has exited
+_process_started: dict[int, int] = {}
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _plain(sample):
+    """A sample as JSON: histogram bucket bounds become strings ("+Inf")."""
+    if isinstance(sample, dict):
+        return {
+            "buckets": [[repr(float(bound)) if bound != math.inf else "+Inf", count]
+                        for bound, count in sample["buckets"]],
+            "sum": sample["sum"],
+            "count": sample["count"],
+        }
+    return sample
+
+
+def snapshot() -> list:
+    """
+    This worker's metrics as [name, kind, description, [[labels, sample]]].
+    Call it from the event loop: the threadpool gauges read its limiter.
+    """
+    return [
+        [name, kind, description, [[labels, _plain(sample)] for labels, sample in samples]]
+        for name, kind, description, samples in metrics.collect()
+    ]
+
+
+def _snapshot_path() -> str:
+    pid = os.getpid()
+    started = _process_started.setdefault(pid, time.time_ns())
+    return os.path.join(settings.METRICS_DIR, f"{pid}-{started}.json")
+
+
+def write_snapshot(families: list) -> None:
+    """Replace this worker's file in METRICS_DIR with the given snapshot."""
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = _snapshot_path()
+    with open(path + ".tmp", "w") as f:
+        json.dump(families, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+def remove_snapshot() -> None:
+    """Remove this worker's file from METRICS_DIR (at shutdown)."""
+    try:
+        os.remove(_snapshot_path())
+    except FileNotFoundError:
+        pass
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots() -> list[tuple[str, list]]:
+    """
+    The snapshots of the running workers in METRICS_DIR as (path, families);
+    files of workers that are gone are removed.
+    """
+    snapshots = []
+    for entry in os.scandir(settings.METRICS_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            pid = int(entry.name.split("-", 1)[0])
+            if not _alive(pid):
+                os.remove(entry.path)
+                continue
+            with open(entry.path) as f:
+                snapshots.append((entry.path, json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def merge(snapshots: list[list]) -> dict[str, tuple]:
+    """
+    Combine snapshots (lists of families) into
+    {name: (kind, description, {label items: value})}, in first-seen order.
+    """
+    merged = {}
+    for families in snapshots:
+        for name, kind, description, samples in families:
+            _, _, combined = merged.setdefault(name, (kind, description, {}))
+            for labels, sample in samples:
+                key = tuple(labels.items())
+                if kind == "histogram":
+                    total = combined.setdefault(key, {"buckets": {}, "sum": 0.0, "count": 0})
+                    for bound, count in sample["buckets"]:
+                        total["buckets"][bound] = total["buckets"].get(bound, 0) + count
+                    total["sum"] += sample["sum"]
+                    total["count"] += sample["count"]
+                else:
+                    combined[key] = combined.get(key, 0) + sample
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(items: tuple) -> str:
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in items) + "}"
+
+
+def render(merged: dict[str, tuple]) -> str:
+    """Prometheus text format for merged samples."""
+    lines = []
+    for name, (kind, description, samples) in merged.items():
+        lines.append(f"# HELP {name} {_escape_help(description)}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in samples.items():
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(key)} {_number(value)}")
+                continue
+            for bound, count in sorted(value["buckets"].items(), key=lambda item: float(item[0])):
+                lines.append(f"{name}_bucket{_labels(key + (('le', bound),))} {_number(count)}")
+            lines.append(f"{name}_sum{_labels(key)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(key)} {_number(value['count'])}")
+    return "\n".join(lines) + "\n"
+
+
+def _render_all(own: list) -> str:
+    write_snapshot(own)
+    own_path = _snapshot_path()
+    others = [families for path, families in _read_snapshots() if path != own_path]
+    return render(merge([own, *others]))
+
+
+async def exposition() -> str:
+    """The /metrics body: this worker's metrics, merged with the other workers' when METRICS_DIR is set."""
+    own = snapshot()
+    if not settings.METRICS_DIR:
+        return render(merge([own]))
+    return await asyncio.to_thread(_render_all, own)
+
+
+async def flush_periodically() -> None:
+    """Write this worker's snapshot every METRICS_FLUSH_SECONDS; run as a task when METRICS_DIR is set."""
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(write_snapshot, snapshot())
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
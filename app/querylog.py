@@ -0,0 +1,184 @@
+"""
+Per-request log of the statements sent to the database.
+
+The request connection (database.LazyConnection) records every statement
+it executes as a Query: the normalized SQL (literals and ? lists
+collapsed, so one statement run with different values has one shape),
+the app.database function that ran it, its duration and the rows it read
+or changed. When the request ends, a shape repeated more than
+DB_REPEATED_QUERY_WARN times is logged as a likely N+1.
+
+Tests and benchmarks can bound the statements an endpoint sends:
+
+    with querylog.assert_max_queries(3):
+        client.get("/api/bootstrap")
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+from app.config import settings
+from app import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROWS = re.compile(r"\((?:\?|\?\.\.\.)\)(?:\s*,\s*\((?:\?|\?\.\.\.)\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(query: str) -> str:
+    """
+    The shape of a statement: whitespace collapsed, literals replaced by ?,
+    ? lists by ?... and repeated VALUES rows by one row and "...".
+    """
+    shape = _SPACE.sub(" ", query).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDERS.sub("?...", shape)
+    return _ROWS.sub(lambda match: match.group(0).split(",")[0].rstrip() + ", ...", shape)
+
+
+class Query:
+    """One executed statement."""
+
+    __slots__ = ("sql", "function", "seconds", "rows")
+
+    def __init__(self, sql: str, function: str, seconds: float):
+        self.sql = sql
+        self.function = function
+        self.seconds = seconds
+        self.rows = 0
+
+    def __repr__(self) -> str:
+        return f"Query({self.function}: {self.sql!r}, {self.seconds * 1000:.1f} ms, {self.rows} rows)"
+
+
+class QueryLog:
+    """The statements one connection executed, in order."""
+
+    def __init__(self):
+        self.queries: list[Query] = []
+
+    def record(self, query: str, function: str, seconds: float) -> Query:
+        recorded = Query(normalize(query), function, seconds)
+        self.queries.append(recorded)
+        return recorded
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def total_seconds(self) -> float:
+        return sum(query.seconds for query in self.queries)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int, str]]:
+        """Shapes run more than threshold times, as (sql, count, functions), most repeated first."""
+        counts = Counter(query.sql for query in self.queries)
+        repeated = []
+        for sql, count in counts.most_common():
+            if count <= threshold:
+                break
+            functions = dict.fromkeys(query.function for query in self.queries if query.sql == sql)
+            repeated.append((sql, count, ", ".join(functions)))
+        return repeated
+
+
+class RecordedCursor:
+    """Cursor proxy counting the rows a statement changed or that were read from it."""
+
+    __slots__ = ("_cursor", "_query")
+
+    def __init__(self, cursor, query: Query):
+        self._cursor = cursor
+        self._query = query
+        # Writes report the rows they changed; reads report -1
+        if cursor.rowcount > 0:
+            query.rows = cursor.rowcount
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._query.rows += 1
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list:
+        rows = self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+        self._query.rows += len(rows)
+        return rows
+
+    def fetchall(self) -> list:
+        rows = self._cursor.fetchall()
+        self._query.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._query.rows += 1
+            yield row
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+class Capture:
+    """Statements of every request that ended while capture_queries() was active."""
+
+    def __init__(self):
+        self.queries: list[Query] = []
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def report(self) -> str:
+        return "\n".join(
+            f"  {query.function}: {query.sql} ({query.seconds * 1000:.1f} ms, {query.rows} rows)"
+            for query in self.queries
+        )
+
+
+_captures: list[Capture] = []
+_captures_lock = threading.Lock()
+
+
+def finish(log: QueryLog, request: str) -> None:
+    """
+    Close out one request's log: observe its query count, warn about
+    repeated shapes and hand the statements to active captures.
+    """
+    metrics.DB_QUERIES_PER_REQUEST.observe(len(log))
+    for sql, count, functions in log.repeated(settings.DB_REPEATED_QUERY_WARN):
+        logger.warning(f"{request} ran one statement {count} times (possible N+1, from {functions}): {sql}")
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.queries.extend(log.queries)
+
+
+@contextmanager
+def capture_queries() -> Iterator[Capture]:
+    """Collect the statements of requests that end inside the block (for tests and benchmarks)."""
+    capture = Capture()
+    with _captures_lock:
+        _captures.append(capture)
+    try:
+        yield capture
+    finally:
+        with _captures_lock:
+            _captures.remove(capture)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[Capture]:
+    """Raise AssertionError, listing the statements, if requests in the block run more than limit."""
+    with capture_queries() as capture:
+        yield capture
+    if len(capture) > limit:
+        raise AssertionError(f"{len(capture)} queries, expected at most {limit}:\n{capture.report()}")
@@ -0,0 +1,54 @@
+"""Request count and latency metrics, labeled by route template."""
+import time
+
+from app import metrics
+
+
+# Any other method is counted as "other", so clients cannot add label values
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def route_label(scope) -> str:
+    """
+    The path template of the route that handled a request (/api/skills/{item_id}),
+    the mount path for mounted apps (/static), or "unmatched".
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "app_root_path" in scope:
+        return scope["root_path"][len(scope["app_root_path"]):]
+    return "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording http_requests_total and
+    http_request_duration_seconds. Add it last so it sits outermost and the
+    duration covers the other middleware (compression) too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method = scope["method"] if scope["method"] in METHODS else "other"
+            route = route_label(scope)
+            metrics.HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            metrics.HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
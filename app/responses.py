@@ -0,0 +1,52 @@
+"""Fast JSON responses with orjson (compact stdlib json if it is missing)."""
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is a requirement; keep serving if it fails to install
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Database records are mappings, not dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize JSON-native content (and database records) to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Response = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Serialize content straight to a response, skipping FastAPI's
+    jsonable_encoder pass over every value. content must already be
+    JSON-native, as database rows are. Headers set on the route's injected
+    response (ETag, Link) are carried over: FastAPI only merges them into
+    responses it builds itself.
+    """
+    headers = None
+    if response is not None:
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in ("content-length", "content-type")
+        }
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -1,73 +1,112 @@
-"""Authentication routes: register, login, logout."""
-from datetime import timedelta
-
-from fastapi import APIRouter, HTTPException, status
+"""Authentication routes: register, login, refresh, logout."""
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse, RedirectResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.config import settings
 from app.models import UserCreate, UserLogin
-from app.auth import get_password_hash, create_access_token, authenticate_user
+from app.auth import (
+    get_password_hash, create_user_access_token, set_access_token_cookie, authenticate_user,
+    issue_refresh_token, rotate_refresh_token, revoke_refresh_token, set_refresh_token_cookie
+)
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["auth"])
 
 
+# Register and login are async so that no threadpool thread waits while
+# bcrypt runs on the hashing executor; their database calls still go
+# through the threadpool.
+
 @router.post("/register")
-def register_user(user_data: UserCreate):
+async def register_user(
+    user_data: UserCreate,
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
     """Register a new user."""
-    with db.get_db() as conn:
-        existing = db.get_user_by_email(conn, user_data.email)
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-
-        hashed_password = get_password_hash(user_data.password)
-        db.create_user(
-            conn,
-            name=user_data.name,
-            email=user_data.email,
-            password_hash=hashed_password,
-            phone=user_data.phone,
-            location=user_data.location,
-            linkedin=user_data.linkedin,
-            github=user_data.github,
-            website=user_data.website
-        )
+    existing = await run_in_threadpool(db.get_user_by_email, conn, user_data.email)
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed_password = await get_password_hash(user_data.password)
+    await run_in_threadpool(
+        db.create_user,
+        conn,
+        name=user_data.name,
+        email=user_data.email,
+        password_hash=hashed_password,
+        phone=user_data.phone,
+        location=user_data.location,
+        linkedin=user_data.linkedin,
+        github=user_data.github,
+        website=user_data.website
+    )
 
     return {"message": "User registered successfully"}
 
 
 @router.post("/login")
-def login(user_data: UserLogin):
+async def login(
+    user_data: UserLogin,
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
     """Login and get access token."""
-    user = authenticate_user(user_data.email, user_data.password)
+    user = await authenticate_user(conn, user_data.email, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user["email"], "user_id": user["id"]},
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_access_token(user)
+    refresh_token = await run_in_threadpool(issue_refresh_token, conn, user["id"])
 
     response = JSONResponse({"access_token": access_token, "token_type": "bearer"})
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        samesite="lax",
-        secure=False  # Set to True in production with HTTPS
-    )
+    set_access_token_cookie(response, access_token)
+    set_refresh_token_cookie(response, refresh_token)
+    return response
+
+
+@router.post("/refresh")
+def refresh(
+    request: Request,
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Exchange the refresh token cookie for a new access token (rotating the refresh token)."""
+    token = request.cookies.get("refresh_token")
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing refresh token"
+        )
+
+    user_id, refresh_token = rotate_refresh_token(conn, token)
+    user = db.get_cached_user_by_id(conn, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+
+    access_token = create_user_access_token(user)
+
+    response = JSONResponse({"access_token": access_token, "token_type": "bearer"})
+    set_access_token_cookie(response, access_token)
+    set_refresh_token_cookie(response, refresh_token)
     return response
 
 
 @router.get("/logout")
-def logout():
-    """Logout and clear access token."""
+def logout(
+    request: Request,
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Logout, revoking the refresh token and clearing both cookies."""
+    token = request.cookies.get("refresh_token")
+    if token:
+        revoke_refresh_token(conn, token)
+
     response = RedirectResponse(url="/login")
     response.delete_cookie(key="access_token")
+    response.delete_cookie(key="refresh_token", path="/api")
     return response
@@ -0,0 +1,209 @@
+"""Batch mutation route: many creates, updates and deletes in one transaction."""
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ValidationError
+
+from app.models import (
+    BatchOperation, BatchRequest, SummaryModel, Skill, Experience, Project, Education, Reference
+)
+from app.auth import get_current_user
+from app import database as db
+from app import listing
+from app.responses import json_response
+from app.routes.bootstrap import SECTION_FIELDS
+
+
+router = APIRouter(prefix="/api", tags=["batch"])
+
+
+# Section -> (request model, name used in error messages)
+SECTION_MODELS = {
+    "summaries": (SummaryModel, "Summary"),
+    "skills": (Skill, "Skill"),
+    "experiences": (Experience, "Experience"),
+    "projects": (Project, "Project"),
+    "educations": (Education, "Education"),
+    "references": (Reference, "Reference"),
+}
+
+
+def _find_existing(conn, section: str, data, user_id: int):
+    """The same duplicate lookups the single-item create routes make."""
+    if section == "summaries":
+        return db.get_summary_by_text(conn, data.text, user_id)
+    if section == "skills":
+        return db.get_skill_by_name(conn, data.skill_name, user_id)
+    if section == "experiences":
+        return db.get_experience_by_details(
+            conn, data.experience_name, data.start_year, data.end_year, user_id
+        )
+    if section == "projects":
+        return db.get_project_by_details(conn, data.project_name, data.github_link, user_id)
+    if section == "educations":
+        return db.get_education_by_details(
+            conn, data.education_name, data.institution, data.start, data.end, data.grade, user_id
+        )
+    return db.get_reference_by_details(
+        conn, data.referer_name, data.referer_institute, data.position,
+        data.connection_type, data.institution_url, user_id
+    )
+
+
+def _create(conn, section: str, data, user_id: int) -> int:
+    if section == "summaries":
+        return db.create_summary(conn, data.text, user_id)
+    if section == "skills":
+        return db.create_skill(conn, data.skill_name, user_id, data.bullet_points)
+    if section == "experiences":
+        return db.create_experience(
+            conn, data.experience_name, user_id, data.start_year, data.end_year, data.bullet_points
+        )
+    if section == "projects":
+        return db.create_project(conn, data.project_name, user_id, data.github_link, data.bullet_points)
+    if section == "educations":
+        return db.create_education(
+            conn, data.education_name, data.institution, user_id, data.start, data.end, data.grade
+        )
+    return db.create_reference(
+        conn, data.referer_name, data.referer_institute, user_id,
+        data.position, data.connection_type, data.institution_url
+    )
+
+
+def _update(conn, section: str, item_id: int, data, user_id: int) -> None:
+    if section == "summaries":
+        db.update_summary(conn, item_id, user_id, data.text)
+    elif section == "skills":
+        db.update_skill(conn, item_id, user_id, data.skill_name, data.bullet_points)
+    elif section == "experiences":
+        db.update_experience(
+            conn, item_id, user_id, data.experience_name,
+            data.start_year, data.end_year, data.bullet_points
+        )
+    elif section == "projects":
+        db.update_project(conn, item_id, user_id, data.project_name, data.github_link, data.bullet_points)
+    elif section == "educations":
+        db.update_education(
+            conn, item_id, user_id, data.education_name, data.institution,
+            data.start, data.end, data.grade
+        )
+    else:
+        db.update_reference(
+            conn, item_id, user_id, data.referer_name, data.referer_institute,
+            data.position, data.connection_type, data.institution_url
+        )
+
+
+def _validate(index: int, operation: BatchOperation) -> BaseModel | None:
+    """Check an operation's shape and parse its data with the section's model."""
+    if operation.op == "create" and operation.id is not None:
+        raise HTTPException(status_code=400, detail=f"Operation {index}: create takes no id")
+    if operation.op != "create" and operation.id is None:
+        raise HTTPException(status_code=400, detail=f"Operation {index}: {operation.op} needs an id")
+    if operation.op == "delete":
+        return None
+
+    model = SECTION_MODELS[operation.section][0]
+    try:
+        return model.model_validate(operation.data or {})
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+        raise HTTPException(status_code=422, detail=f"Operation {index}: {errors}")
+
+
+@router.post("/batch")
+def run_batch(
+    batch: BatchRequest,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    Apply a list of create, update and delete operations across sections as
+    one transaction: either every operation is applied or none is, and the
+    error names the operation that failed. Results come back in request
+    order, each with the item's current row (null for deletes).
+    """
+    user_id = user["id"]
+    parsed = [_validate(index, operation) for index, operation in enumerate(batch.operations)]
+
+    # One ownership check per section for every id the batch touches
+    targets: dict[str, dict[int, int]] = {}
+    for index, operation in enumerate(batch.operations):
+        if operation.id is None:
+            continue
+        seen = targets.setdefault(operation.section, {})
+        if operation.id in seen:
+            raise HTTPException(
+                status_code=400,
+                detail=(f"Operation {index}: {operation.section} {operation.id} "
+                        f"is already changed by operation {seen[operation.id]}")
+            )
+        seen[operation.id] = index
+    for section, ids in targets.items():
+        missing = set(ids) - db.get_existing_ids(conn, user_id, section, ids)
+        if missing:
+            index = min(ids[item_id] for item_id in missing)
+            raise HTTPException(
+                status_code=404,
+                detail=f"Operation {index}: {SECTION_MODELS[section][1]} not found"
+            )
+
+    deletes: dict[str, list[int]] = {}
+    for operation in batch.operations:
+        if operation.op == "delete":
+            deletes.setdefault(operation.section, []).append(operation.id)
+
+    item_ids: list[int] = []
+    with conn.transaction():
+        # Ids are distinct per section, so deletes can go first, one
+        # statement per section, freeing names for creates in the same batch
+        for section, ids in deletes.items():
+            db.delete_items(conn, user_id, section, ids)
+        for index, (operation, data) in enumerate(zip(batch.operations, parsed)):
+            section = operation.section
+            name = SECTION_MODELS[section][1]
+            if operation.op == "delete":
+                item_ids.append(operation.id)
+                continue
+            try:
+                if operation.op == "create":
+                    if _find_existing(conn, section, data, user_id):
+                        raise HTTPException(
+                            status_code=409,
+                            detail=f"Operation {index}: {name} already exists."
+                        )
+                    item_ids.append(_create(conn, section, data, user_id))
+                else:
+                    _update(conn, section, operation.id, data, user_id)
+                    item_ids.append(operation.id)
+            except conn.IntegrityError:
+                # e.g. renaming a skill to another skill's name
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Operation {index}: {name} conflicts with an existing one."
+                )
+
+    written: dict[str, list[int]] = {}
+    for operation, item_id in zip(batch.operations, item_ids):
+        if operation.op != "delete":
+            written.setdefault(operation.section, []).append(item_id)
+    items = {
+        (section, item["id"]): item
+        for section, ids in written.items()
+        for item in db.get_section_items(
+            conn, user_id, section, ids, columns=listing.columns(SECTION_FIELDS[section])
+        )
+    }
+
+    return json_response({
+        "results": [
+            {
+                "op": operation.op,
+                "section": operation.section,
+                "id": item_id,
+                "item": items.get((operation.section, item_id)),
+            }
+            for operation, item_id in zip(batch.operations, item_ids)
+        ]
+    })
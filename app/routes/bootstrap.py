@@ -0,0 +1,66 @@
+"""Bootstrap route: everything the generate page needs on load, in one response."""
+import zlib
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.auth import get_current_user
+from app.config import settings
+from app.conditional import REVISION_CACHE_CONTROL, if_none_match, revision_etag
+from app import database as db
+from app.routes import educations, experiences, projects, references, skills, summaries
+from app.responses import json_response
+from app.routes.pdf import list_template_files
+
+
+router = APIRouter(prefix="/api", tags=["bootstrap"])
+
+
+# Same fields as /api/user-profile
+PROFILE_FIELDS = ("name", "email", "phone", "location", "linkedin", "github", "website")
+
+# Sections with the fields their list endpoints return; the change feed and
+# batch results send items with the same fields
+SECTION_FIELDS = {
+    "summaries": summaries.SUMMARY_FIELDS,
+    "skills": skills.SKILL_FIELDS,
+    "experiences": experiences.EXPERIENCE_FIELDS,
+    "projects": projects.PROJECT_FIELDS,
+    "educations": educations.EDUCATION_FIELDS,
+    "references": references.REFERENCE_FIELDS,
+}
+
+
+@router.get("/bootstrap")
+def get_bootstrap(
+    request: Request,
+    response: Response,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    The current user's profile, every section, the template list and feature
+    flags. The ETag combines every section revision with the templates and
+    flags, so a revalidation with nothing changed costs one query; otherwise
+    the data is read in one more statement.
+    """
+    templates = sorted(list_template_files())
+    features = {"llm": settings.has_llm_config}
+    # Revisions are read before the data: a write in between makes the ETag
+    # older than the body, which only costs a refetch next time
+    revisions = db.get_revisions(conn, user["id"])
+    static = zlib.crc32(repr((templates, features)).encode())
+    etag = revision_etag(
+        user["id"], "bootstrap", *(revisions[section] for section in db.REVISION_SECTIONS), f"{static:x}"
+    )
+    headers = {"ETag": etag, "Cache-Control": REVISION_CACHE_CONTROL}
+    if if_none_match(request, {etag}):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    bundle = db.get_profile_bundle(conn, user["id"], PROFILE_FIELDS, SECTION_FIELDS)
+    return json_response({
+        "profile": bundle.pop("profile"),
+        "sections": bundle,
+        "templates": templates,
+        "features": features,
+    }, response)
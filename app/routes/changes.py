@@ -0,0 +1,95 @@
+"""Change feed routes for client-side sync."""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth import get_current_user
+from app.config import settings
+from app import database as db
+from app import listing
+from app.responses import json_response
+from app.routes.bootstrap import SECTION_FIELDS
+
+
+router = APIRouter(prefix="/api", tags=["changes"])
+
+# Pruning runs from the feed itself, at most this often per process
+PRUNE_INTERVAL_SECONDS = 3600
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def _maybe_prune(conn) -> None:
+    """Drop change log rows past the retention window, at most once per interval."""
+    global _last_prune
+    now = time.monotonic()
+    with _prune_lock:
+        if _last_prune and now - _last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.CHANGE_LOG_RETENTION_DAYS)
+    db.prune_change_log(conn, cutoff.strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def _items(conn, user_id: int, section: str, ids: list[int] = None) -> list[dict]:
+    """A section's items with the fields its list endpoint returns."""
+    return db.get_section_items(conn, user_id, section, ids, columns=listing.columns(SECTION_FIELDS[section]))
+
+
+@router.get("/changes")
+def get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(500, ge=1, le=2000),
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    Items created, updated or deleted in the current user's sections after
+    the since cursor. Each changed item appears once: in upserted with its
+    current row, or in deleted by id. Without a cursor, or with one older than
+    the retained history, the response is a full snapshot with reset set and
+    the client should drop its copy first. Keep requesting with the returned
+    cursor while more is set.
+    """
+    _maybe_prune(conn)
+
+    if since is None or since < db.get_change_log_floor(conn):
+        # Read the cursor first: changes that land during the snapshot are
+        # sent again next time, which is harmless
+        cursor = db.get_change_cursor(conn)
+        changes = {
+            section: {"upserted": _items(conn, user["id"], section), "deleted": []}
+            for section in db.SECTION_TABLES
+        }
+        return json_response(
+            {"user_id": user["id"], "cursor": cursor, "reset": True, "more": False, "changes": changes}
+        )
+
+    rows = db.get_changes(conn, user["id"], since, limit)
+    # Latest op per item wins
+    latest: dict[str, dict[int, str]] = {}
+    for _, section, item_id, op in rows:
+        latest.setdefault(section, {})[item_id] = op
+
+    changes = {}
+    for section, ops in latest.items():
+        if section not in db.SECTION_TABLES:
+            continue
+        live = [item_id for item_id, op in ops.items() if op != "delete"]
+        upserted = _items(conn, user["id"], section, live) if live else []
+        found = {item["id"] for item in upserted}
+        # Items gone by the time they are read were deleted after the rows above
+        deleted = [item_id for item_id, op in ops.items() if op == "delete" or item_id not in found]
+        changes[section] = {"upserted": upserted, "deleted": deleted}
+
+    return json_response({
+        "user_id": user["id"],
+        "cursor": rows[-1][0] if rows else since,
+        "reset": False,
+        "more": len(rows) == limit,
+        "changes": changes,
+    })
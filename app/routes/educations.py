@@ -1,57 +1,73 @@
 """Education CRUD routes."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import Education
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["educations"])
 
 
-@router.get("/educations")
+# Fields an education entry can be projected to
+EDUCATION_FIELDS = ("id", "education_name", "institution", "start", "end", "grade")
+
+
+@router.get("/educations", dependencies=[Depends(section_etag("educations"))])
 def get_educations(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
-    """Get all education entries for the current user."""
-    with db.get_db() as conn:
-        educations = db.get_educations(conn, user["id"], query=q)
-    return educations
+    """Get the current user's education entries, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, EDUCATION_FIELDS)
+    educations = db.get_educations(
+        conn, user["id"], query=q, limit=listing.fetch_limit(limit), after=after, columns=wanted or EDUCATION_FIELDS
+    )
+    educations = listing.paginate(request, response, educations, limit)
+    return json_response(educations, response)
 
 
 @router.post("/educations", status_code=status.HTTP_201_CREATED)
 def create_education(
     edu_data: Education,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new education entry."""
-    with db.get_db() as conn:
-        existing = db.get_education_by_details(
-            conn,
-            edu_data.education_name,
-            edu_data.institution,
-            edu_data.start,
-            edu_data.end,
-            edu_data.grade,
-            user["id"]
-        )
-        if existing:
-            raise HTTPException(status_code=409, detail="Education already exists.")
-
-        edu_id = db.create_education(
-            conn,
-            edu_data.education_name,
-            edu_data.institution,
-            user["id"],
-            edu_data.start,
-            edu_data.end,
-            edu_data.grade
-        )
-        
-        edu = db.get_education_by_id(conn, edu_id, user["id"])
+    existing = db.get_education_by_details(
+        conn,
+        edu_data.education_name,
+        edu_data.institution,
+        edu_data.start,
+        edu_data.end,
+        edu_data.grade,
+        user["id"]
+    )
+    if existing:
+        raise HTTPException(status_code=409, detail="Education already exists.")
+
+    edu_id = db.create_education(
+        conn,
+        edu_data.education_name,
+        edu_data.institution,
+        user["id"],
+        edu_data.start,
+        edu_data.end,
+        edu_data.grade
+    )
+    
+    edu = db.get_education_by_id(conn, edu_id, user["id"])
     
     return edu
 
@@ -60,25 +76,26 @@ def create_education(
 def update_education(
     education_id: int,
     edu_data: Education,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update an education entry."""
-    with db.get_db() as conn:
-        edu = db.get_education_by_id(conn, education_id, user["id"])
-        if not edu:
-            raise HTTPException(status_code=404, detail="Education not found")
-
-        db.update_education(
-            conn,
-            education_id,
-            edu_data.education_name,
-            edu_data.institution,
-            edu_data.start,
-            edu_data.end,
-            edu_data.grade
-        )
-        
-        updated = db.get_education_by_id(conn, education_id, user["id"])
+    edu = db.get_education_by_id(conn, education_id, user["id"])
+    if not edu:
+        raise HTTPException(status_code=404, detail="Education not found")
+
+    db.update_education(
+        conn,
+        education_id,
+        user["id"],
+        edu_data.education_name,
+        edu_data.institution,
+        edu_data.start,
+        edu_data.end,
+        edu_data.grade
+    )
+    
+    updated = db.get_education_by_id(conn, education_id, user["id"])
     
     return updated
 
@@ -86,13 +103,13 @@ def update_education(
 @router.delete("/educations/{education_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_education(
     education_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete an education entry."""
-    with db.get_db() as conn:
-        edu = db.get_education_by_id(conn, education_id, user["id"])
-        if not edu:
-            raise HTTPException(status_code=404, detail="Education not found")
+    edu = db.get_education_by_id(conn, education_id, user["id"])
+    if not edu:
+        raise HTTPException(status_code=404, detail="Education not found")
 
-        db.delete_education(conn, education_id)
+    db.delete_education(conn, education_id, user["id"])
     return
@@ -1,50 +1,58 @@
 """Experiences CRUD routes."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import Experience
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["experiences"])
 
 
-@router.get("/experiences")
+# Fields of an experience in list responses
+EXPERIENCE_FIELDS = ("id", "experience_name", "start_year", "end_year", "bullet_points")
+
+
+@router.get("/experiences", dependencies=[Depends(section_etag("experiences"))])
 def get_experiences(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
-    """Get all experiences for the current user."""
-    with db.get_db() as conn:
-        experiences = db.get_experiences(conn, user["id"], query=q)
-    
-    return [
-        {
-            "id": e["id"],
-            "experience_name": e["experience_name"],
-            "start_year": e.get("start_year"),
-            "end_year": e.get("end_year"),
-            "bullet_points": e.get("bullet_points", [])
-        }
-        for e in experiences
-    ]
-
-
-@router.get("/experiences/{experience_id}/bullets")
+    """Get the current user's experiences, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, EXPERIENCE_FIELDS)
+    experiences = db.get_experiences(
+        conn, user["id"], query=q, limit=listing.fetch_limit(limit), after=after,
+        bullets=listing.wants(wanted, "bullet_points"),
+        columns=listing.columns(wanted or EXPERIENCE_FIELDS)
+    )
+    experiences = listing.paginate(request, response, experiences, limit)
+    return json_response(experiences, response)
+
+
+@router.get("/experiences/{experience_id}/bullets", dependencies=[Depends(section_etag("experiences"))])
 def get_experience_bullets(
     experience_id: int,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Get bullets for a specific experience."""
-    with db.get_db() as conn:
-        exp = db.get_experience_by_id(conn, experience_id, user["id"])
-        if not exp:
-            raise HTTPException(status_code=404, detail="Experience not found")
-        
-        bullets = db.get_experience_bullets(conn, experience_id, query=q)
+    exp = db.get_experience_by_id(conn, experience_id, user["id"])
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    
+    bullets = db.get_experience_bullets(conn, experience_id, query=q)
     
     return bullets
 
@@ -52,30 +60,30 @@ def get_experience_bullets(
 @router.post("/experiences", status_code=status.HTTP_201_CREATED)
 def create_experience(
     exp_data: Experience,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new experience."""
-    with db.get_db() as conn:
-        existing = db.get_experience_by_details(
-            conn, 
-            exp_data.experience_name,
-            exp_data.start_year,
-            exp_data.end_year,
-            user["id"]
-        )
-        if existing:
-            raise HTTPException(status_code=409, detail="Experience already exists.")
-
-        exp_id = db.create_experience(
-            conn,
-            exp_data.experience_name,
-            user["id"],
-            exp_data.start_year,
-            exp_data.end_year,
-            exp_data.bullet_points
-        )
-        
-        bullets = db.get_experience_bullets(conn, exp_id)
+    existing = db.get_experience_by_details(
+        conn, 
+        exp_data.experience_name,
+        exp_data.start_year,
+        exp_data.end_year,
+        user["id"]
+    )
+    if existing:
+        raise HTTPException(status_code=409, detail="Experience already exists.")
+
+    exp_id = db.create_experience(
+        conn,
+        exp_data.experience_name,
+        user["id"],
+        exp_data.start_year,
+        exp_data.end_year,
+        exp_data.bullet_points
+    )
+    
+    bullets = db.get_experience_bullets(conn, exp_id)
     
     return {
         "id": exp_id,
@@ -90,24 +98,25 @@ def create_experience(
 def update_experience(
     experience_id: int,
     exp_data: Experience,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update an experience."""
-    with db.get_db() as conn:
-        exp = db.get_experience_by_id(conn, experience_id, user["id"])
-        if not exp:
-            raise HTTPException(status_code=404, detail="Experience not found")
-
-        db.update_experience(
-            conn,
-            experience_id,
-            exp_data.experience_name,
-            exp_data.start_year,
-            exp_data.end_year,
-            exp_data.bullet_points
-        )
-        
-        bullets = db.get_experience_bullets(conn, experience_id)
+    exp = db.get_experience_by_id(conn, experience_id, user["id"])
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experience not found")
+
+    db.update_experience(
+        conn,
+        experience_id,
+        user["id"],
+        exp_data.experience_name,
+        exp_data.start_year,
+        exp_data.end_year,
+        exp_data.bullet_points
+    )
+    
+    bullets = db.get_experience_bullets(conn, experience_id)
     
     return {
         "id": experience_id,
@@ -121,13 +130,13 @@ def update_experience(
 @router.delete("/experiences/{experience_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_experience(
     experience_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete an experience."""
-    with db.get_db() as conn:
-        exp = db.get_experience_by_id(conn, experience_id, user["id"])
-        if not exp:
-            raise HTTPException(status_code=404, detail="Experience not found")
+    exp = db.get_experience_by_id(conn, experience_id, user["id"])
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experience not found")
 
-        db.delete_experience(conn, experience_id)
+    db.delete_experience(conn, experience_id, user["id"])
     return
@@ -1,39 +1,120 @@
 """HTML page routes."""
+import hashlib
+import os
+import threading
+from urllib.parse import urlencode
+
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
 
+from app.assets import asset_urls, rewrite_asset_urls
 from app.auth import verify_token_for_page
+from app.compression import compress, negotiate_encoding, supported_encodings
+from app.conditional import if_none_match
+from app.config import settings
 
 
 router = APIRouter(tags=["pages"])
 
+FRONTEND_DIR = "frontend"
+
+
+class PageAsset:
+    """An HTML page held in memory with precompressed variants and ETags."""
+
+    __slots__ = ("mtime", "variants", "etags")
+
+    def __init__(self, body: bytes, mtime: float):
+        self.mtime = mtime
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Each representation gets its own strong ETag
+        self.variants = {None: body}
+        self.etags = {None: f'"{digest}"'}
+        for encoding in supported_encodings():
+            self.variants[encoding] = compress(body, encoding)
+            self.etags[encoding] = f'"{digest}-{encoding}"'
+
+
+_pages: dict[str, PageAsset] = {}
+_pages_lock = threading.Lock()
+
+
+def load_page(filepath: str) -> PageAsset:
+    """Return the in-memory page, (re)loading it from disk if needed."""
+    page = _pages.get(filepath)
+    if page is not None and not settings.PAGE_RELOAD:
+        return page
+
+    mtime = os.stat(filepath).st_mtime
+    if page is not None and page.mtime == mtime:
+        return page
+
+    with _pages_lock:
+        page = _pages.get(filepath)
+        if page is None or page.mtime != mtime:
+            with open(filepath, "rb") as f:
+                body = f.read()
+            # In development serve the unbuilt sources so edits show up directly
+            body = rewrite_asset_urls(body, asset_urls(use_manifest=not settings.PAGE_RELOAD))
+            page = PageAsset(body, mtime)
+            _pages[filepath] = page
+    return page
+
+
+def preload_pages() -> None:
+    """Load and compress every frontend page (called at startup)."""
+    for filename in os.listdir(FRONTEND_DIR):
+        if filename.endswith(".html"):
+            load_page(os.path.join(FRONTEND_DIR, filename))
+
+
+def page_response(request: Request, html_path: str, cache_control: str) -> Response:
+    """Serve a page from memory, honouring Accept-Encoding and If-None-Match."""
+    page = load_page(html_path)
+    encoding = negotiate_encoding(
+        request.headers.get("Accept-Encoding"), tuple(e for e in page.variants if e)
+    )
+    headers = {
+        "ETag": page.etags[encoding],
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if if_none_match(request, page.etags.values()):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(page.variants[encoding], headers=headers)
+
 
-def read_html_file(filepath: str) -> str:
-    """Read an HTML file and return its contents."""
-    with open(filepath) as f:
-        return f.read()
+def local_path(path: str) -> str:
+    """path if it stays on this site, "/" otherwise (browsers read "/\\host" and "//host" as another host)."""
+    if not path.startswith("/") or path.startswith("//") or "\\" in path:
+        return "/"
+    return path
 
 
-def protected_page(request: Request, html_path: str) -> HTMLResponse | RedirectResponse:
+def protected_page(request: Request, html_path: str) -> Response:
     """Return HTML page if authenticated, redirect to login otherwise."""
     if not verify_token_for_page(request):
-        response = RedirectResponse(url="/login", status_code=303)
+        login_url = f"/login?{urlencode({'next': local_path(request.url.path)})}"
+        response = RedirectResponse(url=login_url, status_code=303)
         response.delete_cookie(key="access_token")
         return response
-    return HTMLResponse(read_html_file(html_path))
+    # Revalidate every time so the auth check above still runs on each visit
+    return page_response(request, html_path, "private, no-cache")
 
 
 # Public pages
 @router.get("/register", response_class=HTMLResponse)
-def register_page():
+def register_page(request: Request):
     """Registration page."""
-    return HTMLResponse(read_html_file("frontend/register.html"))
+    return page_response(request, "frontend/register.html", "public, no-cache")
 
 
 @router.get("/login", response_class=HTMLResponse)
-def login_page():
+def login_page(request: Request):
     """Login page."""
-    return HTMLResponse(read_html_file("frontend/login.html"))
+    return page_response(request, "frontend/login.html", "public, no-cache")
 
 
 # Protected pages
@@ -1,20 +1,22 @@
 """PDF generation routes - generates PDF server-side with xhtml2pdf."""
 import os
-import base64
 import io
 import logging
 from typing import List
 
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 import jinja2
-from PIL import Image
-from xhtml2pdf import pisa
 
 from app.models import ResumeData, Experience, Education
 from app.auth import get_current_user
-from app.llm import run_ats_optimization, get_llm_client
+from app.llm import run_ats_optimization, get_llm_client_async
 from app import database as db
+from app import metrics
+from app import photos
+from app.responses import FastJSONResponse
+from app.timing import Timer
 
 
 router = APIRouter(tags=["pdf"])
@@ -88,18 +90,23 @@ def save_resume_data(conn, data: ResumeData, user_id: int):
                 )
 
 
-def convert_html_to_pdf(html_content: str) -> tuple[bytes | None, bool]:
+def convert_html_to_pdf(html_content: str, resources: dict[str, str] = None) -> tuple[bytes | None, bool]:
     """
-    Convert HTML content to PDF using xhtml2pdf.
+    Convert HTML content to PDF using xhtml2pdf. resources maps URLs in the
+    HTML (stored photos) to data URIs to embed instead.
     Returns tuple of (pdf_bytes, success_status).
     """
+    # Imported here: xhtml2pdf pulls in reportlab, too slow for every cold start
+    from xhtml2pdf import pisa
+
     result_buffer = io.BytesIO()
     
     # Convert HTML to PDF
     pisa_status = pisa.CreatePDF(
         src=html_content,
         dest=result_buffer,
-        encoding='utf-8'
+        encoding='utf-8',
+        link_callback=(lambda uri, rel: resources.get(uri, uri)) if resources else None
     )
     
     if pisa_status.err:
@@ -113,111 +120,133 @@ def convert_html_to_pdf(html_content: str) -> tuple[bytes | None, bool]:
 async def generate_pdf(
     data: ResumeData,
     request: Request,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """
     Generate resume PDF server-side using xhtml2pdf.
     Returns PDF binary directly, or falls back to HTML for client-side generation.
+    The Server-Timing header breaks the time down by stage.
     """
+    timer = Timer()
+    response = await _generate_pdf(data, request, user, conn, timer)
+    timer.stop()
+    response.headers["Server-Timing"] = timer.server_timing()
+    timer.observe(metrics.PDF_STAGE_SECONDS)
+    logging.info(timer.log_line(
+        "generate_pdf",
+        user_id=user["id"],
+        template=request.headers.get("X-Template-Name", "basic_resume.html"),
+        status=response.status_code,
+        media_type=response.media_type,
+        bytes=len(response.body),
+    ))
+    return response
+
+
+async def _generate_pdf(data: ResumeData, request: Request, user: dict, conn, timer: Timer) -> Response:
+    """The stages of /generate-pdf, each timed as a span of timer."""
     try:
         # Run ATS optimization if job description provided and LLM available
-        if data.job_description and get_llm_client():
-            ats_data = await run_ats_optimization(data.job_description, user["id"])
+        if data.job_description and await get_llm_client_async():
+            with timer.span("ats"):
+                ats_data = await run_ats_optimization(conn, data.job_description, user["id"])
             data.summary = ats_data.summary
             data.skills = ats_data.skills
             data.experience = ats_data.experience
             data.projects = ats_data.projects
 
-        # Save resume data to database
-        with db.get_db() as conn:
-            save_resume_data(conn, data, user["id"])
+        # The rest is blocking database, Jinja and xhtml2pdf work
+        return await run_in_threadpool(_render_resume, data, request, user, conn, timer)
 
-        template_name = request.headers.get("X-Template-Name", "basic_resume.html")
-        template_path = os.path.join(TEMPLATE_DIR, template_name)
+    except Exception as e:
+        import traceback
+        logging.error(f"SERVER ERROR: {traceback.format_exc()}")
+        return FastJSONResponse({"error": str(e)}, status_code=500)
+
+
+def _render_resume(data: ResumeData, request: Request, user: dict, conn, timer: Timer) -> Response:
+    """Save the resume data and render it as a PDF (or the HTML fallback)."""
+    # Save resume data to database
+    with timer.span("save"):
+        save_resume_data(conn, data, user["id"])
 
-        if not os.path.exists(template_path):
-            return JSONResponse({"error": f"Template '{template_name}' not found."}, status_code=404)
+    template_name = request.headers.get("X-Template-Name", "basic_resume.html")
+    template_path = os.path.join(TEMPLATE_DIR, template_name)
 
-        # Set up Jinja2 environment for HTML templates
+    if not os.path.exists(template_path):
+        return FastJSONResponse({"error": f"Template '{template_name}' not found."}, status_code=404)
+
+    # Set up Jinja2 environment for HTML templates
+    with timer.span("template"):
         env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
             autoescape=True
         )
         template = env.get_template(template_name)
 
-        # Process profile image to base64 data URI if provided
-        image_data_uri = None
-        if data.image_base64:
-            try:
-                if ',' in data.image_base64:
-                    image_data_b64 = data.image_base64.split(',', 1)[1]
-                else:
-                    image_data_b64 = data.image_base64
-
-                image_data = base64.b64decode(image_data_b64)
-                image = Image.open(io.BytesIO(image_data))
-
-                if image.mode in ('RGBA', 'LA', 'P'):
-                    image = image.convert('RGB')
-                elif image.mode != 'RGB':
-                    image = image.convert('RGB')
-
-                # Convert back to base64 for embedding in HTML
-                buffered = io.BytesIO()
-                image.save(buffered, format="PNG", optimize=True)
-                image_data_uri = f"data:image/png;base64,{base64.b64encode(buffered.getvalue()).decode()}"
-
-            except Exception as e:
-                logging.error(f"Error processing image: {e}")
-
-        # Update contact info from user data
-        contact_data = {
-            "email": data.contact.email or user["email"],
-            "phone": data.contact.phone or user["phone"],
-            "location": data.contact.location or user["location"],
-            "linkedin": data.contact.linkedin or user["linkedin"],
-            "github": data.contact.github or user["github"],
-            "website": data.contact.website or user["website"]
-        }
-
-        # Sanitize experience and education dates
-        sanitized_exp: List[Experience] = []
-        sanitized_edu: List[Education] = []
-
-        for exp in data.experience:
-            if exp.end_year == "":
-                new_exp = Experience(
-                    experience_name=exp.experience_name,
-                    bullet_points=exp.bullet_points,
-                    start_year=exp.start_year,
-                    end_year="Present"
-                )
-                sanitized_exp.append(new_exp)
-            else:
-                sanitized_exp.append(exp)
-
-        for edu in data.education:
-            if edu.end == "":
-                new_edu = Education(
-                    education_name=edu.education_name,
-                    institution=edu.institution,
-                    start=edu.start,
-                    grade=edu.grade,
-                    end="Present",
-                )
-                sanitized_edu.append(new_edu)
-            else:
-                sanitized_edu.append(edu)
+    # The template links the stored print rendition; the HTML fallback
+    # loads it from that URL and server-side rendering embeds its bytes
+    photo_url = None
+    resources = {}
+    if data.photo_id:
+        with timer.span("photo"):
+            photo = db.get_photo(conn, user["id"], data.photo_id, "print")
+        if photo:
+            photo_url = photos.photo_url(data.photo_id)
+            resources[photo_url] = photos.data_uri(photo["media_type"], photo["data"])
+        else:
+            logging.warning(f"Photo {data.photo_id} not found, rendering without it")
+
+    # Update contact info from user data
+    contact_data = {
+        "email": data.contact.email or user["email"],
+        "phone": data.contact.phone or user["phone"],
+        "location": data.contact.location or user["location"],
+        "linkedin": data.contact.linkedin or user["linkedin"],
+        "github": data.contact.github or user["github"],
+        "website": data.contact.website or user["website"]
+    }
+
+    # Sanitize experience and education dates
+    sanitized_exp: List[Experience] = []
+    sanitized_edu: List[Education] = []
+
+    for exp in data.experience:
+        if exp.end_year == "":
+            new_exp = Experience(
+                experience_name=exp.experience_name,
+                bullet_points=exp.bullet_points,
+                start_year=exp.start_year,
+                end_year="Present"
+            )
+            sanitized_exp.append(new_exp)
+        else:
+            sanitized_exp.append(exp)
+
+    for edu in data.education:
+        if edu.end == "":
+            new_edu = Education(
+                education_name=edu.education_name,
+                institution=edu.institution,
+                start=edu.start,
+                grade=edu.grade,
+                end="Present",
+            )
+            sanitized_edu.append(new_edu)
+        else:
+            sanitized_edu.append(edu)
 
-        data.experience = sanitized_exp
-        data.education = sanitized_edu
+    data.experience = sanitized_exp
+    data.education = sanitized_edu
 
-        # Render HTML template
+    # Render HTML template
+    with timer.span("render"):
         html_content = template.render(
             name=data.name or user["name"],
             contact=contact_data,
             summary=data.summary,
-            image_data_uri=image_data_uri,
+            photo_url=photo_url,
             skills=[s.model_dump() for s in data.skills],
             experience=[e.model_dump() for e in data.experience],
             projects=[p.model_dump() for p in data.projects],
@@ -225,63 +254,61 @@ async def generate_pdf(
             references=[r.model_dump() for r in data.references]
         )
 
-        # Check if client prefers HTML fallback (for client-side PDF generation)
-        prefer_html = request.headers.get("X-Prefer-HTML", "false").lower() == "true"
-        
-        if prefer_html:
-            # Return HTML for client-side PDF generation (fallback mode)
-            return JSONResponse({
-                "html": html_content,
-                "filename": "resume.pdf",
-                "fallback": True
-            })
-
-        # Generate PDF server-side using xhtml2pdf
-        pdf_bytes, success = convert_html_to_pdf(html_content)
-        
-        if not success or pdf_bytes is None:
-            logging.warning("Server-side PDF generation failed, returning HTML for fallback")
-            # Return HTML for client-side fallback
-            return JSONResponse({
-                "html": html_content,
-                "filename": "resume.pdf",
-                "fallback": True
-            })
-
-        # Return PDF binary directly
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": "attachment; filename=resume.pdf"
-            }
-        )
-
-    except Exception as e:
-        import traceback
-        logging.error(f"SERVER ERROR: {traceback.format_exc()}")
-        return JSONResponse({"error": str(e)}, status_code=500)
+    # Check if client prefers HTML fallback (for client-side PDF generation)
+    prefer_html = request.headers.get("X-Prefer-HTML", "false").lower() == "true"
+    
+    if prefer_html:
+        # Return HTML for client-side PDF generation (fallback mode)
+        return FastJSONResponse({
+            "html": html_content,
+            "filename": "resume.pdf",
+            "fallback": True
+        })
+
+    # Generate PDF server-side using xhtml2pdf
+    with timer.span("pdf"):
+        pdf_bytes, success = convert_html_to_pdf(html_content, resources)
+    
+    if not success or pdf_bytes is None:
+        logging.warning("Server-side PDF generation failed, returning HTML for fallback")
+        # Return HTML for client-side fallback
+        return FastJSONResponse({
+            "html": html_content,
+            "filename": "resume.pdf",
+            "fallback": True
+        })
+
+    # Return PDF binary directly
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=resume.pdf"
+        }
+    )
 
 
 @router.post("/save-json")
 async def save_json(
     data: ResumeData,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Save resume data without generating PDF."""
-    with db.get_db() as conn:
-        save_resume_data(conn, data, user["id"])
+    save_resume_data(conn, data, user["id"])
     
-    response_data = data.model_dump()
-    response_data["image_base64"] = None
-    return JSONResponse(response_data)
+    return FastJSONResponse(data.model_dump())
+
+
+def list_template_files() -> list[str]:
+    """File names of the available resume templates."""
+    return [f for f in os.listdir(TEMPLATE_DIR) if f.endswith(".html")]
 
 
 @router.get("/templates")
 def list_templates():
     """List available resume templates."""
     try:
-        templates = [f for f in os.listdir(TEMPLATE_DIR) if f.endswith(".html")]
-        return JSONResponse(templates)
+        return FastJSONResponse(list_template_files())
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
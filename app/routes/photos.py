@@ -0,0 +1,96 @@
+"""Profile photo routes: upload once, then serve the stored renditions."""
+import logging
+import threading
+
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+
+from app.auth import get_current_user
+from app.config import settings
+from app.conditional import if_none_match
+from app import database as db
+from app import metrics
+from app import photos
+
+
+router = APIRouter(prefix="/api", tags=["photos"])
+
+# Renditions never change under an id, so browsers may keep them
+PHOTO_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# A decode can hold PHOTO_MAX_PIXELS * 4 bytes (formats without reduced
+# decoding), so only a few run at once per worker
+_decode_slots = threading.BoundedSemaphore(settings.PHOTO_DECODE_CONCURRENCY)
+
+
+@router.post("/photos", status_code=status.HTTP_201_CREATED)
+def upload_photo(
+    file: UploadFile = File(...),
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    Store a profile photo as downsized renditions and return its id, which
+    resume data passes as photo_id. Uploading the same file again returns
+    the stored photo without decoding it.
+    """
+    data = file.file.read(settings.PHOTO_MAX_UPLOAD_BYTES + 1)
+    if len(data) > settings.PHOTO_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Photos are limited to {settings.PHOTO_MAX_UPLOAD_BYTES // (1024 * 1024)} MB."
+        )
+
+    photo_id = photos.content_id(data)
+    sizes = {
+        row["rendition"]: (row["width"], row["height"])
+        for row in db.get_photo_renditions(conn, user["id"], photo_id)
+    }
+    if not sizes:
+        if not _decode_slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many photo uploads in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        metrics.PHOTO_DECODES_IN_FLIGHT.inc()
+        stages = {}
+        try:
+            renditions = photos.make_renditions(data, stages)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            metrics.PHOTO_DECODES_IN_FLIGHT.dec()
+            _decode_slots.release()
+        logging.info(
+            f"Photo {photo_id} ({len(data)} bytes): "
+            + " ".join(f"{stage}={ms:.1f}ms" for stage, ms in stages.items())
+        )
+        db.save_photo(conn, user["id"], photo_id, renditions)
+        sizes = {name: (width, height) for name, (_, width, height, _) in renditions.items()}
+
+    return {
+        "id": photo_id,
+        "renditions": {
+            name: {"url": photos.photo_url(photo_id, name), "width": width, "height": height}
+            for name, (width, height) in sizes.items()
+        },
+    }
+
+
+@router.get("/photos/{photo_id}/{rendition}")
+def get_photo(
+    photo_id: str,
+    rendition: str,
+    request: Request,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Serve a stored rendition of one of the current user's photos."""
+    etag = f'"{photo_id}-{rendition}"'
+    headers = {"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL}
+    if if_none_match(request, {etag}):
+        return Response(status_code=304, headers=headers)
+    photo = db.get_photo(conn, user["id"], photo_id, rendition)
+    if photo is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return Response(content=photo["data"], media_type=photo["media_type"], headers=headers)
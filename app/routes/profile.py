@@ -1,17 +1,28 @@
 """User profile routes."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from starlette.concurrency import run_in_threadpool
 
+from app.config import settings
 from app.models import UserCreate
-from app.auth import get_current_user, get_password_hash
+from app.auth import (
+    get_current_user, get_password_hash, create_user_access_token, set_access_token_cookie,
+    issue_refresh_token, set_refresh_token_cookie, revoke_user_sessions
+)
+from app.conditional import section_etag
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["profile"])
 
 
-@router.get("/user-profile")
-def get_user_profile(user: dict = Depends(get_current_user)):
+@router.get("/user-profile", dependencies=[Depends(section_etag("profile"))])
+def get_user_profile(
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
     """Get current user's profile."""
+    # Read the row rather than the cached user so the body matches the revision ETag
+    user = db.get_user_by_id(conn, user["id"]) or user
     return {
         "name": user["name"],
         "email": user["email"],
@@ -24,30 +35,45 @@ def get_user_profile(user: dict = Depends(get_current_user)):
 
 
 @router.put("/user-profile")
-def update_user_profile(
+async def update_user_profile(
     user_data: UserCreate,
-    user: dict = Depends(get_current_user)
+    response: Response,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update current user's profile."""
-    with db.get_db() as conn:
-        password_hash = None
-        if user_data.password:
-            password_hash = get_password_hash(user_data.password)
-        
-        db.update_user(
-            conn,
-            user_id=user["id"],
-            name=user_data.name,
-            email=user_data.email,
-            phone=user_data.phone,
-            location=user_data.location,
-            linkedin=user_data.linkedin,
-            github=user_data.github,
-            website=user_data.website,
-            password_hash=password_hash
-        )
-        
-        updated = db.get_user_by_id(conn, user["id"])
+    # Async so no threadpool thread waits on bcrypt; the writes run in the threadpool
+    password_hash = None
+    if user_data.password:
+        password_hash = await get_password_hash(user_data.password)
+    return await run_in_threadpool(_save_profile, conn, response, user, user_data, password_hash)
+
+
+def _save_profile(conn, response: Response, user: dict, user_data: UserCreate,
+                  password_hash: str | None) -> dict:
+    db.update_user(
+        conn,
+        user_id=user["id"],
+        name=user_data.name,
+        email=user_data.email,
+        phone=user_data.phone,
+        location=user_data.location,
+        linkedin=user_data.linkedin,
+        github=user_data.github,
+        website=user_data.website,
+        password_hash=password_hash
+    )
+    
+    updated = db.get_user_by_id(conn, user["id"])
+    
+    # A password change signs out every other session
+    if password_hash:
+        revoke_user_sessions(conn, user["id"])
+        set_refresh_token_cookie(response, issue_refresh_token(conn, user["id"]))
+    
+    # Profile claims in the current token are stale now; reissue it
+    if settings.JWT_PROFILE_CLAIMS:
+        set_access_token_cookie(response, create_user_access_token(updated))
     
     return {
         "name": updated["name"],
@@ -0,0 +1,36 @@
+"""Download routes for request profiles (see app.profiling)."""
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app import profiling
+
+
+router = APIRouter(prefix="/api", tags=["profiles"])
+
+
+def require_profile_token(request: Request) -> None:
+    """Allow only callers sending X-Profile-Token: PROFILE_TOKEN; without a token configured the routes do not exist."""
+    if not settings.PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("X-Profile-Token", "")
+    if not secrets.compare_digest(token, settings.PROFILE_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+def list_profiles():
+    """Stored request profiles, newest first."""
+    return profiling.list_profiles()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+def download_profile(profile_id: str):
+    """Download a profile as a speedscope file."""
+    path = profiling.profile_path(profile_id)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=profile_id + profiling.PROFILE_SUFFIX)
@@ -1,49 +1,58 @@
 """Projects CRUD routes."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import Project
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["projects"])
 
 
-@router.get("/projects")
+# Fields of a project in list responses
+PROJECT_FIELDS = ("id", "project_name", "github_link", "bullet_points")
+
+
+@router.get("/projects", dependencies=[Depends(section_etag("projects"))])
 def get_projects(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
-    """Get all projects for the current user."""
-    with db.get_db() as conn:
-        projects = db.get_projects(conn, user["id"], query=q)
-    
-    return [
-        {
-            "id": p["id"],
-            "project_name": p["project_name"],
-            "github_link": p.get("github_link"),
-            "bullet_points": p.get("bullet_points", [])
-        }
-        for p in projects
-    ]
-
-
-@router.get("/projects/{project_id}/bullets")
+    """Get the current user's projects, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, PROJECT_FIELDS)
+    projects = db.get_projects(
+        conn, user["id"], query=q, limit=listing.fetch_limit(limit), after=after,
+        bullets=listing.wants(wanted, "bullet_points"),
+        columns=listing.columns(wanted or PROJECT_FIELDS)
+    )
+    projects = listing.paginate(request, response, projects, limit)
+    return json_response(projects, response)
+
+
+@router.get("/projects/{project_id}/bullets", dependencies=[Depends(section_etag("projects"))])
 def get_project_bullets(
     project_id: int,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Get bullets for a specific project."""
-    with db.get_db() as conn:
-        project = db.get_project_by_id(conn, project_id, user["id"])
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        bullets = db.get_project_bullets(conn, project_id, query=q)
+    project = db.get_project_by_id(conn, project_id, user["id"])
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    bullets = db.get_project_bullets(conn, project_id, query=q)
     
     return bullets
 
@@ -51,28 +60,28 @@ def get_project_bullets(
 @router.post("/projects", status_code=status.HTTP_201_CREATED)
 def create_project(
     project_data: Project,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new project."""
-    with db.get_db() as conn:
-        existing = db.get_project_by_details(
-            conn,
-            project_data.project_name,
-            project_data.github_link,
-            user["id"]
-        )
-        if existing:
-            raise HTTPException(status_code=409, detail="Project already exists.")
-
-        project_id = db.create_project(
-            conn,
-            project_data.project_name,
-            user["id"],
-            project_data.github_link,
-            project_data.bullet_points
-        )
-        
-        bullets = db.get_project_bullets(conn, project_id)
+    existing = db.get_project_by_details(
+        conn,
+        project_data.project_name,
+        project_data.github_link,
+        user["id"]
+    )
+    if existing:
+        raise HTTPException(status_code=409, detail="Project already exists.")
+
+    project_id = db.create_project(
+        conn,
+        project_data.project_name,
+        user["id"],
+        project_data.github_link,
+        project_data.bullet_points
+    )
+    
+    bullets = db.get_project_bullets(conn, project_id)
     
     return {
         "id": project_id,
@@ -86,23 +95,24 @@ def create_project(
 def update_project(
     project_id: int,
     project_data: Project,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update a project."""
-    with db.get_db() as conn:
-        project = db.get_project_by_id(conn, project_id, user["id"])
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        db.update_project(
-            conn,
-            project_id,
-            project_data.project_name,
-            project_data.github_link,
-            project_data.bullet_points
-        )
-        
-        bullets = db.get_project_bullets(conn, project_id)
+    project = db.get_project_by_id(conn, project_id, user["id"])
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    db.update_project(
+        conn,
+        project_id,
+        user["id"],
+        project_data.project_name,
+        project_data.github_link,
+        project_data.bullet_points
+    )
+    
+    bullets = db.get_project_bullets(conn, project_id)
     
     return {
         "id": project_id,
@@ -115,13 +125,13 @@ def update_project(
 @router.delete("/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete a project."""
-    with db.get_db() as conn:
-        project = db.get_project_by_id(conn, project_id, user["id"])
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
+    project = db.get_project_by_id(conn, project_id, user["id"])
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
 
-        db.delete_project(conn, project_id)
+    db.delete_project(conn, project_id, user["id"])
     return
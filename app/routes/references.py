@@ -1,52 +1,74 @@
 """References CRUD routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import Reference
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["references"])
 
 
-@router.get("/references")
-def get_references(user: dict = Depends(get_current_user)):
-    """Get all references for the current user."""
-    with db.get_db() as conn:
-        references = db.get_references(conn, user["id"])
-    return references
+# Fields a reference can be projected to
+REFERENCE_FIELDS = (
+    "id", "referer_name", "referer_institute", "position", "connection_type", "institution_url",
+)
+
+
+@router.get("/references", dependencies=[Depends(section_etag("references"))])
+def get_references(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Get the current user's references, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, REFERENCE_FIELDS)
+    references = db.get_references(
+        conn, user["id"], limit=listing.fetch_limit(limit), after=after, columns=wanted or REFERENCE_FIELDS
+    )
+    references = listing.paginate(request, response, references, limit)
+    return json_response(references, response)
 
 
 @router.post("/references", status_code=status.HTTP_201_CREATED)
 def create_reference(
     ref_data: Reference,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new reference."""
-    with db.get_db() as conn:
-        existing = db.get_reference_by_details(
-            conn,
-            ref_data.referer_name,
-            ref_data.referer_institute,
-            ref_data.position,
-            ref_data.connection_type,
-            ref_data.institution_url,
-            user["id"]
-        )
-        if existing:
-            raise HTTPException(status_code=409, detail="Reference already exists.")
-
-        ref_id = db.create_reference(
-            conn,
-            ref_data.referer_name,
-            ref_data.referer_institute,
-            user["id"],
-            ref_data.position,
-            ref_data.connection_type,
-            ref_data.institution_url
-        )
-        
-        ref = db.get_reference_by_id(conn, ref_id, user["id"])
+    existing = db.get_reference_by_details(
+        conn,
+        ref_data.referer_name,
+        ref_data.referer_institute,
+        ref_data.position,
+        ref_data.connection_type,
+        ref_data.institution_url,
+        user["id"]
+    )
+    if existing:
+        raise HTTPException(status_code=409, detail="Reference already exists.")
+
+    ref_id = db.create_reference(
+        conn,
+        ref_data.referer_name,
+        ref_data.referer_institute,
+        user["id"],
+        ref_data.position,
+        ref_data.connection_type,
+        ref_data.institution_url
+    )
+    
+    ref = db.get_reference_by_id(conn, ref_id, user["id"])
     
     return ref
 
@@ -55,25 +77,26 @@ def create_reference(
 def update_reference(
     reference_id: int,
     ref_data: Reference,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update a reference."""
-    with db.get_db() as conn:
-        ref = db.get_reference_by_id(conn, reference_id, user["id"])
-        if not ref:
-            raise HTTPException(status_code=404, detail="Reference not found")
-
-        db.update_reference(
-            conn,
-            reference_id,
-            ref_data.referer_name,
-            ref_data.referer_institute,
-            ref_data.position,
-            ref_data.connection_type,
-            ref_data.institution_url
-        )
-        
-        updated = db.get_reference_by_id(conn, reference_id, user["id"])
+    ref = db.get_reference_by_id(conn, reference_id, user["id"])
+    if not ref:
+        raise HTTPException(status_code=404, detail="Reference not found")
+
+    db.update_reference(
+        conn,
+        reference_id,
+        user["id"],
+        ref_data.referer_name,
+        ref_data.referer_institute,
+        ref_data.position,
+        ref_data.connection_type,
+        ref_data.institution_url
+    )
+    
+    updated = db.get_reference_by_id(conn, reference_id, user["id"])
     
     return updated
 
@@ -81,13 +104,13 @@ def update_reference(
 @router.delete("/references/{reference_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_reference(
     reference_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete a reference."""
-    with db.get_db() as conn:
-        ref = db.get_reference_by_id(conn, reference_id, user["id"])
-        if not ref:
-            raise HTTPException(status_code=404, detail="Reference not found")
+    ref = db.get_reference_by_id(conn, reference_id, user["id"])
+    if not ref:
+        raise HTTPException(status_code=404, detail="Reference not found")
 
-        db.delete_reference(conn, reference_id)
+    db.delete_reference(conn, reference_id, user["id"])
     return
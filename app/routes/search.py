@@ -0,0 +1,32 @@
+"""Full-text search routes."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app import database as db
+
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+@router.get("/search")
+def search(
+    q: str,
+    sections: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    Search all of the current user's profile data, best matches first.
+    sections is an optional comma-separated subset of db.SEARCH_SECTIONS.
+    """
+    wanted = None
+    if sections:
+        wanted = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = set(wanted) - set(db.SEARCH_SECTIONS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(sorted(unknown))}")
+
+    return db.search_profile(conn, user["id"], q, sections=wanted, limit=limit)
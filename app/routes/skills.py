@@ -1,57 +1,72 @@
 """Skills CRUD routes."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import Skill
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["skills"])
 
 
-@router.get("/skills")
+# Fields of a skill in list responses
+SKILL_FIELDS = ("id", "skill_name", "bullet_points")
+
+
+@router.get("/skills", dependencies=[Depends(section_etag("skills"))])
 def get_skills(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
-    """Get all skills for the current user."""
-    with db.get_db() as conn:
-        skills = db.get_skills(conn, user["id"], query=q)
-    
-    return [
-        {
-            "id": s["id"],
-            "skill_name": s["skill_name"],
-            "bullet_points": s.get("bullet_points", [])
-        }
-        for s in skills
-    ]
-
-
-@router.get("/skills_with_bullets")
+    """Get the current user's skills, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, SKILL_FIELDS)
+    skills = db.get_skills(
+        conn, user["id"], query=q, limit=listing.fetch_limit(limit), after=after,
+        bullets=listing.wants(wanted, "bullet_points"),
+        columns=listing.columns(wanted or SKILL_FIELDS)
+    )
+    skills = listing.paginate(request, response, skills, limit)
+    return json_response(skills, response)
+
+
+@router.get("/skills_with_bullets", dependencies=[Depends(section_etag("skills"))])
 def get_skills_with_bullets(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Get all skills with bullets for the current user."""
-    return get_skills(q=q, user=user)
+    return get_skills(request, response, q=q, limit=limit, after=after, fields=None, user=user, conn=conn)
 
 
-@router.get("/skills/{skill_id}/bullets")
+@router.get("/skills/{skill_id}/bullets", dependencies=[Depends(section_etag("skills"))])
 def get_skill_bullets(
     skill_id: int,
     q: Optional[str] = None,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Get bullets for a specific skill."""
-    with db.get_db() as conn:
-        skill = db.get_skill_by_id(conn, skill_id, user["id"])
-        if not skill:
-            raise HTTPException(status_code=404, detail="Skill not found")
-        
-        bullets = db.get_skill_bullets(conn, skill_id, query=q)
+    skill = db.get_skill_by_id(conn, skill_id, user["id"])
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    
+    bullets = db.get_skill_bullets(conn, skill_id, query=q)
     
     return bullets
 
@@ -59,22 +74,22 @@ def get_skill_bullets(
 @router.post("/skills", status_code=status.HTTP_201_CREATED)
 def create_skill(
     skill_data: Skill,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new skill."""
-    with db.get_db() as conn:
-        existing = db.get_skill_by_name(conn, skill_data.skill_name, user["id"])
-        if existing:
-            raise HTTPException(status_code=409, detail="A skill with this name already exists.")
-
-        skill_id = db.create_skill(
-            conn, 
-            skill_data.skill_name, 
-            user["id"], 
-            skill_data.bullet_points
-        )
-        
-        bullets = db.get_skill_bullets(conn, skill_id)
+    existing = db.get_skill_by_name(conn, skill_data.skill_name, user["id"])
+    if existing:
+        raise HTTPException(status_code=409, detail="A skill with this name already exists.")
+
+    skill_id = db.create_skill(
+        conn, 
+        skill_data.skill_name, 
+        user["id"], 
+        skill_data.bullet_points
+    )
+    
+    bullets = db.get_skill_bullets(conn, skill_id)
     
     return {
         "id": skill_id,
@@ -87,17 +102,19 @@ def create_skill(
 def update_skill(
     skill_id: int,
     skill_data: Skill,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update a skill."""
-    with db.get_db() as conn:
-        skill = db.get_skill_by_id(conn, skill_id, user["id"])
-        if not skill:
-            raise HTTPException(status_code=404, detail="Skill not found")
-
-        db.update_skill(conn, skill_id, skill_data.skill_name, skill_data.bullet_points)
-        
-        bullets = db.get_skill_bullets(conn, skill_id)
+    skill = db.get_skill_by_id(conn, skill_id, user["id"])
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    db.update_skill(
+        conn, skill_id, user["id"], skill_data.skill_name, skill_data.bullet_points
+    )
+    
+    bullets = db.get_skill_bullets(conn, skill_id)
     
     return {
         "id": skill_id,
@@ -109,13 +126,13 @@ def update_skill(
 @router.delete("/skills/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_skill(
     skill_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete a skill."""
-    with db.get_db() as conn:
-        skill = db.get_skill_by_id(conn, skill_id, user["id"])
-        if not skill:
-            raise HTTPException(status_code=404, detail="Skill not found")
+    skill = db.get_skill_by_id(conn, skill_id, user["id"])
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
 
-        db.delete_skill(conn, skill_id)
+    db.delete_skill(conn, skill_id, user["id"])
     return
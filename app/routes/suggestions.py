@@ -0,0 +1,34 @@
+"""Autocomplete suggestion routes."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app import database as db
+from app import suggestions
+
+
+router = APIRouter(prefix="/api", tags=["suggestions"])
+
+
+@router.get("/suggestions")
+def get_suggestions(
+    section: str,
+    q: str = "",
+    parent_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=suggestions.MAX_LIMIT),
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """
+    Get autocomplete suggestions for a section. Items come back as their ID,
+    name and the few fields the form fills in (never bullets); with parent_id,
+    the bullets of that skill, experience or project come back as strings.
+    """
+    if section not in suggestions.SECTIONS:
+        raise HTTPException(status_code=400, detail="Unknown section")
+    if parent_id is not None and section not in suggestions.BULLET_SECTIONS:
+        raise HTTPException(status_code=400, detail="This section has no bullets")
+
+    index = suggestions.get_user_index(conn, user["id"])
+    return index.search(section, q, limit, parent_id=parent_id)
@@ -1,44 +1,72 @@
 """Summaries CRUD routes."""
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from app.models import SummaryModel
 from app.auth import get_current_user
+from app.conditional import section_etag
+from app import listing
+from app.responses import json_response
 from app import database as db
 
 
 router = APIRouter(prefix="/api", tags=["summaries"])
 
 
-@router.get("/summaries")
-def get_summaries(q: Optional[str] = None, user: dict = Depends(get_current_user)):
-    """Get all summaries for the current user."""
-    with db.get_db() as conn:
-        summaries = db.get_summaries(conn, user["id"], query=q)
-    return [s["text"] for s in summaries]
+# Fields of a summary in summaries_with_ids responses
+SUMMARY_FIELDS = ("id", "text")
 
 
-@router.get("/summaries_with_ids")
-def get_summaries_with_ids(user: dict = Depends(get_current_user)):
-    """Get all summaries with IDs for the current user."""
-    with db.get_db() as conn:
-        summaries = db.get_summaries(conn, user["id"])
-    return [{"id": s["id"], "text": s["text"]} for s in summaries]
+@router.get("/summaries", dependencies=[Depends(section_etag("summaries"))])
+def get_summaries(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Get the current user's summary texts, newest first (see app.listing for paging)."""
+    summaries = db.get_summaries(
+        conn, user["id"], query=q, limit=listing.fetch_limit(limit), after=after, columns=SUMMARY_FIELDS
+    )
+    summaries = listing.paginate(request, response, summaries, limit)
+    return json_response([s["text"] for s in summaries], response)
+
+
+@router.get("/summaries_with_ids", dependencies=[Depends(section_etag("summaries"))])
+def get_summaries_with_ids(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = listing.LIMIT_QUERY,
+    after: Optional[int] = listing.AFTER_QUERY,
+    fields: Optional[str] = listing.FIELDS_QUERY,
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
+):
+    """Get the current user's summaries with IDs, newest first (see app.listing for paging)."""
+    wanted = listing.parse_fields(fields, SUMMARY_FIELDS)
+    summaries = db.get_summaries(
+        conn, user["id"], limit=listing.fetch_limit(limit), after=after, columns=wanted or SUMMARY_FIELDS
+    )
+    summaries = listing.paginate(request, response, summaries, limit)
+    return json_response(summaries, response)
 
 
 @router.post("/summaries", status_code=status.HTTP_201_CREATED)
 def create_summary(
     summary_data: SummaryModel,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Create a new summary."""
-    with db.get_db() as conn:
-        existing = db.get_summary_by_text(conn, summary_data.text, user["id"])
-        if existing:
-            raise HTTPException(status_code=409, detail="Summary already exists.")
+    existing = db.get_summary_by_text(conn, summary_data.text, user["id"])
+    if existing:
+        raise HTTPException(status_code=409, detail="Summary already exists.")
 
-        summary_id = db.create_summary(conn, summary_data.text, user["id"])
+    summary_id = db.create_summary(conn, summary_data.text, user["id"])
     
     return {"id": summary_id, "text": summary_data.text}
 
@@ -47,15 +75,15 @@ def create_summary(
 def update_summary(
     summary_id: int,
     summary_data: SummaryModel,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Update a summary."""
-    with db.get_db() as conn:
-        existing = db.get_summary_by_id(conn, summary_id, user["id"])
-        if not existing:
-            raise HTTPException(status_code=404, detail="Summary not found")
+    existing = db.get_summary_by_id(conn, summary_id, user["id"])
+    if not existing:
+        raise HTTPException(status_code=404, detail="Summary not found")
 
-        db.update_summary(conn, summary_id, summary_data.text)
+    db.update_summary(conn, summary_id, user["id"], summary_data.text)
     
     return {"id": summary_id, "text": summary_data.text}
 
@@ -63,13 +91,13 @@ def update_summary(
 @router.delete("/summaries/{summary_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_summary(
     summary_id: int,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    conn: db.LazyConnection = Depends(db.get_request_db)
 ):
     """Delete a summary."""
-    with db.get_db() as conn:
-        existing = db.get_summary_by_id(conn, summary_id, user["id"])
-        if not existing:
-            raise HTTPException(status_code=404, detail="Summary not found")
+    existing = db.get_summary_by_id(conn, summary_id, user["id"])
+    if not existing:
+        raise HTTPException(status_code=404, detail="Summary not found")
 
-        db.delete_summary(conn, summary_id)
+    db.delete_summary(conn, summary_id, user["id"])
     return
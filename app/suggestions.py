@@ -0,0 +1,168 @@
+"""
+Per-user autocomplete indexes over section names and bullets.
+
+Each index is built lazily from a handful of queries the first time a user
+asks for suggestions, then answers every keystroke from memory with a
+prefix scan (short queries) or a trigram lookup (longer ones). Writes
+through app.database drop the user's index so the next lookup rebuilds it.
+"""
+import threading
+
+from app.config import settings
+from app import database as db
+from app.cache import TTLCache
+
+
+# Section -> (field matched against, extra fields returned with each suggestion)
+SECTIONS = {
+    "skills": ("skill_name", ()),
+    "experiences": ("experience_name", ("start_year", "end_year", "ongoing")),
+    "projects": ("project_name", ("github_link",)),
+    "educations": ("education_name", ("institution",)),
+    "summaries": ("text", ()),
+}
+
+# Sections whose bullets can be suggested, keyed by the bullet table
+BULLET_SECTIONS = {
+    "skills": "skill_bullets",
+    "experiences": "experience_bullets",
+    "projects": "project_bullets",
+}
+
+MAX_LIMIT = 50
+
+# Smaller indexes (e.g. one item's bullets) are scanned instead of trigram-indexed
+TRIGRAM_MIN_ENTRIES = 64
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SectionIndex:
+    """Searchable list of suggestions for one section (or one item's bullets)."""
+
+    __slots__ = ("_keys", "_payloads", "_postings")
+
+    def __init__(self, entries: list[tuple[str, object]]):
+        """entries are (text, payload) pairs in display order."""
+        self._keys = [text.casefold() for text, _ in entries]
+        self._payloads = [payload for _, payload in entries]
+        self._postings: dict[str, list[int]] | None = None
+
+    def _build_postings(self) -> dict[str, list[int]]:
+        postings: dict[str, list[int]] = {}
+        for position, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                postings.setdefault(trigram, []).append(position)
+        return postings
+
+    def _candidates(self, query: str):
+        if len(query) < 3 or len(self._keys) < TRIGRAM_MIN_ENTRIES:
+            return range(len(self._keys))
+        if self._postings is None:
+            self._postings = self._build_postings()
+        postings = sorted(
+            (self._postings.get(trigram, ()) for trigram in _trigrams(query)),
+            key=len
+        )
+        candidates = set(postings[0])
+        for positions in postings[1:]:
+            candidates.intersection_update(positions)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(self, query: str, limit: int) -> list:
+        """Return up to limit payloads matching query; prefix matches rank first."""
+        query = query.strip().casefold()
+        if not query:
+            return self._payloads[:limit]
+
+        prefix, word_prefix, substring = [], [], []
+        for position in self._candidates(query):
+            key = self._keys[position]
+            if key.startswith(query):
+                prefix.append(position)
+            elif f" {query}" in key:
+                word_prefix.append(position)
+            elif query in key:
+                substring.append(position)
+            else:
+                continue
+            if len(prefix) >= limit:
+                break
+        ranked = (prefix + word_prefix + substring)[:limit]
+        return [self._payloads[position] for position in ranked]
+
+
+class UserIndex:
+    """All suggestion indexes for one user."""
+
+    def __init__(self, rows: dict[str, list[db.Record]], bullet_rows: dict[str, list[db.Record]]):
+        self.sections: dict = {}
+        for section, (field, extras) in SECTIONS.items():
+            entries = []
+            for row in rows[section]:
+                payload = {"id": row["id"], field: row[field]}
+                for extra in extras:
+                    payload[extra] = row[extra]
+                entries.append((row[field] or "", payload))
+            self.sections[section] = SectionIndex(entries)
+
+        for section, table in BULLET_SECTIONS.items():
+            by_parent: dict[int, list] = {}
+            for row in bullet_rows[table]:
+                by_parent.setdefault(row["parent_id"], []).append((row["text"], row["text"]))
+            for parent_id, entries in by_parent.items():
+                self.sections[(section, parent_id)] = SectionIndex(entries)
+
+    def search(self, section: str, query: str, limit: int, parent_id: int | None = None) -> list:
+        """Search a section, or the bullets of one of its items when parent_id is set."""
+        key = section if parent_id is None else (section, parent_id)
+        index = self.sections.get(key)
+        return index.search(query, limit) if index is not None else []
+
+
+_indexes = TTLCache(
+    maxsize=settings.SUGGESTION_INDEX_MAX_USERS,
+    ttl=settings.SUGGESTION_INDEX_TTL_SECONDS,
+    name="suggestion_index"
+)
+# Bumped on every invalidation so a build that raced with a write is not
+# cached. Bounded like the indexes: a generation only has to outlive the
+# builds started before it, and an index cached by a lost race expires anyway.
+_generations = TTLCache(
+    maxsize=settings.SUGGESTION_INDEX_MAX_USERS,
+    ttl=settings.SUGGESTION_INDEX_TTL_SECONDS
+)
+_generations_lock = threading.Lock()
+
+
+def invalidate(user_id: int, section: str = None) -> None:
+    """Drop a user's index after their data changed."""
+    if section == "profile":
+        return
+    with _generations_lock:
+        _generations.set(user_id, _generations.get(user_id, 0) + 1)
+        _indexes.pop(user_id)
+
+
+db.on_user_data_change(invalidate)
+
+
+def get_user_index(conn, user_id: int) -> UserIndex:
+    """Return the user's index, building it if missing or expired."""
+    index = _indexes.get(user_id)
+    if index is not None:
+        return index
+
+    generation = _generations.get(user_id, 0)
+    index = UserIndex(
+        db.get_suggestion_rows(conn, user_id),
+        db.get_suggestion_bullet_rows(conn, user_id)
+    )
+    with _generations_lock:
+        if _generations.get(user_id, 0) == generation:
+            _indexes.set(user_id, index)
+    return index
@@ -0,0 +1,67 @@
+"""
+Per-request stage timing.
+
+A Timer records how long each named stage of a request takes:
+
+    timer = Timer()
+    with timer.span("render"):
+        ...
+    response.headers["Server-Timing"] = timer.server_timing()
+
+The same numbers feed a structured log line (log_line) and a labeled
+histogram (observe), so a slow request can be read from its response
+headers, found in the logs and compared against the aggregate.
+"""
+import json
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.metrics import Family
+
+
+class Timer:
+    """Durations of the named stages of one request, in the order they ran."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stopped: float | None = None
+        self.stages: dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the block as stage name; a stage that runs twice adds up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def stop(self) -> None:
+        """Fix the total, so the header, log line and histogram all report the same one."""
+        self.stopped = time.perf_counter()
+
+    def total(self) -> float:
+        """Seconds from start to stop (or to now, before stop)."""
+        return (self.stopped or time.perf_counter()) - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: every stage and the total, in milliseconds."""
+        entries = [*self.stages.items(), ("total", self.total())]
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in entries)
+
+    def log_line(self, event: str, **fields) -> str:
+        """One JSON object with the event, fields and stage times in ms, for the request log."""
+        record = {
+            "event": event,
+            **fields,
+            "total_ms": round(self.total() * 1000, 1),
+            "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()},
+        }
+        return json.dumps(record, separators=(",", ":"))
+
+    def observe(self, histogram: Family) -> None:
+        """Add each stage, and the total as stage "total", to a histogram family labeled by stage."""
+        for name, seconds in self.stages.items():
+            histogram.labels(name).observe(seconds)
+        histogram.labels("total").observe(self.total())
@@ -0,0 +1,110 @@
+"""
+Authentication benchmark.
+
+Times decode_access_token and get_current_user with the verified-claims
+cache (auth.token_cache) and the user row cache (database.user_cache) cold
+and warm, against a migrated in-memory SQLite database. SQLite answers in
+microseconds, so --db-latency-ms adds a delay to every statement to stand
+in for the round trip to Turso:
+
+    python -m scripts.authbench [--calls 2000] [--db-latency-ms 0]
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+
+from starlette.requests import Request
+
+from app import auth
+from app import database as db
+from app import migrations
+
+
+class SlowConnection:
+    """SQLite connection that waits latency seconds before each statement."""
+
+    def __init__(self, conn, latency: float):
+        self._conn = conn
+        self.latency = latency
+
+    def execute(self, *args):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._conn.execute(*args)
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+
+def setup(latency: float) -> tuple[SlowConnection, str]:
+    """A migrated database holding one user, and an access token for that user."""
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    user_id = db.create_user(conn, "Ada Lovelace", "ada@example.com", "not-a-real-hash")
+    conn.commit()
+    user = db.get_user_by_id(conn, user_id)
+    return SlowConnection(conn, latency), auth.create_user_access_token(user)
+
+
+def request_with(token: str) -> Request:
+    """A fresh request carrying the access token cookie, as each API call does."""
+    return Request({"type": "http", "headers": [(b"cookie", f"access_token={token}".encode())]})
+
+
+def timeit(func, calls: int, before=None) -> float:
+    """Median time of func in microseconds; before() runs untimed ahead of each call."""
+    times = []
+    for _ in range(calls):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1_000_000
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                        help="Delay added to every statement")
+    args = parser.parse_args(argv)
+
+    conn, token = setup(args.db_latency_ms / 1000)
+
+    def cold_tokens():
+        auth.token_cache.clear()
+
+    def cold_users():
+        db.user_cache.clear()
+
+    def cold_both():
+        auth.token_cache.clear()
+        db.user_cache.clear()
+
+    def decode():
+        auth.decode_access_token(token)
+
+    def current_user():
+        auth.get_current_user(request_with(token), conn)
+
+    cases = [
+        ("decode_access_token", "cold", "-", decode, cold_tokens),
+        ("decode_access_token", "warm", "-", decode, None),
+        ("get_current_user", "cold", "cold", current_user, cold_both),
+        ("get_current_user", "warm", "cold", current_user, cold_users),
+        ("get_current_user", "cold", "warm", current_user, cold_tokens),
+        ("get_current_user", "warm", "warm", current_user, None),
+    ]
+    print(f"{args.calls} calls per case, {args.db_latency_ms:g} ms per statement")
+    print(f"{'function':<22}{'tokens':>8}{'users':>8}{'median us':>12}")
+    for name, tokens, users, func, before in cases:
+        func()
+        print(f"{name:<22}{tokens:>8}{users:>8}{timeit(func, args.calls, before):>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
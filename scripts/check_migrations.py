@@ -0,0 +1,30 @@
+"""
+Migration and query plan check.
+
+Migrates a scratch SQLite database, checks that running the migrations
+again is a no-op, and verifies that the queries in app.migrations.QUERY_PLANS
+use their indexes:
+
+    python -m scripts.check_migrations
+"""
+import sqlite3
+import sys
+
+from app.migrations import QUERY_PLANS, check_query_plans, migrate, schema_version
+
+
+def main() -> int:
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    if migrate(conn):
+        print("migrations re-applied on an up-to-date database", file=sys.stderr)
+        return 1
+    problems = check_query_plans(conn)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    print(f"schema version {schema_version(conn)}, {len(QUERY_PLANS) - len(problems)}/{len(QUERY_PLANS)} query plans ok")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
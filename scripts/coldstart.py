@@ -0,0 +1,75 @@
+"""
+Cold-start import check.
+
+Imports the app in a fresh interpreter with `-X importtime`, prints the
+slowest imports and fails when a module that should load lazily was pulled
+in at startup, or when the total exceeds --budget-ms:
+
+    python -m scripts.coldstart [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+ENTRY_MODULE = "api.index"
+
+# Heavy packages that must only be imported by the code paths that use them
+DEFERRED_MODULES = ("xhtml2pdf", "reportlab", "PIL", "anthropic", "instructor")
+
+# Import time the tests allow for ENTRY_MODULE
+BUDGET_MS = 1500
+
+
+def measure(entry_module: str = ENTRY_MODULE) -> tuple[dict[str, int], list[str]]:
+    """Import entry_module in a subprocess; return ({module: cumulative us}, loaded modules)."""
+    code = f"import sys, {entry_module}; print('\\n'.join(sys.modules))"
+    env = dict(os.environ, SECRET_KEY=os.environ.get("SECRET_KEY") or "coldstart-check")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings, result.stdout.split()
+
+
+def eager_imports(loaded: list[str]) -> list[str]:
+    """The DEFERRED_MODULES packages among loaded modules."""
+    return sorted({
+        module.split(".")[0] for module in loaded
+        if module.split(".")[0] in DEFERRED_MODULES
+    })
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    timings, loaded = measure()
+    total_ms = timings.get(ENTRY_MODULE, 0) / 1000
+    for name, cumulative in sorted(timings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{cumulative / 1000:9.1f} ms  {name}")
+    print(f"import {ENTRY_MODULE}: {total_ms:.1f} ms")
+
+    failed = False
+    eager = eager_imports(loaded)
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Response compression benchmark.
+
+Sends the largest API payloads (the synthetic ones from scripts.jsonbench),
+the /generate-pdf HTML fallback, a manage page and the built JS bundles
+through app.compression.CompressionMiddleware with each Accept-Encoding,
+and reports bytes on the wire, the time spent compressing and the time to
+send the body over a link of --mbps:
+
+    python -m scripts.compressbench [--items 60] [--rounds 20] [--mbps 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from app import compression, responses
+from app.assets import DIST_DIR, MANIFEST_PATH
+from scripts.jsonbench import build_payloads
+
+
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def build_bodies(items: int) -> dict[str, tuple[str, bytes]]:
+    """Response bodies by name, as (content type, bytes)."""
+    payloads = build_payloads(items)
+    html = payloads.pop("generate-pdf html")["html"]
+    bodies = {
+        name: ("application/json", responses.json_response(content).body)
+        for name, content in payloads.items()
+    }
+    bodies["generate-pdf html"] = ("text/html", html.encode())
+    with open(os.path.join("frontend", "manage_skills.html"), "rb") as f:
+        bodies["manage_skills.html"] = ("text/html", f.read())
+    with open(MANIFEST_PATH) as f:
+        manifest = json.load(f)
+    for source, built in sorted(manifest.items()):
+        if source.endswith(".js"):
+            with open(os.path.join(os.path.dirname(DIST_DIR), built), "rb") as f:
+                bodies[os.path.basename(source)] = ("application/javascript", f.read())
+    return bodies
+
+
+def _app(content_type: str, body: bytes):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type.encode()),
+                        (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def serve(middleware, encoding: str) -> bytes:
+    """The body the middleware sends for a request accepting encoding."""
+    scope = {"type": "http", "method": "GET", "path": "/",
+             "headers": [(b"accept-encoding", encoding.encode())]}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(message.get("body", b""))
+
+    await middleware(scope, receive, send)
+    return b"".join(sent)
+
+
+def measure(content_type: str, body: bytes, encoding: str, rounds: int) -> tuple[int, float]:
+    """Bytes on the wire and best time in ms to produce them."""
+    middleware = compression.CompressionMiddleware(_app(content_type, body))
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        wire = asyncio.run(serve(middleware, encoding))
+        best = min(best, time.perf_counter() - start)
+    return len(wire), best * 1000
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=60, help="Rows per section")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mbps", type=float, default=10.0, help="Link speed for the transfer time")
+    args = parser.parse_args(argv)
+
+    available = compression.supported_encodings()
+    encodings = [encoding for encoding in ENCODINGS if encoding == "identity" or encoding in available]
+    if "br" not in available:
+        print("brotli is not installed: br skipped")
+    print(f"{'body':<22}{'encoding':>10}{'bytes':>10}{'ratio':>8}{'cpu ms':>9}{'send ms':>9}{'total ms':>10}")
+    for name, (content_type, body) in build_bodies(args.items).items():
+        for encoding in encodings:
+            size, ms = measure(content_type, body, encoding, args.rounds)
+            send_ms = size * 8 / (args.mbps * 1_000_000) * 1000
+            print(f"{name:<22}{encoding:>10}{size:>10}{len(body) / size:>7.1f}x"
+                  f"{ms:>9.2f}{send_ms:>9.2f}{ms + send_ms:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
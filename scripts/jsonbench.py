@@ -0,0 +1,111 @@
+"""
+JSON response serialization benchmark.
+
+Times the largest API payloads (bootstrap, a full skills list, a change
+feed snapshot and the /generate-pdf HTML fallback) through the old path
+(per-row dict copy, jsonable_encoder, JSONResponse) and through
+app.responses, on synthetic data:
+
+    python -m scripts.jsonbench [--items 200] [--rounds 50]
+"""
+import argparse
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import responses
+
+
+def _bullets(count: int) -> list[str]:
+    return [f"Delivered outcome #{n} — cut p95 latency by {n * 3}% for café résumé exports" for n in range(count)]
+
+
+def build_payloads(items: int) -> dict[str, object]:
+    """Synthetic payloads shaped like the real responses, items rows per section."""
+    skills = [
+        {"id": i, "skill_name": f"Skill {i}", "bullet_points": _bullets(4)}
+        for i in range(items, 0, -1)
+    ]
+    experiences = [
+        {"id": i, "experience_name": f"Engineer at Company {i}", "start_year": 2010 + i % 10,
+         "end_year": 2012 + i % 10, "bullet_points": _bullets(5)}
+        for i in range(items, 0, -1)
+    ]
+    educations = [
+        {"id": i, "education_name": f"BSc {i}", "institution": f"University {i}",
+         "start": "2008", "end": "2012", "grade": "3.9"}
+        for i in range(items, 0, -1)
+    ]
+    sections = {
+        "summaries": [{"id": i, "text": " ".join(_bullets(2))} for i in range(items, 0, -1)],
+        "skills": skills,
+        "experiences": experiences,
+        "projects": [
+            {"id": i, "project_name": f"Project {i}", "github_link": f"https://github.com/u/p{i}",
+             "bullet_points": _bullets(3)}
+            for i in range(items, 0, -1)
+        ],
+        "educations": educations,
+        "references": [],
+    }
+    html = "<section>" + "".join(
+        f"<li class=\"bullet\">{bullet}</li>" for bullet in _bullets(items * 5)
+    ) + "</section>"
+    return {
+        "bootstrap": {"profile": {"name": "Ada Lovelace"}, "sections": sections,
+                      "templates": ["classic.html", "modern.html"], "features": {"llm": True}},
+        "skills list": skills,
+        "changes reset": {"user_id": 1, "cursor": items, "reset": True, "more": False,
+                          "changes": {section: {"upserted": rows, "deleted": []}
+                                      for section, rows in sections.items()}},
+        "generate-pdf html": {"html": html, "filename": "resume.pdf", "fallback": True},
+    }
+
+
+def _copy_rows(content):
+    """What list routes used to do: rebuild every row dict before returning it."""
+    if isinstance(content, list):
+        return [dict(row) if isinstance(row, dict) else row for row in content]
+    if isinstance(content, dict):
+        return {key: _copy_rows(value) for key, value in content.items()}
+    return content
+
+
+def old_path(content) -> bytes:
+    return JSONResponse(jsonable_encoder(_copy_rows(content))).body
+
+
+def new_path(content) -> bytes:
+    return responses.json_response(content).body
+
+
+def timeit(func, content, rounds: int) -> float:
+    """Best per-call time in ms over rounds calls."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200, help="Rows per section")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"serializer: {'orjson' if responses.orjson is not None else 'json (stdlib)'}")
+    print(f"{'payload':<20}{'size':>10}{'old ms':>10}{'new ms':>10}{'speedup':>9}")
+    for name, content in build_payloads(args.items).items():
+        old_ms = timeit(old_path, content, args.rounds)
+        new_ms = timeit(new_path, content, args.rounds)
+        size = len(new_path(content))
+        print(f"{name:<20}{size / 1024:>8.0f}KB{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
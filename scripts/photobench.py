@@ -0,0 +1,126 @@
+"""
+Photo decoding benchmark.
+
+Builds synthetic JPEG and PNG uploads from 1 to 48 megapixels and runs each
+through app.photos.make_renditions and through a full-resolution decode (the
+previous pipeline), each in a fresh process so peak memory is its own.
+Prints wall time, per-stage times and peak RSS growth:
+
+    python -m scripts.photobench [--sizes 1,4,12,24,48] [--png-sizes 1,4,12]
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def make_upload(megapixels: float, fmt: str) -> bytes:
+    """A 4:3 photo-like image (smooth noise) of about the given size."""
+    from PIL import Image, ImageFilter
+
+    height = int((megapixels * 1_000_000 * 3 / 4) ** 0.5)
+    width = height * 4 // 3
+    # Noise at 1/4 scale, blurred and upscaled: compresses like a photo
+    small = Image.effect_noise((width // 4, height // 4), 64).filter(ImageFilter.GaussianBlur(1))
+    image = Image.merge("RGB", (small, small.rotate(180), small.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    image = image.resize((width, height))
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def _full_decode(data: bytes) -> dict:
+    """The previous pipeline: decode at full resolution, then downsize."""
+    from PIL import Image, ImageOps
+    from app.photos import RENDITIONS
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image.load()
+    image = image.convert("RGB")
+    renditions = {}
+    for name, width in RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((width, width * 2), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format="JPEG", quality=85, optimize=True)
+        renditions[name] = buffer.getvalue()
+    return renditions
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss of an exec'd child starts at the parent's peak; VmHWM does not
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_one(path: str, pipeline: str) -> dict:
+    """Measure one pipeline on one upload (runs in the child process)."""
+    from PIL import Image
+    from app import photos
+
+    # Load the format plugins first: a worker pays that once, not per upload
+    Image.init()
+    with open(path, "rb") as f:
+        data = f.read()
+    baseline = _peak_rss_kb()
+    stages = {}
+    start = time.perf_counter()
+    if pipeline == "bounded":
+        photos.make_renditions(data, stages)
+    else:
+        _full_decode(data)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = _peak_rss_kb() - baseline
+    return {"ms": elapsed, "peak_kb": peak, "stages": stages}
+
+
+def measure(path: str, pipeline: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.photobench", "--child", path, pipeline],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,4,12,24,48", help="JPEG megapixels")
+    parser.add_argument("--png-sizes", default="1,4,12", help="PNG megapixels")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run_one(*args.child)))
+        return 0
+
+    cases = [("JPEG", float(mp)) for mp in args.sizes.split(",") if mp]
+    cases += [("PNG", float(mp)) for mp in args.png_sizes.split(",") if mp]
+    print(f"{'input':<14}{'bytes':>10}{'full ms':>10}{'full MB':>9}"
+          f"{'bounded ms':>12}{'bounded MB':>12}  stages")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, megapixels in cases:
+            path = os.path.join(tmp, f"{megapixels:g}.{fmt.lower()}")
+            with open(path, "wb") as f:
+                f.write(make_upload(megapixels, fmt))
+            full = measure(path, "full")
+            bounded = measure(path, "bounded")
+            stages = " ".join(f"{stage}={ms:.0f}" for stage, ms in bounded["stages"].items())
+            print(f"{fmt + ' ' + format(megapixels, 'g') + ' MP':<14}{os.path.getsize(path):>10}"
+                  f"{full['ms']:>10.0f}{full['peak_kb'] / 1024:>9.0f}"
+                  f"{bounded['ms']:>12.0f}{bounded['peak_kb'] / 1024:>12.0f}  {stages}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Row representation benchmark.
+
+Fetches a synthetic result set from an in-memory SQLite table (same DB-API
+cursor shape as Turso) and compares the old per-row dicts, which rebuilt
+the column list for every row, with fetch_all()'s Records and
+fetch_dicts(). Reports the best build time from already fetched rows, and
+the memory a result retains once fetched from SQLite and converted. That
+includes the row tuples Records keep alive, which the dict forms release:
+
+    python -m scripts.rowbench [--rows 10000] [--rounds 20]
+"""
+import argparse
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from app import database as db
+
+
+COLUMNS = ("id", "experience_name", "start_year", "end_year", "ongoing", "user")
+
+
+def _legacy_fetch_all(conn, query: str, params: tuple = ()) -> list[dict]:
+    """The helper fetch_all() replaced: column names rebuilt for every row."""
+    cursor = conn.execute(query, params)
+    rows = cursor.fetchall()
+    return [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
+
+
+class _FetchedCursor:
+    """Replays fetched rows so only row building is timed, not SQLite."""
+
+    def __init__(self, description, rows):
+        self.description = description
+        self._rows = rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FetchedConnection:
+    def __init__(self, cursor: _FetchedCursor):
+        self._cursor = cursor
+
+    def execute(self, query: str, params: tuple = ()):
+        return self._cursor
+
+
+QUERY = "SELECT * FROM experiences ORDER BY id DESC"
+
+
+def load(rows: int) -> tuple[sqlite3.Connection, _FetchedConnection]:
+    """A SQLite connection holding the table, and a replay of its fetched rows."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE experiences ({', '.join(COLUMNS)})")
+    conn.executemany(
+        "INSERT INTO experiences VALUES (?, ?, ?, ?, ?, ?)",
+        ((i, f"Engineer at Company {i}", "2019", "2021", 0, 1) for i in range(rows))
+    )
+    cursor = conn.execute(QUERY)
+    return conn, _FetchedConnection(_FetchedCursor(cursor.description, cursor.fetchall()))
+
+
+def build_time(fetch, replay: _FetchedConnection, rounds: int) -> float:
+    """Best time in ms to build a result from already fetched rows."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fetch(replay, QUERY)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def retained(fetch, conn: sqlite3.Connection) -> int:
+    """Bytes still allocated by fetching and converting one result while it is kept."""
+    # Warm the statement cache and the Record class, so only the result is counted
+    fetch(conn, QUERY)
+    gc.collect()
+    tracemalloc.start()
+    result = fetch(conn, QUERY)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    conn, replay = load(args.rows)
+    print(f"{args.rows} rows x {len(COLUMNS)} columns")
+    print(f"{'representation':<22}{'ms':>8}{'KB held':>10}")
+    for name, fetch in (
+        ("dict per row (old)", _legacy_fetch_all),
+        ("fetch_dicts", db.fetch_dicts),
+        ("fetch_all Records", db.fetch_all),
+    ):
+        ms = build_time(fetch, replay, args.rounds)
+        print(f"{name:<22}{ms:>8.2f}{retained(fetch, conn) / 1024:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
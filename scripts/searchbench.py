@@ -0,0 +1,111 @@
+"""
+Profile search benchmark.
+
+Seeds a temporary SQLite database, migrated up to --schema (migration 2
+adds the FTS5 search index), with --users users of 100 skills, 20 bullets
+per skill and 100 summaries each, all random words. Then it times
+db.search_profile and the FTS-filtered skills list against the
+leading-wildcard LIKE queries they replaced, for one user and one term:
+
+    python -m scripts.searchbench [--users 50] [--calls 200] [--schema 2]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+from app import database as db
+from app import migrations
+
+
+SKILLS_PER_USER = 100
+BULLETS_PER_SKILL = 20
+
+# What a search across skills, their bullets and summaries cost before FTS5
+LIKE_SEARCH_SQL = """
+    SELECT b.id FROM skill_bullets b JOIN skills s ON s.id = b.skill
+    WHERE s.user = ? AND b.text LIKE ?
+    UNION ALL SELECT id FROM skills WHERE user = ? AND skill_name LIKE ?
+    UNION ALL SELECT id FROM summaries WHERE user = ? AND text LIKE ?
+"""
+# The filter get_skills(query=...) ran before FTS5
+LIKE_SKILLS_SQL = "SELECT * FROM skills WHERE user = ? AND skill_name LIKE ? ORDER BY id DESC"
+
+
+def seed(conn, users: int, rng: random.Random) -> list[str]:
+    """Fill the database with random profiles; returns the vocabulary used."""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(5000)]
+    for user in range(1, users + 1):
+        user_id = db.create_user(conn, f"User {user}", f"user{user}@example.com", "not-a-real-hash")
+        for number in range(SKILLS_PER_USER):
+            skill_id = conn.execute(
+                "INSERT INTO skills (skill_name, user) VALUES (?, ?)",
+                (f"{' '.join(rng.choices(words, k=3))} {number}", user_id)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO skill_bullets (text, skill) VALUES (?, ?)",
+                ((" ".join(rng.choices(words, k=12)), skill_id) for _ in range(BULLETS_PER_SKILL))
+            )
+            conn.execute(
+                "INSERT INTO summaries (text, user) VALUES (?, ?)",
+                (" ".join(rng.choices(words, k=30)), user_id)
+            )
+    conn.commit()
+    return words
+
+
+def timeit(func, calls: int) -> tuple[float, int]:
+    """Median time of func in ms, and the number of rows it returned."""
+    rows = func()
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, len(rows)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--schema", type=int, default=2, help="Apply migrations up to this version")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "searchbench.db"))
+        for version, _, apply in migrations.MIGRATIONS:
+            if version <= args.schema:
+                apply(conn)
+        words = seed(conn, args.users, random.Random(args.seed))
+        user_id = args.users // 2 or 1
+        term = words[42][:5]
+        pattern = f"%{term}%"
+
+        bullets = args.users * SKILLS_PER_USER * BULLETS_PER_SKILL
+        print(f"schema {args.schema}, {args.users} users, {bullets} bullets; user {user_id}, term {term!r}")
+        print(f"{'query':<34}{'median ms':>11}{'rows':>7}")
+        for name, func in (
+            ("LIKE skills+bullets+summaries",
+             lambda: conn.execute(LIKE_SEARCH_SQL, (user_id, pattern) * 3).fetchall()),
+            ("db.search_profile (FTS5)",
+             lambda: db.search_profile(conn, user_id, term, limit=1000)),
+            ("LIKE skills list filter",
+             lambda: conn.execute(LIKE_SKILLS_SQL, (user_id, pattern)).fetchall()),
+            ("db.get_skills(query=) (FTS5)",
+             lambda: db.get_skills(conn, user_id, query=term, bullets=False)),
+        ):
+            ms, rows = timeit(func, args.calls)
+            print(f"{name:<34}{ms:>11.3f}{rows:>7}")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,896 @@
+let approvedMissingSkills = [];
+function setLoading(isLoading) {
+const overlay = document.getElementById('loading-overlay');
+if (isLoading) overlay.classList.add('active');
+else overlay.classList.remove('active');
+}
+function renderMissingSkillsList(skills) {
+const list = document.getElementById('missing-skills-list');
+list.innerHTML = '';
+(skills || []).forEach(skill => {
+const safeSkill = (skill || '').trim();
+if (!safeSkill) return;
+const row = document.createElement('div');
+row.className = 'missing-skill-item';
+row.innerHTML = `
+      <label class="missing-skill-label">
+        <input class="missing-skill-checkbox" type="checkbox" value="${safeSkill}" />
+        <span class="missing-skill-text">${safeSkill}</span>
+      </label>
+    `;
+list.appendChild(row);
+});
+}
+async function findMissingSkills() {
+setLoading(true);
+try {
+const form = document.getElementById('resume-form');
+const jobDescription = form.job_description.value.trim();
+if (!jobDescription) {
+alert('Please paste a job description first.');
+return;
+}
+const res = await fetch('/api/ats-gaps', {
+method: 'POST',
+headers: { 'Content-Type': 'application/json' },
+body: JSON.stringify({ job_description: jobDescription })
+});
+if (!res.ok) {
+alert('Failed to fetch missing skills.');
+console.error(await res.text());
+return;
+}
+const data = await res.json();
+renderMissingSkillsList(data.missing_skills || []);
+} finally {
+setLoading(false);
+}
+}
+function approveMissingSkills() {
+const list = document.getElementById('missing-skills-list');
+const checked = list.querySelectorAll('input[type="checkbox"]:checked');
+approvedMissingSkills = Array.from(checked).map(cb => cb.value);
+alert(`Approved ${approvedMissingSkills.length} skill(s).`);
+}
+async function approveMissingSkillsAndOptimize() {
+approveMissingSkills();
+await optimizeATS();
+}
+async function optimizeATS() {
+setLoading(true);
+try {
+const form = document.getElementById('resume-form');
+const jobDescription = form.job_description.value.trim();
+if (!jobDescription) {
+alert('Please paste a job description first.');
+return;
+}
+const res = await fetch('/api/ats-optimize', {
+method: 'POST',
+headers: { 'Content-Type': 'application/json' },
+body: JSON.stringify({
+job_description: jobDescription,
+selected_missing_skills: approvedMissingSkills
+})
+});
+if (!res.ok) {
+alert('Failed to optimize. Check console for details.');
+console.error(await res.text());
+return;
+}
+const data = await res.json();
+applyATSData(data);
+} finally {
+setLoading(false);
+}
+}
+function addCustomMissingSkill() {
+const input = document.getElementById('missing-skill-input');
+const value = input.value.trim();
+if (!value) return;
+const list = document.getElementById('missing-skills-list');
+const row = document.createElement('div');
+row.className = 'missing-skill-item';
+row.innerHTML = `
+    <label class="missing-skill-label">
+      <input class="missing-skill-checkbox" type="checkbox" value="${value}" checked />
+      <span class="missing-skill-text">${value}</span>
+    </label>
+  `;
+list.appendChild(row);
+input.value = '';
+}
+let bootstrapData = null;
+async function loadBootstrap() {
+try {
+const res = await fetch('/api/bootstrap');
+if (!res.ok) {
+if (res.status === 401) ProfileSync.clear().finally(() => { window.location.href = '/login'; });
+return;
+}
+bootstrapData = await res.json();
+renderTemplates(bootstrapData.templates);
+renderProfile(bootstrapData.profile);
+renderEducations(bootstrapData.sections.educations);
+applyFeatures(bootstrapData.features);
+} catch (err) {
+console.error('Failed to load page data', err);
+}
+}
+function renderProfile(profile) {
+if (!profile) return;
+const form = document.getElementById('resume-form');
+form.name.value = profile.name || '';
+form.email.value = profile.email || '';
+form.phone.value = profile.phone || '';
+form.location.value = profile.location || '';
+form.linkedin.value = profile.linkedin || '';
+form.github.value = profile.github || '';
+form.website.value = profile.website || '';
+}
+function renderEducations(educations) {
+document.getElementById('education-section').innerHTML = '';
+eduCount = 0;
+(educations || []).forEach(addEducation);
+}
+function applyFeatures(features) {
+if (features.llm) return;
+document.querySelectorAll('[data-requires-llm]').forEach(button => {
+button.disabled = true;
+button.title = 'Requires an LLM API configuration on the server';
+});
+}
+function logout() {
+fetch('/api/logout')
+.then(() => ProfileSync.clear())
+.then(() => {
+window.location.href = '/login';
+})
+.catch(err => {
+console.error('Logout failed', err);
+});
+}
+function createTextInput(name, placeholder, value = "", type = "text", oninputAction = "") {
+return `<input type="${type}" name="${name}" placeholder="${placeholder}" value="${value}" oninput="${oninputAction}" onkeydown="handleKeydown(event, '${name}')" onfocus="${oninputAction}">`;
+}
+function createTextareaInput(name, placeholder, value = "", oninputAction = "") {
+return `<textarea name="${name}" placeholder="${placeholder}" oninput="${oninputAction}" onkeydown="handleKeydown(event, '${name}')" onfocus="${oninputAction}">${value}</textarea>`;
+}
+function createBulletPointInput(namePrefix, idx, pointIdx, value = "") {
+const oninputAction = `handleBulletAutocomplete(event)`;
+const onfocusAction = `handleBulletAutocomplete(event)`;
+return `<div class="bullet-point-input" draggable="true" ondragstart="handleBulletDragStart(event)" ondragend="handleBulletDragEnd(event)" ondragover="handleBulletDragOver(event)" ondragleave="handleBulletDragLeave(event)" ondrop="handleBulletDrop(event)">
+                <span class="drag-handle" title="Drag to reorder">⋮⋮</span>
+                <textarea name="${namePrefix}-${idx}-bullet-${pointIdx}" placeholder="Bullet point" oninput="${oninputAction}" onfocus="${onfocusAction}" onkeydown="handleKeydown(event, this.name)">${value}</textarea>
+                <button type="button" class="remove-bullet-btn" onclick="this.parentElement.remove()" title="Delete bullet point"></button>
+            </div>`;
+}
+function handleBulletAutocomplete(event) {
+const textarea = event.target;
+const name = textarea.name;
+const parts = name.split('-');
+const namePrefix = parts[0];
+const idx = parts[1];
+let section;
+if (namePrefix === 'skill') {
+section = 'skills';
+} else if (namePrefix === 'exp') {
+section = 'experiences';
+} else if (namePrefix === 'proj') {
+section = 'projects';
+} else {
+return;
+}
+const id = document.querySelector(`#${namePrefix}-${idx}-id`).value;
+const debugDiv = document.getElementById('debug-info');
+console.log(`[Debug] Bullet autocomplete triggered for: ${name}`);
+if (id) {
+console.log(`[Debug] Parent ID found: ${id}. Calling setupAutocomplete for ${section} bullets`);
+debugDiv.textContent = `Triggered bullet autocomplete for: ${name}\nParent ID: ${id}\nSection: ${section}`;
+setupAutocomplete(name, section, -1, id);
+} else {
+console.log("[Debug] Parent ID not found. Skipping bullet autocomplete.");
+debugDiv.textContent = `Triggered bullet autocomplete for: ${name}\nParent ID not found. Cannot fetch suggestions.`;
+}
+}
+function addBulletPoint(sectionId, namePrefix, itemIdx) {
+const bulletContainer = document.getElementById(`${sectionId}-${itemIdx}-bullets`);
+const newBulletIdx = bulletContainer.children.length;
+bulletContainer.insertAdjacentHTML('beforeend', createBulletPointInput(namePrefix, itemIdx, newBulletIdx));
+}
+function removeItem(section, idx) {
+document.getElementById(section+'-'+idx).remove();
+}
+let skillCount = 0, expCount = 0, projCount = 0, eduCount = 0, refCount = 0;
+function addSkill(skill = {}) {
+const idx = skillCount++;
+const bulletsHtml = (skill.bullet_points || [""]).map((point, i) => createBulletPointInput('skill', idx, i, point)).join('');
+const html = `
+    <div class="item-block" id="skills-${idx}" draggable="true" ondragstart="handleItemDragStart(event)" ondragend="handleItemDragEnd(event)" ondragover="handleItemDragOver(event)" ondragleave="handleItemDragLeave(event)" ondrop="handleItemDrop(event)">
+      <span class="item-drag-handle" title="Drag to reorder">⋮⋮</span>
+      <input type="hidden" id="skill-${idx}-id" name="skill-${idx}-id">
+      <button type="button" class="remove-btn" onclick="removeItem('skills', ${idx})">Remove</button>
+      <label>Skill Name: ${createTextInput(`skill-${idx}-name`, 'e.g., Programming Languages', skill.skill_name || '', 'text', "setupAutocomplete('skill-" + idx + "-name', 'skills', " + idx + ")")}</label>
+      <div id="skill-${idx}-name-suggestions" class="autocomplete-suggestions"></div>
+      <div id="skills-${idx}-bullets">
+        ${bulletsHtml}
+      </div>
+      <button type="button" class="add-bullet-btn" onclick="addBulletPoint('skills', 'skill', ${idx})">Add Bullet Point</button>
+    </div>`;
+document.getElementById('skills-section').insertAdjacentHTML('beforeend', html);
+}
+function addExperience(exp = {}) {
+const idx = expCount++;
+const bulletsHtml = (exp.bullet_points || [""]).map((point, i) => createBulletPointInput('exp', idx, i, point)).join('');
+const html = `
+    <div class="item-block" id="experience-${idx}" draggable="true" ondragstart="handleItemDragStart(event)" ondragend="handleItemDragEnd(event)" ondragover="handleItemDragOver(event)" ondragleave="handleItemDragLeave(event)" ondrop="handleItemDrop(event)">
+      <span class="item-drag-handle" title="Drag to reorder">⋮⋮</span>
+      <input type="hidden" id="exp-${idx}-id" name="exp-${idx}-id">
+      <button type="button" class="remove-btn" onclick="removeItem('experience', ${idx})">Remove</button>
+      <label>Company/Role: ${createTextInput(`exp-${idx}-name`, 'e.g., Software Engineer at Tech Corp', exp.experience_name || '', 'text', "setupAutocomplete('exp-" + idx + "-name', 'experiences', " + idx + ")")}</label>
+      <div id="exp-${idx}-name-suggestions" class="autocomplete-suggestions"></div>
+      <label>Start Year: ${createTextInput(`exp-${idx}-start`, 'e.g., 2020', exp.start_year || '')}</label>
+      <label>End Year: ${createTextInput(`exp-${idx}-end`, 'e.g., 2022 or Present', exp.end_year || '')}</label>
+      <label>Ongoing: <input type="checkbox" name="exp-${idx}-ongoing" ${exp.ongoing ? 'checked' : ''}></label>
+      <div id="experience-${idx}-bullets">
+        ${bulletsHtml}
+      </div>
+      <button type="button" class="add-bullet-btn" onclick="addBulletPoint('experience', 'exp', ${idx})">Add Bullet Point</button>
+    </div>`;
+document.getElementById('experience-section').insertAdjacentHTML('beforeend', html);
+}
+function addProject(proj = {}) {
+const idx = projCount++;
+const bulletsHtml = (proj.bullet_points || [""]).map((point, i) => createBulletPointInput('proj', idx, i, point)).join('');
+const html = `
+    <div class="item-block" id="projects-${idx}" draggable="true" ondragstart="handleItemDragStart(event)" ondragend="handleItemDragEnd(event)" ondragover="handleItemDragOver(event)" ondragleave="handleItemDragLeave(event)" ondrop="handleItemDrop(event)">
+      <span class="item-drag-handle" title="Drag to reorder">⋮⋮</span>
+      <input type="hidden" id="proj-${idx}-id" name="proj-${idx}-id">
+      <button type="button" class="remove-btn" onclick="removeItem('projects', ${idx})">Remove</button>
+      <label>Project Name: ${createTextInput(`proj-${idx}-name`, 'e.g., Personal Portfolio Website', proj.project_name || '', 'text', "setupAutocomplete('proj-" + idx + "-name', 'projects', " + idx + ")")}</label>
+      <div id="proj-${idx}-name-suggestions" class="autocomplete-suggestions"></div>
+      <label>GitHub Link: ${createTextInput(`proj-${idx}-link`, 'e.g., github.com/user/repo', proj.github_link || '', 'url')}</label>
+      <div id="projects-${idx}-bullets">
+        ${bulletsHtml}
+      </div>
+      <button type="button" class="add-bullet-btn" onclick="addBulletPoint('projects', 'proj', ${idx})">Add Bullet Point</button>
+    </div>`;
+document.getElementById('projects-section').insertAdjacentHTML('beforeend', html);
+}
+function addEducation(edu = {}) {
+const idx = eduCount++;
+const html = `
+    <div class="item-block" id="education-${idx}" draggable="true" ondragstart="handleItemDragStart(event)" ondragend="handleItemDragEnd(event)" ondragover="handleItemDragOver(event)" ondragleave="handleItemDragLeave(event)" ondrop="handleItemDrop(event)">
+      <span class="item-drag-handle" title="Drag to reorder">⋮⋮</span>
+      <button type="button" class="remove-btn" onclick="removeItem('education', ${idx})">Remove</button>
+      <label>Degree/Certificate: ${createTextInput(`edu-${idx}-name`, 'e.g., B.S. in Computer Science', edu.education_name || '', 'text', "setupAutocomplete('edu-" + idx + "-name', 'educations', " + idx + ")")}</label>
+      <div id="edu-${idx}-name-suggestions" class="autocomplete-suggestions"></div>
+      <label>Institution: ${createTextInput(`edu-${idx}-institution`, 'e.g., University of Example', edu.institution || '')}</label>
+      <label>Start Year: ${createTextInput(`edu-${idx}-start`, 'e.g., 2018', edu.start || '')}</label>
+      <label>End Year: ${createTextInput(`edu-${idx}-end`, 'e.g., 2022 or Present', edu.end || '')}</label>
+      <label>Grade/GPA: ${createTextInput(`edu-${idx}-grade`, 'e.g., 3.8/4.0', edu.grade || '')}</label>
+    </div>`;
+document.getElementById('education-section').insertAdjacentHTML('beforeend', html);
+}
+function addReference(ref = {}) {
+const idx = refCount++;
+const html = `
+    <div class="item-block" id="references-${idx}" draggable="true" ondragstart="handleItemDragStart(event)" ondragend="handleItemDragEnd(event)" ondragover="handleItemDragOver(event)" ondragleave="handleItemDragLeave(event)" ondrop="handleItemDrop(event)">
+      <span class="item-drag-handle" title="Drag to reorder">⋮⋮</span>
+      <button type="button" class="remove-btn" onclick="removeItem('references', ${idx})">Remove</button>
+      <label>Referer Name: ${createTextInput(`ref-${idx}-name`, 'e.g., Dr. Jane Doe', ref.referer_name || '')}</label>
+      <label>Referer Institute/Company: ${createTextInput(`ref-${idx}-institute`, 'e.g., Example University', ref.referer_institute || '')}</label>
+      <label>Position: ${createTextInput(`ref-${idx}-position`, 'e.g., Professor', ref.position || '')}</label>
+      <label>Connection Type: ${createTextInput(`ref-${idx}-connection`, 'e.g., Academic Advisor', ref.connection_type || '')}</label>
+      <label>Institution/Company URL: ${createTextInput(`ref-${idx}-url`, 'e.g., example.edu', ref.institution_url || '', 'url')}</label>
+    </div>`;
+document.getElementById('references-section').insertAdjacentHTML('beforeend', html);
+}
+function getBulletPoints(sectionId, itemIdx, namePrefix) {
+const bullets = [];
+const bulletContainer = document.getElementById(`${sectionId}-${itemIdx}-bullets`);
+if (bulletContainer) {
+const textareas = bulletContainer.querySelectorAll('textarea');
+textareas.forEach(ta => {
+if (ta.value.trim() !== "") bullets.push(ta.value.trim());
+});
+}
+return bullets;
+}
+let photoUpload = null;
+function showPhotoPreview(url) {
+const preview = document.getElementById('photo-preview');
+preview.hidden = !url;
+if (url) preview.src = url;
+else preview.removeAttribute('src');
+}
+function uploadPhoto(input) {
+const file = input.files[0];
+showPhotoPreview(null);
+if (!file) {
+photoUpload = null;
+return;
+}
+const body = new FormData();
+body.append('file', file);
+photoUpload = fetch('/api/photos', { method: 'POST', body })
+.then(async res => {
+const data = await res.json();
+if (!res.ok) throw new Error(data.detail || 'Photo upload failed');
+showPhotoPreview(data.renditions.thumb.url);
+return data.id;
+})
+.catch(err => {
+input.value = null;
+alert(err.message);
+return null;
+});
+}
+async function getFormData() {
+const form = document.getElementById('resume-form');
+const contact = {
+email: form.email.value,
+phone: form.phone.value,
+location: form.location.value,
+linkedin: form.linkedin.value,
+github: form.github.value,
+website: form.website.value
+};
+const summary = form.summary.value;
+const job_description = form.job_description.value;
+const photo_id = photoUpload ? await photoUpload : null;
+const skills = [];
+for(let i=0; i<skillCount; ++i) {
+const nameEl = form[`skill-${i}-name`];
+if (nameEl) {
+skills.push({
+skill_name: nameEl.value,
+bullet_points: getBulletPoints('skills', i, 'skill')
+});
+}
+}
+const experience = [];
+for(let i=0; i<expCount; ++i) {
+const nameEl = form[`exp-${i}-name`];
+if (nameEl) {
+experience.push({
+experience_name: nameEl.value,
+start_year: form[`exp-${i}-start`].value,
+end_year: form[`exp-${i}-end`].value,
+ongoing: form[`exp-${i}-ongoing`].checked,
+bullet_points: getBulletPoints('experience', i, 'exp')
+});
+}
+}
+const projects = [];
+for(let i=0; i<projCount; ++i) {
+const nameEl = form[`proj-${i}-name`];
+if (nameEl) {
+projects.push({
+project_name: nameEl.value,
+github_link: form[`proj-${i}-link`].value,
+bullet_points: getBulletPoints('projects', i, 'proj')
+});
+}
+}
+const education = [];
+for(let i=0; i<eduCount; ++i) {
+const nameEl = form[`edu-${i}-name`];
+if (nameEl) {
+education.push({
+education_name: nameEl.value,
+institution: form[`edu-${i}-institution`].value,
+start: form[`edu-${i}-start`].value,
+end: form[`edu-${i}-end`].value,
+grade: form[`edu-${i}-grade`].value,
+});
+}
+}
+const references = [];
+for(let i=0; i<refCount; ++i) {
+const nameEl = form[`ref-${i}-name`];
+if (nameEl) {
+references.push({
+referer_name: nameEl.value,
+referer_institute: form[`ref-${i}-institute`].value,
+position: form[`ref-${i}-position`].value,
+connection_type: form[`ref-${i}-connection`].value,
+institution_url: form[`ref-${i}-url`].value,
+});
+}
+}
+return {
+name: form.name.value,
+contact: contact,
+summary: summary,
+photo_id: photo_id,
+skills: skills,
+experience: experience,
+projects: projects,
+education: education,
+references: references,
+job_description: job_description
+};
+}
+function applyATSData(data) {
+const form = document.getElementById('resume-form');
+form.summary.value = data.summary || '';
+document.getElementById('skills-section').innerHTML = '';
+skillCount = 0;
+(data.skills || []).forEach(addSkill);
+document.getElementById('experience-section').innerHTML = '';
+expCount = 0;
+(data.experience || []).forEach(addExperience);
+document.getElementById('projects-section').innerHTML = '';
+projCount = 0;
+(data.projects || []).forEach(addProject);
+}
+async function generatePDFClientSide(htmlContent, filename) {
+const parser = new DOMParser();
+const doc = parser.parseFromString(htmlContent, 'text/html');
+const container = document.createElement('div');
+container.id = 'pdf-render-container';
+container.style.cssText = `
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 210mm;
+    min-height: 297mm;
+    background: white;
+    z-index: 99999;
+    overflow: visible;
+    padding: 0;
+    margin: 0;
+  `;
+const shadow = container.attachShadow({ mode: 'open' });
+const styles = doc.querySelectorAll('style');
+styles.forEach(style => {
+const newStyle = document.createElement('style');
+newStyle.textContent = style.textContent;
+shadow.appendChild(newStyle);
+});
+const wrapper = document.createElement('div');
+wrapper.innerHTML = doc.body.innerHTML;
+shadow.appendChild(wrapper);
+document.body.appendChild(container);
+await new Promise(resolve => setTimeout(resolve, 500));
+const tempContainer = document.createElement('div');
+tempContainer.style.cssText = `
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 210mm;
+    min-height: 297mm;
+    background: white;
+    z-index: 99999;
+    overflow: visible;
+    padding: 0;
+    margin: 0;
+  `;
+styles.forEach(style => {
+const newStyle = document.createElement('style');
+newStyle.textContent = style.textContent;
+tempContainer.appendChild(newStyle);
+});
+const contentDiv = document.createElement('div');
+contentDiv.innerHTML = doc.body.innerHTML;
+tempContainer.appendChild(contentDiv);
+document.body.removeChild(container);
+document.body.appendChild(tempContainer);
+await new Promise(resolve => setTimeout(resolve, 300));
+const opt = {
+margin: [10, 10, 10, 10],
+filename: filename || 'resume.pdf',
+image: { type: 'jpeg', quality: 0.98 },
+html2canvas: {
+scale: 2,
+useCORS: true,
+logging: false,
+backgroundColor: '#ffffff',
+width: tempContainer.scrollWidth,
+height: tempContainer.scrollHeight,
+x: 0,
+y: 0,
+scrollX: 0,
+scrollY: 0
+},
+jsPDF: {
+unit: 'mm',
+format: 'a4',
+orientation: 'portrait'
+}
+};
+const pdfBlob = await html2pdf().set(opt).from(tempContainer).outputPdf('blob');
+document.body.removeChild(tempContainer);
+return pdfBlob;
+}
+async function generatePDF() {
+setLoading(true);
+try {
+const data = await getFormData();
+const selectedTemplate = document.getElementById('template-select').value;
+const res = await fetch('/generate-pdf', {
+method: 'POST',
+headers: {
+'Content-Type': 'application/json',
+'X-Template-Name': selectedTemplate
+},
+body: JSON.stringify(data)
+});
+if (!res.ok) {
+alert('Failed to generate PDF. Check console for details.');
+console.error(await res.text());
+return;
+}
+const contentType = res.headers.get('Content-Type');
+let pdfBlob;
+let filename = 'resume.pdf';
+if (contentType && contentType.includes('application/pdf')) {
+pdfBlob = await res.blob();
+const disposition = res.headers.get('Content-Disposition');
+if (disposition) {
+const filenameMatch = disposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/);
+if (filenameMatch && filenameMatch[1]) {
+filename = filenameMatch[1].replace(/['"]/g, '');
+}
+}
+console.log('PDF generated server-side (text selectable, links clickable)');
+} else {
+const result = await res.json();
+if (result.error) {
+alert('Error: ' + result.error);
+return;
+}
+if (result.html) {
+console.log('Using client-side PDF generation (fallback mode - text not selectable)');
+pdfBlob = await generatePDFClientSide(result.html, result.filename);
+filename = result.filename || 'resume.pdf';
+} else {
+alert('Unexpected response from server');
+return;
+}
+}
+const url = URL.createObjectURL(pdfBlob);
+document.getElementById('preview').innerHTML = `
+      <iframe src="${url}" style="width: 100%; height: 600px; border: 1px solid #ccc;"></iframe>
+      <br>
+      <a href="${url}" download="${filename}" 
+         style="display: inline-block; margin-top: 10px; padding: 10px 20px; background: #28a745; color: white; text-decoration: none; border-radius: 4px;">
+        Download PDF
+      </a>
+    `;
+} catch (error) {
+console.error('PDF generation error:', error);
+alert('Failed to generate PDF. See console for details.');
+} finally {
+setLoading(false);
+}
+}
+async function downloadJSON() {
+const data = await getFormData();
+const blob = new Blob([JSON.stringify(data, null, 2)], {type: 'application/json'});
+const url = URL.createObjectURL(blob);
+const a = document.createElement('a');
+a.href = url;
+a.download = 'resume.json';
+document.body.appendChild(a);
+a.click();
+document.body.removeChild(a);
+URL.revokeObjectURL(url);
+}
+function populateForm(data) {
+const form = document.getElementById('resume-form');
+form.name.value = data.name || '';
+form.summary.value = data.summary || '';
+document.getElementById('image_upload').value = null;
+photoUpload = data.photo_id ? Promise.resolve(data.photo_id) : null;
+showPhotoPreview(data.photo_id ? `/api/photos/${data.photo_id}/thumb` : null);
+if (data.contact) {
+form.email.value = data.contact.email || '';
+form.phone.value = data.contact.phone || '';
+form.location.value = data.contact.location || '';
+form.linkedin.value = data.contact.linkedin || '';
+form.github.value = data.contact.github || '';
+form.website.value = data.contact.website || '';
+}
+document.getElementById('skills-section').innerHTML = '';
+skillCount = 0;
+(data.skills || []).forEach(addSkill);
+document.getElementById('experience-section').innerHTML = '';
+expCount = 0;
+(data.experience || []).forEach(addExperience);
+document.getElementById('projects-section').innerHTML = '';
+projCount = 0;
+(data.projects || []).forEach(addProject);
+document.getElementById('education-section').innerHTML = '';
+eduCount = 0;
+(data.education || []).forEach(addEducation);
+document.getElementById('references-section').innerHTML = '';
+refCount = 0;
+(data.references || []).forEach(addReference);
+}
+let currentSuggestions = [];
+let activeSuggestionIndex = -1;
+const AUTOCOMPLETE_DEBOUNCE_MS = 150;
+const autocompleteTimers = {};
+let autocompleteController = null;
+function setupAutocomplete(elementName, section, itemIndex = -1, parentId = null) {
+clearTimeout(autocompleteTimers[elementName]);
+autocompleteTimers[elementName] = setTimeout(() => {
+delete autocompleteTimers[elementName];
+fetchSuggestions(elementName, section, itemIndex, parentId);
+}, AUTOCOMPLETE_DEBOUNCE_MS);
+}
+async function fetchSuggestions(elementName, section, itemIndex, parentId) {
+const input = document.querySelector(`[name="${elementName}"]`);
+if (!input) return;
+let suggestionsContainer = document.getElementById(`${elementName}-suggestions`);
+console.log(`[Debug] fetchSuggestions called for element: '${elementName}' in section: '${section}'`);
+if (!suggestionsContainer) {
+console.log(`[Debug] Suggestions container not found for '${elementName}-suggestions'. Creating it dynamically.`);
+suggestionsContainer = document.createElement('div');
+suggestionsContainer.id = `${elementName}-suggestions`;
+suggestionsContainer.className = 'autocomplete-suggestions';
+input.parentNode.appendChild(suggestionsContainer);
+}
+const params = new URLSearchParams({ section, q: input.value });
+if (parentId) params.set('parent_id', parentId);
+const fullApiUrl = `/api/suggestions?${params}`;
+console.log(`[Debug] Fetching suggestions from: ${fullApiUrl}`);
+if (autocompleteController) autocompleteController.abort();
+const controller = new AbortController();
+autocompleteController = controller;
+try {
+const response = await fetch(fullApiUrl, { signal: controller.signal });
+if (!response.ok) throw new Error(`HTTP ${response.status}`);
+const data = await response.json();
+console.log(`[Debug] Received data for '${elementName}':`, data);
+currentSuggestions = data;
+suggestionsContainer.innerHTML = '';
+currentSuggestions.forEach((item, index) => {
+const div = document.createElement('div');
+let textContent;
+if (typeof item === 'string') {
+textContent = item;
+} else {
+textContent = item.skill_name || item.experience_name || item.project_name || item.education_name || item.text;
+}
+div.textContent = textContent;
+div.className = 'autocomplete-suggestion';
+div.onclick = () => selectSuggestion(index, elementName, itemIndex);
+suggestionsContainer.appendChild(div);
+});
+activeSuggestionIndex = -1;
+} catch (error) {
+if (error.name === 'AbortError') return;
+console.error(`[Debug] Error fetching or processing suggestions for '${elementName}':`, error);
+const debugDiv = document.getElementById('debug-info');
+debugDiv.textContent += `\n\nERROR fetching from ${fullApiUrl}. See console for details.`;
+}
+}
+function selectSuggestion(index, elementName, itemIndex) {
+console.log(`[Debug] selectSuggestion called for element: '${elementName}', index: ${index}`);
+const suggestion = currentSuggestions[index];
+const input = document.querySelector(`[name="${elementName}"]`);
+const suggestionsContainer = document.getElementById(`${elementName}-suggestions`);
+console.log(`[Debug] Selected suggestion object:`, suggestion);
+if (typeof suggestion === 'string') {
+input.value = suggestion;
+} else if (typeof suggestion === 'object' && suggestion !== null) {
+if (suggestion.skill_name) {
+document.querySelector(`[name="skill-${itemIndex}-name"]`).value = suggestion.skill_name;
+document.querySelector(`#skill-${itemIndex}-id`).value = suggestion.id;
+}
+else if (suggestion.project_name) {
+document.querySelector(`[name="proj-${itemIndex}-name"]`).value = suggestion.project_name;
+document.querySelector(`[name="proj-${itemIndex}-link"]`).value = suggestion.github_link || '';
+document.querySelector(`#proj-${itemIndex}-id`).value = suggestion.id;
+} else if (suggestion.experience_name) {
+document.querySelector(`[name="exp-${itemIndex}-name"]`).value = suggestion.experience_name;
+document.querySelector(`[name="exp-${itemIndex}-start"]`).value = suggestion.start_year || '';
+document.querySelector(`[name="exp-${itemIndex}-end"]`).value = suggestion.end_year || '';
+document.querySelector(`[name="exp-${itemIndex}-ongoing"]`).checked = suggestion.ongoing || false;
+document.querySelector(`#exp-${itemIndex}-id`).value = suggestion.id;
+} else if (suggestion.education_name) {
+document.querySelector(`[name="edu-${itemIndex}-name"]`).value = suggestion.education_name;
+document.querySelector(`[name="edu-${itemIndex}-institution"]`).value = suggestion.institution || '';
+} else if (suggestion.text !== undefined) {
+input.value = suggestion.text;
+}
+}
+suggestionsContainer.innerHTML = '';
+currentSuggestions = [];
+activeSuggestionIndex = -1;
+}
+function handleKeydown(event, elementName) {
+const suggestionsContainer = document.getElementById(`${elementName}-suggestions`);
+if (!suggestionsContainer || suggestionsContainer.children.length === 0) {
+if ((event.metaKey && event.key === 'Backspace') || (event.ctrlKey && event.key === 'Backspace')) {
+const input = document.querySelector(`[name="${elementName}"]`);
+if (input && input.closest('.bullet-point-input')) {
+event.preventDefault();
+input.closest('.bullet-point-input').remove();
+}
+}
+return;
+};
+if (event.key === 'ArrowDown') {
+event.preventDefault();
+activeSuggestionIndex = (activeSuggestionIndex + 1) % currentSuggestions.length;
+updateActiveSuggestion(suggestionsContainer);
+} else if (event.key === 'ArrowUp') {
+event.preventDefault();
+activeSuggestionIndex = (activeSuggestionIndex - 1 + currentSuggestions.length) % currentSuggestions.length;
+updateActiveSuggestion(suggestionsContainer);
+} else if (event.key === 'Enter') {
+event.preventDefault();
+if (activeSuggestionIndex > -1) {
+selectSuggestion(activeSuggestionIndex, elementName, elementName.split('-')[1]);
+}
+} else if ((event.metaKey && event.key === 'Backspace') || (event.ctrlKey && event.key === 'Backspace')) {
+const input = document.querySelector(`[name="${elementName}"]`);
+if (input && input.closest('.bullet-point-input')) {
+event.preventDefault();
+input.closest('.bullet-point-input').remove();
+}
+}
+}
+function updateActiveSuggestion(container) {
+for (let i = 0; i < container.children.length; i++) {
+container.children[i].classList.remove('active');
+}
+if (activeSuggestionIndex > -1) {
+const activeElement = container.children[activeSuggestionIndex];
+activeElement.classList.add('active');
+activeElement.scrollIntoView({ block: 'nearest', behavior: 'smooth' });
+}
+}
+document.addEventListener('click', (e) => {
+const activeSuggestionsContainers = document.querySelectorAll('.autocomplete-suggestions');
+activeSuggestionsContainers.forEach(container => {
+if (container && !container.contains(e.target) && !e.target.hasAttribute('onfocus')) {
+container.innerHTML = '';
+}
+});
+});
+function importJSON(event) {
+const file = event.target.files[0];
+if (file) {
+const reader = new FileReader();
+reader.onload = function(e) {
+try {
+const jsonData = JSON.parse(e.target.result);
+populateForm(jsonData);
+alert('Resume data loaded successfully!');
+} catch (error) {
+alert('Error parsing JSON file. Please ensure it is a valid resume JSON.');
+console.error("Error parsing JSON:", error);
+}
+};
+reader.readAsText(file);
+event.target.value = null;
+}
+}
+function renderTemplates(templates) {
+const selectElement = document.getElementById('template-select');
+selectElement.innerHTML = '';
+templates.forEach(templateFile => {
+const option = document.createElement('option');
+option.value = templateFile;
+option.textContent = templateFile.replace('.html', '').replace(/_/g, ' ');
+selectElement.appendChild(option);
+});
+}
+window.onload = loadBootstrap;
+let draggedBullet = null;
+let draggedItem = null;
+function handleBulletDragStart(e) {
+draggedBullet = e.target.closest('.bullet-point-input');
+if (!draggedBullet) return;
+draggedBullet.classList.add('dragging');
+e.dataTransfer.effectAllowed = 'move';
+e.dataTransfer.setData('text/plain', '');
+e.stopPropagation();
+}
+function handleBulletDragEnd(e) {
+if (draggedBullet) {
+draggedBullet.classList.remove('dragging');
+draggedBullet = null;
+}
+document.querySelectorAll('.bullet-point-input.drag-over').forEach(el => {
+el.classList.remove('drag-over');
+});
+}
+function handleBulletDragOver(e) {
+e.preventDefault();
+e.stopPropagation();
+const target = e.target.closest('.bullet-point-input');
+if (!target || target === draggedBullet || !draggedBullet) return;
+const draggedContainer = draggedBullet.parentElement;
+const targetContainer = target.parentElement;
+if (draggedContainer !== targetContainer) return;
+e.dataTransfer.dropEffect = 'move';
+target.classList.add('drag-over');
+}
+function handleBulletDragLeave(e) {
+const target = e.target.closest('.bullet-point-input');
+if (target) {
+target.classList.remove('drag-over');
+}
+}
+function handleBulletDrop(e) {
+e.preventDefault();
+e.stopPropagation();
+const target = e.target.closest('.bullet-point-input');
+if (!target || target === draggedBullet || !draggedBullet) return;
+const draggedContainer = draggedBullet.parentElement;
+const targetContainer = target.parentElement;
+if (draggedContainer !== targetContainer) return;
+target.classList.remove('drag-over');
+const container = target.parentElement;
+const bullets = Array.from(container.children);
+const draggedIndex = bullets.indexOf(draggedBullet);
+const targetIndex = bullets.indexOf(target);
+if (draggedIndex < targetIndex) {
+target.after(draggedBullet);
+} else {
+target.before(draggedBullet);
+}
+}
+function handleItemDragStart(e) {
+const handle = e.target.closest('.item-drag-handle');
+const itemBlock = e.target.closest('.item-block');
+if (!itemBlock) return;
+if (!handle && e.target.closest('.bullet-point-input')) {
+return;
+}
+draggedItem = itemBlock;
+draggedItem.classList.add('dragging');
+e.dataTransfer.effectAllowed = 'move';
+e.dataTransfer.setData('text/plain', '');
+}
+function handleItemDragEnd(e) {
+if (draggedItem) {
+draggedItem.classList.remove('dragging');
+draggedItem = null;
+}
+document.querySelectorAll('.item-block.drag-over').forEach(el => {
+el.classList.remove('drag-over');
+});
+}
+function handleItemDragOver(e) {
+e.preventDefault();
+if (draggedBullet) return;
+const target = e.target.closest('.item-block');
+if (!target || target === draggedItem || !draggedItem) return;
+const draggedSection = draggedItem.parentElement;
+const targetSection = target.parentElement;
+if (draggedSection !== targetSection) return;
+e.dataTransfer.dropEffect = 'move';
+target.classList.add('drag-over');
+}
+function handleItemDragLeave(e) {
+const target = e.target.closest('.item-block');
+if (target && !target.contains(e.relatedTarget)) {
+target.classList.remove('drag-over');
+}
+}
+function handleItemDrop(e) {
+e.preventDefault();
+if (draggedBullet) return;
+const target = e.target.closest('.item-block');
+if (!target || target === draggedItem || !draggedItem) return;
+const draggedSection = draggedItem.parentElement;
+const targetSection = target.parentElement;
+if (draggedSection !== targetSection) return;
+target.classList.remove('drag-over');
+const section = target.parentElement;
+const items = Array.from(section.querySelectorAll('.item-block'));
+const draggedIndex = items.indexOf(draggedItem);
+const targetIndex = items.indexOf(target);
+if (draggedIndex < targetIndex) {
+target.after(draggedItem);
+} else {
+target.before(draggedItem);
+}
+}
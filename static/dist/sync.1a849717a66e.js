@@ -0,0 +1,193 @@
+const ProfileSync = (function () {
+const DB_NAME = 'resumer-profile';
+const DB_VERSION = 1;
+const META = 'meta';
+const LIST_URLS = {
+summaries: '/api/summaries_with_ids',
+skills: '/api/skills',
+experiences: '/api/experiences',
+projects: '/api/projects',
+educations: '/api/educations',
+references: '/api/references',
+};
+const SECTIONS = Object.keys(LIST_URLS);
+let dbPromise = null;
+let syncInFlight = null;
+function request(req) {
+return new Promise((resolve, reject) => {
+req.onsuccess = () => resolve(req.result);
+req.onerror = () => reject(req.error);
+});
+}
+function openDb() {
+if (!dbPromise) {
+dbPromise = new Promise((resolve, reject) => {
+if (!window.indexedDB) return reject(new Error('IndexedDB unavailable'));
+const req = indexedDB.open(DB_NAME, DB_VERSION);
+req.onupgradeneeded = () => {
+const db = req.result;
+for (const section of SECTIONS) {
+if (!db.objectStoreNames.contains(section)) db.createObjectStore(section, { keyPath: 'id' });
+}
+if (!db.objectStoreNames.contains(META)) db.createObjectStore(META);
+};
+req.onsuccess = () => {
+const db = req.result;
+db.onversionchange = () => {
+db.close();
+dbPromise = null;
+};
+resolve(db);
+};
+req.onerror = () => reject(req.error);
+});
+}
+return dbPromise;
+}
+async function clear() {
+if (dbPromise) {
+const db = await dbPromise.catch(() => null);
+dbPromise = null;
+if (db) db.close();
+}
+if (!window.indexedDB) return;
+await new Promise(resolve => {
+const req = indexedDB.deleteDatabase(DB_NAME);
+req.onsuccess = req.onerror = () => resolve();
+req.onblocked = () => resolve();
+});
+}
+function signedOut() {
+clear().finally(() => { window.location.href = '/login'; });
+}
+async function fetchFeed(since) {
+const query = since === null ? '' : `?since=${since}`;
+const response = await fetch(`/api/changes${query}`);
+if (!response.ok) {
+if (response.status === 401) signedOut();
+throw new Error('Failed to sync profile data');
+}
+return response.json();
+}
+function applyFeed(db, feed) {
+const tx = db.transaction([...SECTIONS, META], 'readwrite');
+if (feed.reset) {
+for (const section of SECTIONS) tx.objectStore(section).clear();
+}
+for (const [section, delta] of Object.entries(feed.changes)) {
+if (!SECTIONS.includes(section)) continue;
+const store = tx.objectStore(section);
+for (const id of delta.deleted) store.delete(id);
+for (const item of delta.upserted) store.put(item);
+}
+tx.objectStore(META).put({ userId: feed.user_id, cursor: feed.cursor }, 'state');
+return new Promise((resolve, reject) => {
+tx.oncomplete = resolve;
+tx.onerror = () => reject(tx.error);
+tx.onabort = () => reject(tx.error);
+});
+}
+async function runSync() {
+const db = await openDb();
+const state = await request(db.transaction(META).objectStore(META).get('state'));
+let since = state ? state.cursor : null;
+for (;;) {
+let feed = await fetchFeed(since);
+if (!feed.reset && (!state || feed.user_id !== state.userId)) {
+feed = await fetchFeed(null);
+}
+await applyFeed(db, feed);
+if (!feed.more) return;
+since = feed.cursor;
+}
+}
+function sync() {
+if (!syncInFlight) {
+syncInFlight = runSync().finally(() => { syncInFlight = null; });
+}
+return syncInFlight;
+}
+async function loadFromServer(section) {
+const response = await fetch(LIST_URLS[section]);
+if (!response.ok) {
+if (response.status === 401) signedOut();
+throw new Error(`Failed to fetch ${section}`);
+}
+return response.json();
+}
+async function load(section) {
+let db;
+try {
+db = await openDb();
+await sync();
+} catch (error) {
+console.warn('Profile sync unavailable, loading from server', error);
+return loadFromServer(section);
+}
+const items = await request(db.transaction(section).objectStore(section).getAll());
+return items.sort((a, b) => b.id - a.id);
+}
+const WRITE_DELAY_MS = 250;
+const MAX_BATCH = 100;
+const KEEPALIVE_MAX_BYTES = 64 * 1024;
+let pendingWrites = [];
+let writeTimer = null;
+function batchBody(writes) {
+return JSON.stringify({ operations: writes.map(w => w.operation) });
+}
+function byteLength(text) {
+return new TextEncoder().encode(text).length;
+}
+async function flushWrites(unloading = false) {
+clearTimeout(writeTimer);
+writeTimer = null;
+const writes = pendingWrites;
+pendingWrites = [];
+if (!writes.length) return;
+const body = batchBody(writes);
+try {
+const response = await fetch('/api/batch', {
+method: 'POST',
+headers: { 'Content-Type': 'application/json' },
+body,
+keepalive: unloading && byteLength(body) < KEEPALIVE_MAX_BYTES,
+});
+const result = await response.json().catch(() => ({}));
+if (!response.ok) {
+if (response.status === 401) signedOut();
+throw new Error(typeof result.detail === 'string' ? result.detail : 'Failed to save changes');
+}
+writes.forEach((w, i) => w.waiters.forEach(waiter => waiter.resolve(result.results[i])));
+} catch (error) {
+writes.forEach(w => w.waiters.forEach(waiter => waiter.reject(error)));
+}
+}
+function write(op, section, id = null, data = undefined) {
+return new Promise((resolve, reject) => {
+const operation = { op, section };
+if (id !== null) operation.id = id;
+if (data !== undefined) operation.data = data;
+const queued = id === null ? null
+: pendingWrites.find(w => w.operation.section === section && w.operation.id === id);
+if (queued) {
+queued.operation = operation;
+queued.waiters.push({ resolve, reject });
+} else {
+pendingWrites.push({ operation, waiters: [{ resolve, reject }] });
+}
+if (pendingWrites.length >= MAX_BATCH || byteLength(batchBody(pendingWrites)) >= KEEPALIVE_MAX_BYTES) {
+flushWrites();
+} else {
+clearTimeout(writeTimer);
+writeTimer = setTimeout(flushWrites, WRITE_DELAY_MS);
+}
+});
+}
+document.addEventListener('visibilitychange', () => {
+if (document.visibilityState === 'hidden' && pendingWrites.length) flushWrites(true);
+});
+window.addEventListener('pagehide', () => {
+if (pendingWrites.length) flushWrites(true);
+});
+return { load, sync, write, clear };
+})();
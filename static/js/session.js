@@ -0,0 +1,37 @@
+// Silent session renewal: when an API call comes back 401 because the
+// short-lived access token expired, exchange the refresh token cookie for a
+// new one via /api/refresh and replay the request once.
+(function () {
+  const originalFetch = window.fetch.bind(window);
+  const SKIP_PATHS = ['/api/login', '/api/register', '/api/refresh', '/api/logout'];
+  let refreshInFlight = null;
+
+  function refreshSession() {
+    if (!refreshInFlight) {
+      refreshInFlight = originalFetch('/api/refresh', { method: 'POST', credentials: 'same-origin' })
+        .then(res => res.ok)
+        .catch(() => false)
+        .finally(() => { refreshInFlight = null; });
+    }
+    return refreshInFlight;
+  }
+
+  function requestPath(input) {
+    const url = new URL(typeof input === 'string' ? input : input.url, window.location.origin);
+    return url.origin === window.location.origin ? url.pathname : null;
+  }
+
+  window.refreshSession = refreshSession;
+
+  window.fetch = async function (input, init) {
+    const path = requestPath(input);
+    const retryable = path !== null && !SKIP_PATHS.includes(path);
+    // Request bodies can only be read once; keep a copy for the replay
+    const replay = retryable && input instanceof Request ? input.clone() : input;
+
+    const response = await originalFetch(input, init);
+    if (response.status !== 401 || !retryable) return response;
+    if (!(await refreshSession())) return response;
+    return originalFetch(replay, init);
+  };
+})();
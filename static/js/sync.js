@@ -0,0 +1,238 @@
+// Local copy of the user's profile sections in IndexedDB, kept current from
+// /api/changes: each page load fetches only what changed since the stored
+// cursor instead of whole lists. Falls back to the list endpoints when
+// IndexedDB is unavailable (e.g. some private browsing modes).
+const ProfileSync = (function () {
+  const DB_NAME = 'resumer-profile';
+  const DB_VERSION = 1;
+  const META = 'meta';
+  const LIST_URLS = {
+    summaries: '/api/summaries_with_ids',
+    skills: '/api/skills',
+    experiences: '/api/experiences',
+    projects: '/api/projects',
+    educations: '/api/educations',
+    references: '/api/references',
+  };
+  const SECTIONS = Object.keys(LIST_URLS);
+  let dbPromise = null;
+  let syncInFlight = null;
+
+  function request(req) {
+    return new Promise((resolve, reject) => {
+      req.onsuccess = () => resolve(req.result);
+      req.onerror = () => reject(req.error);
+    });
+  }
+
+  function openDb() {
+    if (!dbPromise) {
+      dbPromise = new Promise((resolve, reject) => {
+        if (!window.indexedDB) return reject(new Error('IndexedDB unavailable'));
+        const req = indexedDB.open(DB_NAME, DB_VERSION);
+        req.onupgradeneeded = () => {
+          const db = req.result;
+          for (const section of SECTIONS) {
+            if (!db.objectStoreNames.contains(section)) db.createObjectStore(section, { keyPath: 'id' });
+          }
+          if (!db.objectStoreNames.contains(META)) db.createObjectStore(META);
+        };
+        req.onsuccess = () => {
+          const db = req.result;
+          // Let clear() in another tab delete the database
+          db.onversionchange = () => {
+            db.close();
+            dbPromise = null;
+          };
+          resolve(db);
+        };
+        req.onerror = () => reject(req.error);
+      });
+    }
+    return dbPromise;
+  }
+
+  // Delete the local copy (on logout or an ended session) so the next
+  // account signing in on this browser never reads it
+  async function clear() {
+    if (dbPromise) {
+      const db = await dbPromise.catch(() => null);
+      dbPromise = null;
+      if (db) db.close();
+    }
+    if (!window.indexedDB) return;
+    await new Promise(resolve => {
+      const req = indexedDB.deleteDatabase(DB_NAME);
+      req.onsuccess = req.onerror = () => resolve();
+      // A tab running an older script still has it open; the delete stays
+      // queued until that tab closes it
+      req.onblocked = () => resolve();
+    });
+  }
+
+  // session.js has already tried to refresh, so a 401 here means signed out
+  function signedOut() {
+    clear().finally(() => { window.location.href = '/login'; });
+  }
+
+  async function fetchFeed(since) {
+    const query = since === null ? '' : `?since=${since}`;
+    const response = await fetch(`/api/changes${query}`);
+    if (!response.ok) {
+      if (response.status === 401) signedOut();
+      throw new Error('Failed to sync profile data');
+    }
+    return response.json();
+  }
+
+  // Apply one feed page and its cursor atomically
+  function applyFeed(db, feed) {
+    const tx = db.transaction([...SECTIONS, META], 'readwrite');
+    if (feed.reset) {
+      for (const section of SECTIONS) tx.objectStore(section).clear();
+    }
+    for (const [section, delta] of Object.entries(feed.changes)) {
+      if (!SECTIONS.includes(section)) continue;
+      const store = tx.objectStore(section);
+      for (const id of delta.deleted) store.delete(id);
+      for (const item of delta.upserted) store.put(item);
+    }
+    tx.objectStore(META).put({ userId: feed.user_id, cursor: feed.cursor }, 'state');
+    return new Promise((resolve, reject) => {
+      tx.oncomplete = resolve;
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
+  }
+
+  async function runSync() {
+    const db = await openDb();
+    const state = await request(db.transaction(META).objectStore(META).get('state'));
+    let since = state ? state.cursor : null;
+    for (;;) {
+      let feed = await fetchFeed(since);
+      // A cursor stored for another account says nothing about this one
+      if (!feed.reset && (!state || feed.user_id !== state.userId)) {
+        feed = await fetchFeed(null);
+      }
+      await applyFeed(db, feed);
+      if (!feed.more) return;
+      since = feed.cursor;
+    }
+  }
+
+  // Concurrent callers share one sync
+  function sync() {
+    if (!syncInFlight) {
+      syncInFlight = runSync().finally(() => { syncInFlight = null; });
+    }
+    return syncInFlight;
+  }
+
+  async function loadFromServer(section) {
+    const response = await fetch(LIST_URLS[section]);
+    if (!response.ok) {
+      if (response.status === 401) signedOut();
+      throw new Error(`Failed to fetch ${section}`);
+    }
+    return response.json();
+  }
+
+  // A section's items, newest first, as returned by its list endpoint
+  async function load(section) {
+    let db;
+    try {
+      db = await openDb();
+      await sync();
+    } catch (error) {
+      console.warn('Profile sync unavailable, loading from server', error);
+      return loadFromServer(section);
+    }
+    const items = await request(db.transaction(section).objectStore(section).getAll());
+    return items.sort((a, b) => b.id - a.id);
+  }
+
+  // Writes made within WRITE_DELAY_MS of each other go out as one /api/batch
+  // call (one transaction); a later write to an item still queued replaces it
+  const WRITE_DELAY_MS = 250;
+  const MAX_BATCH = 100;
+  // Browsers refuse keepalive requests once their bodies add up to 64 KB
+  const KEEPALIVE_MAX_BYTES = 64 * 1024;
+  let pendingWrites = [];
+  let writeTimer = null;
+
+  function batchBody(writes) {
+    return JSON.stringify({ operations: writes.map(w => w.operation) });
+  }
+
+  function byteLength(text) {
+    return new TextEncoder().encode(text).length;
+  }
+
+  // Send the queued writes as one batch. The batch is one transaction, so if
+  // it fails every coalesced write fails with it: each waiter of each write
+  // is rejected with the same error, including writes that were valid on
+  // their own. unloading marks the flush as the page's last chance; the
+  // request is then sent with keepalive when its body fits under the limit.
+  async function flushWrites(unloading = false) {
+    clearTimeout(writeTimer);
+    writeTimer = null;
+    const writes = pendingWrites;
+    pendingWrites = [];
+    if (!writes.length) return;
+    const body = batchBody(writes);
+    try {
+      const response = await fetch('/api/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body,
+        keepalive: unloading && byteLength(body) < KEEPALIVE_MAX_BYTES,
+      });
+      const result = await response.json().catch(() => ({}));
+      if (!response.ok) {
+        if (response.status === 401) signedOut();
+        throw new Error(typeof result.detail === 'string' ? result.detail : 'Failed to save changes');
+      }
+      writes.forEach((w, i) => w.waiters.forEach(waiter => waiter.resolve(result.results[i])));
+    } catch (error) {
+      writes.forEach(w => w.waiters.forEach(waiter => waiter.reject(error)));
+    }
+  }
+
+  // Queue a create, update or delete; resolves with its batch result
+  function write(op, section, id = null, data = undefined) {
+    return new Promise((resolve, reject) => {
+      const operation = { op, section };
+      if (id !== null) operation.id = id;
+      if (data !== undefined) operation.data = data;
+      const queued = id === null ? null
+        : pendingWrites.find(w => w.operation.section === section && w.operation.id === id);
+      if (queued) {
+        queued.operation = operation;
+        queued.waiters.push({ resolve, reject });
+      } else {
+        pendingWrites.push({ operation, waiters: [{ resolve, reject }] });
+      }
+      // A batch too large for keepalive goes out now rather than risk
+      // being the one left queued when the page goes away
+      if (pendingWrites.length >= MAX_BATCH || byteLength(batchBody(pendingWrites)) >= KEEPALIVE_MAX_BYTES) {
+        flushWrites();
+      } else {
+        clearTimeout(writeTimer);
+        writeTimer = setTimeout(flushWrites, WRITE_DELAY_MS);
+      }
+    });
+  }
+
+  // Hidden is the last state mobile browsers reliably report before
+  // discarding a page, and a request started then usually completes; pagehide
+  // covers desktop browsers closing a visible tab
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden' && pendingWrites.length) flushWrites(true);
+  });
+  window.addEventListener('pagehide', () => {
+    if (pendingWrites.length) flushWrites(true);
+  });
+
+  return { load, sync, write, clear };
+})();
@@ -0,0 +1,47 @@
+"""Shared fixtures: the app served by TestClient against a throwaway SQLite database."""
+import os
+import sqlite3
+
+# Settings are read at import time
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import auth
+from app import database as db
+from app import migrations
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point every connection at a fresh, migrated SQLite file (same DB-API shape as Turso)."""
+    path = tmp_path / "resumer.db"
+
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    monkeypatch.setattr(db, "get_connection", connect)
+    conn = connect()
+    migrations.migrate(conn)
+    conn.commit()
+    # Cached rows belong to the previous test's database
+    db.user_cache.clear()
+    auth.token_cache.clear()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def client(database):
+    """A client logged in as a newly registered user."""
+    from api.index import app
+
+    with TestClient(app) as client:
+        credentials = {"email": "test@example.com", "password": "correct horse"}
+        client.post("/api/register", json={"name": "Test", **credentials}).raise_for_status()
+        client.post("/api/login", json=credentials).raise_for_status()
+        yield client
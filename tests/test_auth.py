@@ -0,0 +1,37 @@
+"""Access token verification and the verified-claims cache."""
+import threading
+
+from app import auth
+from app import database as db
+
+
+def test_cached_claims_cannot_be_changed_by_callers(database):
+    token = auth.create_user_access_token({"id": 1, "email": "ada@example.com"})
+
+    auth.decode_access_token(token).pop("sub")
+    auth.decode_access_token(token)["user_id"] = 2
+
+    claims = auth.decode_access_token(token)
+    assert claims["sub"] == "ada@example.com"
+    assert claims["user_id"] == 1
+
+
+def test_login_is_refused_while_the_hashing_queue_is_full(client, monkeypatch):
+    monkeypatch.setattr(auth, "_hash_slots", threading.Semaphore(0))
+
+    response = client.post("/api/login", json={"email": "test@example.com", "password": "correct horse"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_profile_claims_do_not_outlive_the_user(client, database, monkeypatch):
+    monkeypatch.setattr(auth.settings, "JWT_PROFILE_CLAIMS", True)
+    client.post("/api/login", json={"email": "test@example.com", "password": "correct horse"}).raise_for_status()
+    assert "profile" in auth.decode_access_token(client.cookies["access_token"])
+
+    database.execute("DELETE FROM users WHERE email = ?", ("test@example.com",))
+    database.commit()
+    db.user_cache.clear()
+
+    assert client.get("/api/user-profile").status_code == 401
@@ -0,0 +1,40 @@
+"""POST /api/batch: constraint violations name the operation and roll the batch back."""
+
+
+def _skill(client, name, bullets):
+    response = client.post("/api/skills", json={"skill_name": name, "bullet_points": bullets})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _skills(client):
+    return {skill["skill_name"] for skill in client.get("/api/skills").json()}
+
+
+def test_rename_to_existing_name_is_a_conflict(client):
+    _skill(client, "Python", ["a"])
+    go = _skill(client, "Go", ["b"])
+
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "create", "section": "skills", "data": {"skill_name": "Rust", "bullet_points": []}},
+        {"op": "update", "section": "skills", "id": go, "data": {"skill_name": "Python", "bullet_points": []}},
+    ]})
+
+    assert response.status_code == 409
+    assert response.json()["detail"].startswith("Operation 1:")
+    # Operation 0 was rolled back with it
+    assert _skills(client) == {"Python", "Go"}
+
+
+def test_repeated_bullets_are_stored_once(client):
+    python = _skill(client, "Python", ["a"])
+
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "create", "section": "skills", "data": {"skill_name": "Go", "bullet_points": ["x", "y", "x"]}},
+        {"op": "update", "section": "skills", "id": python, "data": {"skill_name": "Python", "bullet_points": ["b", "b"]}},
+    ]})
+
+    assert response.status_code == 200, response.text
+    items = [result["item"] for result in response.json()["results"]]
+    assert items[0]["bullet_points"] == ["x", "y"]
+    assert items[1]["bullet_points"] == ["b"]
@@ -0,0 +1,50 @@
+"""GET /api/changes: synced items are the rows the list endpoints return."""
+
+LIST_URLS = {
+    "summaries": "/api/summaries_with_ids",
+    "skills": "/api/skills",
+    "experiences": "/api/experiences",
+    "projects": "/api/projects",
+    "educations": "/api/educations",
+    "references": "/api/references",
+}
+
+ITEMS = {
+    "summaries": {"text": "Backend engineer"},
+    "skills": {"skill_name": "Python", "bullet_points": ["FastAPI"]},
+    "experiences": {"experience_name": "Engineer", "bullet_points": ["Shipped"], "start_year": "2020"},
+    "projects": {"project_name": "Resumer", "bullet_points": ["Sync"], "github_link": "https://github.com/x/y"},
+    "educations": {"education_name": "BSc", "institution": "University", "grade": "A"},
+    "references": {"referer_name": "Ada", "referer_institute": "Analytical Engines"},
+}
+
+
+def _create_one_per_section(client):
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "create", "section": section, "data": data} for section, data in ITEMS.items()
+    ]})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_snapshot_matches_list_endpoints(client):
+    results = _create_one_per_section(client)
+
+    changes = client.get("/api/changes").json()["changes"]
+
+    for section, url in LIST_URLS.items():
+        listed = client.get(url).json()
+        assert changes[section]["upserted"] == listed, section
+        assert "user" not in listed[0], section
+    for result in results:
+        assert [result["item"]] == changes[result["section"]]["upserted"]
+
+
+def test_incremental_feed_matches_list_endpoints(client):
+    cursor = client.get("/api/changes").json()["cursor"]
+    _create_one_per_section(client)
+
+    changes = client.get(f"/api/changes?since={cursor}").json()["changes"]
+
+    for section, url in LIST_URLS.items():
+        assert changes[section]["upserted"] == client.get(url).json(), section
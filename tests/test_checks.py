@@ -0,0 +1,34 @@
+"""Schema and startup checks: migrations, index usage and cold-start imports."""
+import sqlite3
+
+from app import database as db
+from app.migrations import check_query_plans, migrate
+from scripts import coldstart
+
+
+def test_migrations_apply_once():
+    conn = sqlite3.connect(":memory:")
+    assert migrate(conn)
+    assert migrate(conn) == []
+
+
+def test_queries_use_their_indexes():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    assert check_query_plans(conn) == []
+
+
+def test_bullets_are_read_in_insertion_order():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    user_id = db.create_user(conn, "Ada", "ada@example.com", "hash")
+    skill_id = db.create_skill(conn, "Python", user_id, ["zeta", "alpha", "mid"])
+
+    assert db.get_skill_bullets(conn, skill_id) == ["zeta", "alpha", "mid"]
+    assert db.get_skill_by_id(conn, skill_id, user_id)["bullet_points"] == ["zeta", "alpha", "mid"]
+
+
+def test_cold_start_defers_heavy_imports():
+    timings, loaded = coldstart.measure()
+    assert coldstart.eager_imports(loaded) == []
+    assert timings[coldstart.ENTRY_MODULE] / 1000 < coldstart.BUDGET_MS
@@ -0,0 +1,19 @@
+"""Login redirects only ever point back at this site."""
+from fastapi.testclient import TestClient
+
+from app.routes.pages import local_path
+
+
+def test_local_path_rejects_other_hosts():
+    assert local_path("/dashboard") == "/dashboard"
+    for path in ("//evil.example", "/\\evil.example", "/x\\y", "https://evil.example", ""):
+        assert local_path(path) == "/"
+
+
+def test_protected_page_redirects_to_login_with_next(database):
+    from api.index import app
+
+    with TestClient(app) as client:
+        response = client.get("/generate", follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"] == "/login?next=%2Fgenerate"
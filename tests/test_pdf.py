@@ -0,0 +1,18 @@
+"""/generate-pdf: the HTML fallback and its stage timings."""
+
+
+def test_html_fallback_saves_the_resume_and_reports_its_stages(client):
+    resume = {
+        "name": "Test", "contact": {},
+        "skills": [{"skill_name": "Python", "bullet_points": ["Wrote the PDF route"]}],
+        "experience": [], "projects": [], "education": [], "references": [],
+    }
+
+    response = client.post("/generate-pdf", json=resume, headers={"X-Prefer-HTML": "true"})
+
+    assert response.status_code == 200
+    assert response.json()["fallback"] is True
+    assert "Wrote the PDF route" in response.json()["html"]
+    stages = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+    assert stages == ["save", "template", "render", "total"]
+    assert [skill["skill_name"] for skill in client.get("/api/skills").json()] == ["Python"]
@@ -0,0 +1,27 @@
+"""/metrics across workers: only the files of running workers are merged."""
+import json
+import os
+
+from app import prometheus
+
+
+def _families(value: int) -> list:
+    return [["jobs_total", "counter", "Jobs run", [[{}, value]]]]
+
+
+def test_scrape_merges_live_workers_and_drops_dead_ones(tmp_path, monkeypatch):
+    monkeypatch.setattr(prometheus.settings, "METRICS_DIR", str(tmp_path))
+    live = tmp_path / f"{os.getppid()}-1.json"
+    live.write_text(json.dumps(_families(2)))
+    # Far above any pid the kernel hands out
+    dead = tmp_path / "99999999-1.json"
+    dead.write_text(json.dumps(_families(40)))
+
+    body = prometheus._render_all(_families(1))
+
+    assert "jobs_total 3\n" in body
+    assert not dead.exists()
+    assert live.exists()
+
+    prometheus.remove_snapshot()
+    assert sorted(os.listdir(tmp_path)) == [live.name]
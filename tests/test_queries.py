@@ -0,0 +1,36 @@
+"""Statements per request stay constant however many items a user has (no N+1)."""
+import pytest
+
+from app import querylog
+from tests.test_changes import ITEMS
+
+ITEMS_PER_SECTION = 10
+
+
+@pytest.fixture
+def filled(client):
+    """The client's user with ITEMS_PER_SECTION items, each with bullets, in every section."""
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "create", "section": section,
+         "data": {key: f"{value} {number}" if isinstance(value, str) else value for key, value in data.items()}}
+        for number in range(ITEMS_PER_SECTION)
+        for section, data in ITEMS.items()
+    ]})
+    assert response.status_code == 200, response.text
+    return client
+
+
+@pytest.mark.parametrize("url, limit", [
+    # Bullets are included by default: the revision, the skills and one IN (...) query for their bullets
+    ("/api/skills", 3),
+    # The revisions and one bundled query for the profile and every section
+    ("/api/bootstrap", 2),
+    # Pruning, the cursor, one list query per section and one bullet query per bulleted section
+    ("/api/changes", 11),
+])
+def test_endpoint_query_count(filled, url, limit):
+    with querylog.assert_max_queries(limit) as capture:
+        response = filled.get(url)
+
+    assert response.status_code == 200
+    assert len(capture) > 0